@@ -1,15 +1,29 @@
 from flask import Flask
 from flask_cors import CORS
 import logging
-from routes.api import api_bp
+import os
+from config import CORS_ORIGINS
+from routes.api import api_bp, ingestion_scheduler, services
+from services.shared_cache import lead
 
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": ["http://localhost:5173"]}})
+CORS(app, resources={r"/api/*": {"origins": CORS_ORIGINS}})
 logging.basicConfig(level=logging.INFO)
 
 # Register blueprints
 app.register_blueprint(api_bp, url_prefix='/api')
 
+# Build services in the background so the app answers (and reports readiness on
+# /api/ready) straight away; the fastf1_cache service points every service at the
+# same on-disk cache as warm_cache.py. Once warm, refresh caches when new session
+# data lands rather than on a timer. Under gunicorn every worker imports this module,
+# so only the worker holding the ingestion lock runs the scheduler; the others pick
+# up its results through the shared cache. The debug reloader runs this script twice,
+# a parent that only watches files and a child that serves, so start in the child only.
+if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+    services.warm_up(then=lambda: lead('ingestion', ingestion_scheduler.start))
+
 if __name__ == '__main__':
+    # Development server; serve production with: gunicorn -c gunicorn.conf.py wsgi:app
     app.run(debug=True)
     
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""Time the lap selection and feature extraction stages of car performance analysis, before and after batching.
+
+Before: each driver's laps filtered with pick_driver()/pick_fastest(), and features
+extracted per driver in a ProcessPoolExecutor started for the request. After: one
+grouped idxmin over the lap table and one vectorized pass over every driver.
+
+Run from the backend directory, on a real session or on synthetic laps of the same shape:
+    python -m benchmarks.car_performance_benchmark --year 2024 --round 1 --session Q
+    python -m benchmarks.car_performance_benchmark --synthetic
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+import fastf1
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps
+from services.car_performance_analyzer import (
+    TELEMETRY_FEATURES, extract_telemetry_features, telemetry_feature_matrix
+)
+
+
+def _features_of_one_driver(driver, channels):
+    """The per-driver extraction the process pool ran"""
+    row = telemetry_feature_matrix([channels])[0]
+    return driver, dict(zip(TELEMETRY_FEATURES, row))
+
+
+def _extract_in_pool(channels):
+    with ProcessPoolExecutor() as executor:
+        return dict(executor.map(_features_of_one_driver, list(channels), list(channels.values())))
+
+
+def _pick_per_driver(laps, drivers):
+    fastest = {}
+    for driver in drivers:
+        lap = laps.pick_driver(driver).pick_fastest()
+        if lap is not None and not lap.empty:
+            fastest[driver] = lap.name
+    return fastest
+
+
+def _pick_grouped(laps):
+    personal_bests = laps[(laps['IsPersonalBest'] == True) & laps['LapTime'].notna()]
+    return personal_bests.groupby('DriverNumber')['LapTime'].idxmin().to_dict()
+
+
+def _synthetic_session(drivers=20, laps_per_driver=20, samples=700, seed=0):
+    """A lap table and fastest-lap car data the size of a qualifying session"""
+    rng = np.random.default_rng(seed)
+    numbers = [str(n) for n in range(1, drivers + 1)]
+    lap_times = rng.normal(90, 1.5, size=(drivers, laps_per_driver))
+    laps = Laps(pd.DataFrame({
+        'DriverNumber': np.repeat(numbers, laps_per_driver),
+        'Driver': np.repeat([f"D{n:0>2}" for n in numbers], laps_per_driver),
+        'LapNumber': np.tile(np.arange(1, laps_per_driver + 1), drivers).astype(float),
+        'LapTime': pd.to_timedelta(lap_times.ravel(), unit='s'),
+        'IsPersonalBest': (lap_times == np.minimum.accumulate(lap_times, axis=1)).ravel()
+    }))
+
+    channels = {}
+    for number in numbers:
+        lap_time = np.cumsum(rng.uniform(0.15, 0.3, samples))
+        speed = 200 + 110 * np.sin(np.linspace(0, 12 * np.pi, samples)) + rng.normal(0, 3, samples)
+        channels[number] = {
+            'Time': lap_time,
+            'Distance': np.cumsum(speed / 3.6 * np.diff(lap_time, prepend=0.0)),
+            'Speed': speed,
+            'RPM': rng.uniform(9000, 12000, samples),
+            'nGear': rng.integers(2, 9, samples).astype(float),
+            'Throttle': np.clip(speed / 3, 0, 100),
+            'Brake': (np.diff(speed, prepend=speed[0]) < -2).astype(float)
+        }
+    return laps, numbers, channels
+
+
+def _session_data(year, race_round, session_type):
+    from services.car_performance_analyzer import CarPerformanceAnalyzer
+    session = fastf1.get_session(year, race_round, session_type)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+    _, channels = CarPerformanceAnalyzer()._split_fastest_laps(session)
+    return session.laps, session.drivers, channels
+
+
+def _best_of(repeat, run):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--year', type=int, default=2024)
+    parser.add_argument('--round', type=int, default=1)
+    parser.add_argument('--session', default='Q')
+    parser.add_argument('--synthetic', action='store_true', help='Use generated laps instead of loading a session')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        laps, drivers, channels = _synthetic_session()
+    else:
+        print(f"Loading {args.year} round {args.round} {args.session}...")
+        laps, drivers, channels = _session_data(args.year, args.round, args.session)
+
+    assert _pick_per_driver(laps, drivers) == _pick_grouped(laps)
+    selection = (_best_of(args.repeat, lambda: _pick_per_driver(laps, drivers)),
+                 _best_of(args.repeat, lambda: _pick_grouped(laps)))
+    extraction = (_best_of(args.repeat, lambda: _extract_in_pool(channels)),
+                  _best_of(args.repeat, lambda: extract_telemetry_features(channels)))
+
+    print(f"\n{len(channels)} drivers, {len(laps)} laps, best of {args.repeat}")
+    print(f"{'stage':<18}{'before':>12}{'after':>12}")
+    for stage, (before, after) in (('lap selection', selection), ('extraction', extraction)):
+        print(f"{stage:<18}{before * 1000:9.2f} ms{after * 1000:9.2f} ms ({before / after:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
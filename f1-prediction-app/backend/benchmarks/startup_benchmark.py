@@ -0,0 +1,71 @@
+"""Measure how long a fresh process takes to import the app, answer, and warm every service.
+
+Run from the backend directory:
+    python -m benchmarks.startup_benchmark --runs 5 --budget 1.0
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Runs in a fresh interpreter per measurement so nothing is already imported
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+first = client.get('/api/ready')
+answered = time.perf_counter()
+status = first.get_json()
+deadline = answered + {timeout}
+while not status['ready'] and time.perf_counter() < deadline:
+    time.sleep(0.05)
+    status = client.get('/api/ready').get_json()
+print(json.dumps({{
+    'import': imported - started,
+    'first_response': answered - started,
+    'warm': time.perf_counter() - started if status['ready'] else None,
+    'services': status['services']
+}}))
+"""
+
+
+def run_once(timeout):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(timeout=timeout)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120.0, help="Seconds to wait for every service to warm")
+    parser.add_argument('--budget', type=float, default=1.0, help="Seconds allowed until the first response")
+    args = parser.parse_args()
+
+    runs = [run_once(args.timeout) for _ in range(args.runs)]
+    print(f"{args.runs} cold starts (median / max)")
+    for key, label in (('import', 'import app'), ('first_response', 'first response'), ('warm', 'all services warm')):
+        values = [run[key] for run in runs if run[key] is not None]
+        if values:
+            print(f"{label + ':':<20} {statistics.median(values):7.3f}s / {max(values):7.3f}s")
+        else:
+            print(f"{label + ':':<20} not reached within {args.timeout:.0f}s")
+
+    print("\nService build time, last run:")
+    for name, service in runs[-1]['services'].items():
+        seconds = 'not ready' if service['seconds'] is None else f"{service['seconds']:.3f}s"
+        print(f"  {name:<24} {seconds}{'  ' + service['error'] if service['error'] else ''}")
+
+    worst = max(run['first_response'] for run in runs)
+    if worst > args.budget:
+        print(f"\nOver budget: first response took {worst:.3f}s, budget {args.budget:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Compare fastf1's get_telemetry() with cold and warm telemetry cache reads.
+
+Run from the backend directory:
+    python -m benchmarks.telemetry_cache_benchmark --year 2024 --round 1 --session Q
+"""
+import argparse
+import os
+import tempfile
+import time
+import fastf1
+import numpy as np
+from services.car_performance_analyzer import CarPerformanceAnalyzer
+from services.telemetry_cache import TelemetryCache
+
+
+def _touch(telemetry):
+    """Read every channel so memory-mapped pages are actually loaded"""
+    return sum(float(np.sum(records[name])) for records in telemetry.values()
+               for name in ('Distance', 'Speed', 'Throttle', 'Brake', 'nGear', 'RPM'))
+
+
+def _drop_page_cache(cache_dir):
+    """
+    Evict the cache files from the OS page cache, so the cold read hits the disk.
+    Returns False where the platform cannot, e.g. without posix_fadvise.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    os.sync()  # Dirty pages cannot be dropped
+    for name in os.listdir(cache_dir):
+        fd = os.open(os.path.join(cache_dir, name), os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--year', type=int, default=2024)
+    parser.add_argument('--round', type=int, default=1)
+    parser.add_argument('--session', default='Q')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Loading {args.year} round {args.round} {args.session}...")
+    started = time.perf_counter()
+    session = fastf1.get_session(args.year, args.round, args.session)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+    print(f"Session load: {time.perf_counter() - started:.3f}s")
+
+    fastest_laps = [session.laps.pick_driver(driver).pick_fastest() for driver in session.drivers]
+    fastest_laps = [lap for lap in fastest_laps if lap is not None and not lap.empty]
+
+    started = time.perf_counter()
+    for lap in fastest_laps:
+        lap.get_telemetry()
+    baseline = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        analyzer = CarPerformanceAnalyzer(telemetry_cache=TelemetryCache(cache_dir))
+        analyzer.get_car_performance_data(args.year, args.round, args.session)
+
+        # Cold: a fresh cache instance has to read the index and map every file,
+        # from disk where the page cache can be dropped
+        dropped = _drop_page_cache(cache_dir)
+        started = time.perf_counter()
+        cache = TelemetryCache(cache_dir)
+        _touch(cache.get_session_telemetry(args.year, args.round, args.session))
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            _touch(cache.get_session_telemetry(args.year, args.round, args.session))
+        warm = (time.perf_counter() - started) / args.repeat
+
+    print(f"\n{len(fastest_laps)} fastest laps")
+    print(f"get_telemetry():  {baseline * 1000:9.2f} ms")
+    cold_label = 'cache cold read: ' if dropped else 'cache first read:'
+    print(f"{cold_label} {cold * 1000:9.2f} ms ({baseline / cold:.0f}x)"
+          + ('' if dropped else ' (files still in the page cache)'))
+    print(f"cache warm read:  {warm * 1000:9.2f} ms ({baseline / warm:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
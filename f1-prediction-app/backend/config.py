@@ -0,0 +1,46 @@
+import os
+
+# Base directories; override with environment variables when deploying
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get('F1_DATA_DIR', os.path.join(BACKEND_DIR, 'data'))
+
+# Persisted per-round season summaries used by the season analyzer
+SEASON_SUMMARY_DIR = os.path.join(DATA_DIR, 'season_summaries')
+
+# Memory-mapped fastest-lap telemetry arrays and their index
+TELEMETRY_CACHE_DIR = os.environ.get('F1_TELEMETRY_CACHE_DIR', os.path.join(DATA_DIR, 'telemetry_cache'))
+
+# Versioned Parquet feature table for ML training, partitioned by season
+FEATURE_TABLE_DIR = os.environ.get('F1_FEATURE_TABLE_DIR', os.path.join(DATA_DIR, 'feature_table'))
+
+# Rolling point-in-time form features derived from the feature table
+FEATURE_STORE_PATH = os.environ.get(
+    'F1_FEATURE_STORE_PATH', os.path.join(FEATURE_TABLE_DIR, 'rolling_features_v1.parquet')
+)
+
+# Versioned model artifacts written by training and served by the API
+MODEL_DIR = os.environ.get('F1_MODEL_DIR', os.path.join(DATA_DIR, 'models'))
+MODEL_POINTER = 'latest.json'  # Names the artifact currently served
+
+# SQLite history of heuristic and ML predictions, scored against results
+PREDICTION_HISTORY_PATH = os.environ.get(
+    'F1_PREDICTION_HISTORY_PATH', os.path.join(DATA_DIR, 'prediction_history.sqlite3')
+)
+
+# fastf1 API cache shared by the Flask services, the ML pipeline and warm_cache.py
+FASTF1_CACHE_DIR = os.environ.get('F1_FASTF1_CACHE_DIR', os.path.join(BACKEND_DIR, 'cache'))
+
+# Cache shared by every server worker, so results are computed once per data update.
+# SQLite on the local disk by default; set to a redis:// URL to share across hosts.
+SHARED_CACHE_URL = os.environ.get('F1_SHARED_CACHE_URL')
+SHARED_CACHE_PATH = os.environ.get('F1_SHARED_CACHE_PATH', os.path.join(DATA_DIR, 'shared_cache.sqlite3'))
+
+# Origins allowed to call the API, comma-separated
+CORS_ORIGINS = os.environ.get('F1_CORS_ORIGINS', 'http://localhost:5173').split(',')
+
+# Background jobs for slow cold computations, per server worker
+JOB_WORKERS = int(os.environ.get('F1_JOB_WORKERS', 2))
+JOB_QUEUE_SIZE = int(os.environ.get('F1_JOB_QUEUE_SIZE', 32))
+
+# Processes each championship simulation is split across
+SIMULATION_WORKERS = int(os.environ.get('F1_SIMULATION_WORKERS', 1))
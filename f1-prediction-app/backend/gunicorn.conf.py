@@ -0,0 +1,29 @@
+"""
+Production serving settings for gunicorn, overridable with environment variables.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Each worker process builds its own services in the background after forking;
+results, predictions, standings and sentiment are computed once and shared
+between workers through the shared cache (see config.SHARED_CACHE_URL).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('F1_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('F1_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Threads let a worker keep answering while one request waits on fastf1 or the feeds
+worker_class = 'gthread'
+threads = int(os.environ.get('F1_THREADS', 4))
+# Cold fastf1 loads can take well over the default 30 seconds
+timeout = int(os.environ.get('F1_WORKER_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so pandas and fastf1 memory does not creep up
+max_requests = int(os.environ.get('F1_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+# Not preloaded: importing the app starts the service warm-up thread, which must run in each worker
+preload_app = False
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('F1_LOG_LEVEL', 'info')
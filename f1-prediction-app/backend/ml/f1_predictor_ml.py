@@ -1,30 +1,79 @@
 import fnmatch
+import functools
 import os
-import pathlib
+import sys
+import time
 import traceback
 import fastf1
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import GradientBoostingClassifier
 from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import LabelEncoder
-from sklearn.impute import SimpleImputer
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 import warnings
 import json
+import joblib
+import sklearn
+from services.long_run_analyzer import LongRunAnalyzer
+from ml.training_data import FeatureTable, FEATURE_TABLE_VERSION
+from ml.feature_store import FeatureStore, FORM_FEATURES
+from ml.model_selection import holdout_log_loss, race_order, select_model
+from services.prediction_history import PredictionHistory
+from services.fastf1_cache import enable_cache
+from config import FASTF1_CACHE_DIR, MODEL_DIR, MODEL_POINTER
+
+
+def quiet(method):
+    """
+    Silence the fastf1, pandas and scikit-learn warnings training emits, only
+    while ``method`` runs, so importing this module leaves the filters alone
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def find_next_race(current_date):
+    """
+    Race schedule of the season holding the next race, and that race
+
+    Looks at the current year's schedule first and at the next year's once
+    every race of the current one has started.
+    """
+    schedule = fastf1.get_event_schedule(current_date.year)
+    race_schedule = schedule[schedule['EventName'] != 'Pre-Season Testing']
+    next_races = race_schedule[race_schedule['EventDate'] > current_date]
+    if not next_races.empty:
+        return race_schedule, next_races.iloc[0]
+
+    print(f"No more races in {current_date.year}, looking at next year")
+    schedule = fastf1.get_event_schedule(current_date.year + 1)
+    race_schedule = schedule[schedule['EventName'] != 'Pre-Season Testing']
+    return race_schedule, race_schedule.iloc[0]
+
 
-# Suppress warnings
-warnings.filterwarnings('ignore')
+MODEL_ARTIFACT_FORMAT = 1  # Bump when the artifact's keys change
+
+BASE_FEATURES = ['QualifyingPosition', 'RoundNumber', 'Year']
+PRACTICE_FEATURES = ['LongRunDelta', 'LongRunTeamRank']
+
+# Online updates: boosting stages added per new round, fitted on the most recent races
+ONLINE_STAGES = 10
+ONLINE_WINDOW_RACES = 24
+# Drift checks that send an update down the full retrain path instead
+MAX_ONLINE_UPDATES = 10      # Stages stacked on stale residuals stop paying off
+DRIFT_LOSS_TOLERANCE = 1.5   # New round's log loss relative to the training holdout
+DRIFT_FEATURE_SHIFT = 1.0    # Mean shift of a form feature, in training standard deviations
 
 class F1Predictor:
-    def __init__(self):
+    def __init__(self, use_practice_features=False, use_form_features=True):
         # Enable caching
-        fastf1.Cache.enable_cache('/Users/daniyalshahid/Desktop/personal projects/f1-winners/f1-prediction-app/backend/cache')
+        enable_cache(FASTF1_CACHE_DIR)
+        self.feature_table = FeatureTable(cache_dir=FASTF1_CACHE_DIR)
         self.label_encoder = LabelEncoder()
         self.imputer = SimpleImputer(strategy='mean')
         self.model = GradientBoostingClassifier(
@@ -33,101 +82,77 @@ class F1Predictor:
             max_depth=3,
             random_state=42
         )
+        # Practice long-run features need FP sessions for every training round
+        self.use_practice_features = use_practice_features
+        self.use_form_features = use_form_features
+        self.features = (BASE_FEATURES +
+                         (FORM_FEATURES if use_form_features else []) +
+                         (PRACTICE_FEATURES if use_practice_features else []))
+        self.feature_store = FeatureStore()
+        self.long_run_analyzer = LongRunAnalyzer()
+
+    def add_practice_features(self, data, year, race_round):
+        """Merge the weekend's long-run pace features onto rows keyed by DriverNumber"""
+        long_runs = self.long_run_analyzer.get_long_run_features(year, race_round)
+        if long_runs is None:
+            for feature in PRACTICE_FEATURES:
+                data[feature] = np.nan
+            return data
 
+        long_runs = long_runs[PRACTICE_FEATURES].reset_index()
+        long_runs['DriverNumber'] = pd.to_numeric(long_runs['DriverNumber'], errors='coerce')
+        data = data.copy()
+        data['DriverNumber'] = pd.to_numeric(data['DriverNumber'], errors='coerce')
+        return pd.merge(data, long_runs, on='DriverNumber', how='left')
+
+    @quiet
     def prepare_race_data(self, years=None):
-        """Prepare training data from FastF1 for multiple seasons
+        """Prepare training data from the cached feature table for multiple seasons
     
         Args:
             years (list): List of years to include (default: [2021, 2022, 2023, 2024])
         """
         if years is None:
             years = [2021, 2022, 2023, 2024]  # Use last 4 seasons by default
-            
-        all_data = []
-        
-        for year in years:
-            print(f"\nProcessing season {year}")
-            
-            # Get all sessions for the year
-            schedule = fastf1.get_event_schedule(year)
-            
-            # For current year, only use completed races
-            if year == pd.Timestamp.now().year:
-                completed_races = schedule[schedule['EventDate'] < pd.Timestamp.now()]
-            else:
-                completed_races = schedule  # Use all races for past years
-            
-            print(f"Processing {len(completed_races)} races for {year}")
-            
-            for idx, race in completed_races.iterrows():
-                try:
-                    print(f"Processing race: {race['EventName']}")
-                    
-                    # Skip if this is a testing event
-                    if 'test' in race['EventName'].lower() or 'testing' in race['EventName'].lower():
-                        print(f"Skipping test event: {race['EventName']}")
-                        continue
-                    
-                    # Load the race session
-                    race_session = fastf1.get_session(year, race['RoundNumber'], 'Race')
-                    race_session.load()
-                    
-                    # Get qualifying results for grid positions
-                    quali_session = fastf1.get_session(year, race['RoundNumber'], 'Qualifying')
-                    quali_session.load()
-                    
-                    # Extract qualifying positions
-                    quali_results = quali_session.results[['DriverNumber', 'Position']]
-                    quali_results = quali_results.rename(columns={'Position': 'QualifyingPosition'})
-                    
-                    # Get race results
-                    race_results = race_session.results[['DriverNumber', 'Position', 'Points']]
-                    
-                    # Convert Position columns to numeric
-                    quali_results['QualifyingPosition'] = pd.to_numeric(quali_results['QualifyingPosition'], errors='coerce')
-                    race_results['Position'] = pd.to_numeric(race_results['Position'], errors='coerce')
-                    
-                    # Merge qualifying and race data
-                    merged_data = pd.merge(race_results, quali_results, on='DriverNumber', how='outer')
-                    
-                    # Add race information
-                    merged_data['Track'] = race['EventName']
-                    merged_data['RoundNumber'] = race['RoundNumber']
-                    merged_data['Year'] = year
-                    merged_data['CircuitId'] = race['OfficialEventName']  # Useful for track-specific analysis
-                    
-                    all_data.append(merged_data)
-                    
-                except Exception as e:
-                    print(f"Error processing race {race['EventName']}: {str(e)}")
-                    continue
-        
-        if not all_data:
+
+        # Only rounds missing from the table are loaded, in parallel and results only
+        final_data = self.feature_table.load(years)
+        if final_data.empty:
             raise ValueError("No race data available for training")
-                
-        final_data = pd.concat(all_data, ignore_index=True)
+
+        if self.use_form_features:
+            # Only rounds new to the store are computed; every row gets point-in-time form
+            self.feature_store.append(final_data)
+            final_data = self.feature_store.attach(final_data)
+
+        if self.use_practice_features:
+            final_data = pd.concat([
+                self.add_practice_features(round_data, year, race_round)
+                for (year, race_round), round_data in final_data.groupby(['Year', 'RoundNumber'])
+            ], ignore_index=True)
         
         # Drop rows where Position (target variable) is NaN
         final_data = final_data.dropna(subset=['Position'])
         
         print("\nFinal dataset info:")
-        print(f"Total races: {len(all_data)}")
+        print(f"Total races: {final_data.groupby(['Year', 'RoundNumber']).ngroups}")
         print(f"Total data points: {len(final_data)}")
         print(f"Years included: {final_data['Year'].unique()}")
-        print(final_data.info())
         
         return final_data
 
-    def train_model(self):
+    @quiet
+    def train_model(self, years=None):
         """Train the gradient boosting model with multi-year data"""
         try:
             # Get training data from multiple seasons
             print("\nPreparing training data...")
-            data = self.prepare_race_data()
+            data = self.prepare_race_data(years)
+            self.training_data = data
             
             # Prepare features and target
             # Now include Year as a feature to account for season differences
-            features = ['QualifyingPosition', 'RoundNumber', 'Year']  
+            features = self.features
             
             # Debug prints
             print("\nChecking features presence:")
@@ -142,14 +167,16 @@ class F1Predictor:
             print("\nFeature matrix shape:", X.shape)
             print("Target vector shape:", y.shape)
             
-            # Handle NaN values in features using imputer
-            print("\nImputing missing values...")
-            X = pd.DataFrame(self.imputer.fit_transform(X), columns=X.columns)
+            # Hold out the most recent 20% of races so the test set is never older than the training set
+            order = race_order(data)
+            races = np.sort(order.unique())
+            is_test = (order >= races[int(len(races) * 0.8)]).to_numpy()
             
-            # Split the data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
-            )
+            # Handle NaN values in features using imputer, fitted on the training races only
+            print("\nImputing missing values...")
+            X_train = pd.DataFrame(self.imputer.fit_transform(X[~is_test]), columns=features)
+            X_test = pd.DataFrame(self.imputer.transform(X[is_test]), columns=features)
+            y_train, y_test = y[~is_test], y[is_test]
             
             print("\nTraining set shape:", X_train.shape)
             print("Test set shape:", X_test.shape)
@@ -162,6 +189,12 @@ class F1Predictor:
             y_pred = self.model.predict(X_test)
             accuracy = accuracy_score(y_test, y_pred)
             print(f"\nModel accuracy: {accuracy:.2f}")
+
+            self.training_metadata = self._training_metadata(
+                data,
+                accuracy=float(accuracy),
+                baseline_log_loss=holdout_log_loss(y_test, self.model.predict_proba(X_test), self.model.classes_)
+            )
             
             # Feature importance
             print("\nFeature importance:")
@@ -175,6 +208,160 @@ class F1Predictor:
             traceback.print_exc()
             return False
 
+    @quiet
+    def select_model(self, years=None, param_grid=None, n_folds=4, test_races=5, n_jobs=-1):
+        """
+        Pick hyperparameters by walk-forward evaluation, then refit them on all races
+
+        Args:
+            years (list): Seasons to train on (default: prepare_race_data's)
+            param_grid (dict): Candidate values per GradientBoostingClassifier parameter
+            n_folds (int): Number of walk-forward test blocks
+            test_races (int): Races in each test block
+            n_jobs (int): Parallel workers, -1 for every core
+
+        Returns:
+            dict: The selection report from ml.model_selection.select_model
+        """
+        data = self.prepare_race_data(years)
+        self.training_data = data
+
+        print(f"\nEvaluating hyperparameters over {n_folds} walk-forward folds...")
+        selection = select_model(data, self.features, param_grid=param_grid, n_folds=n_folds,
+                                 test_races=test_races, n_jobs=n_jobs, base_model=self.model)
+        best = selection['summary'][0]
+
+        self.model.set_params(**selection['best_params'])
+        X = pd.DataFrame(self.imputer.fit_transform(data[self.features]), columns=self.features)
+        self.model.fit(X, data['Position'])
+
+        self.training_metadata = self._training_metadata(
+            data,
+            baseline_log_loss=best['log_loss'],
+            walk_forward={
+                'folds': n_folds,
+                'test_races': test_races,
+                'winner_hit_rate': best['winner_hit_rate'],
+                'top3_overlap': best['top3_overlap'],
+                'spearman': best['spearman']
+            }
+        )
+        return selection
+
+    @quiet
+    def update_model(self, years=None, extra_stages=ONLINE_STAGES):
+        """
+        Bring a trained model up to date with rounds completed since it was fitted.
+
+        New rounds are folded in by warm-starting extra boosting stages on the
+        most recent races, which takes seconds. If the drift checks fail the
+        model is retrained from scratch on every season instead.
+
+        Args:
+            years (list): Seasons to train on (default: the trained seasons plus the current one)
+            extra_stages (int): Boosting stages added by an online update
+
+        Returns:
+            dict: mode ('current', 'online' or 'retrained'), rounds added,
+                  drift reasons and wall time
+        """
+        started = time.perf_counter()
+        metadata = getattr(self, 'training_metadata', None)
+        if not metadata or not hasattr(self.model, 'estimators_'):
+            return self._retrain(years, ['no trained model'], 0, started)
+
+        years = years or sorted(set(metadata['years']) | {pd.Timestamp.now().year})
+        data = self.prepare_race_data(years)
+        order = race_order(data)
+        last_year, last_round = metadata['last_round']
+        new = data[order > last_year * 100 + last_round]
+        rounds = int(race_order(new).nunique())
+        if new.empty:
+            return {'mode': 'current', 'rounds': 0, 'reasons': [], 'seconds': time.perf_counter() - started}
+
+        window = data[order.isin(np.sort(order.unique())[-ONLINE_WINDOW_RACES:])]
+        reasons = self.check_drift(new)
+        if set(window['Position'].astype(float)) != set(self.model.classes_.astype(float)):
+            reasons.append('finishing positions differ from the model classes')
+        if reasons:
+            return self._retrain(years, reasons, rounds, started)
+
+        print(f"\nAdding {extra_stages} boosting stages for {rounds} new round(s)...")
+        X = pd.DataFrame(self.imputer.transform(window[self.features]), columns=self.features)
+        self.model.set_params(warm_start=True, n_estimators=self.model.n_estimators + extra_stages)
+        try:
+            self.model.fit(X, window['Position'])
+        finally:
+            self.model.set_params(warm_start=False)
+
+        self.training_metadata = {
+            **metadata,
+            'updated_at': pd.Timestamp.now(tz='UTC').isoformat(),
+            'years': sorted(set(metadata['years']) | {int(year) for year in new['Year'].unique()}),
+            'last_round': list(divmod(int(race_order(data).max()), 100)),
+            'samples': metadata['samples'] + int(len(new)),
+            'online_updates': metadata.get('online_updates', 0) + 1,
+            'params': self._model_params()
+        }
+        return {'mode': 'online', 'rounds': rounds, 'reasons': [], 'seconds': time.perf_counter() - started}
+
+    def check_drift(self, new):
+        """
+        Reasons the rows of newly completed rounds call for a full retrain
+
+        Returns:
+            list: Human-readable reasons, empty if an online update is safe
+        """
+        metadata = self.training_metadata
+        reasons = []
+        new_years = {int(year) for year in new['Year'].unique()} - set(metadata['years'])
+        if new_years:
+            # Year is a feature, and a new season brings new cars and line-ups
+            reasons.append(f"new season {sorted(new_years)}")
+        if metadata.get('online_updates', 0) >= MAX_ONLINE_UPDATES:
+            reasons.append(f"{MAX_ONLINE_UPDATES} online updates since the last full retrain")
+
+        baseline = metadata.get('baseline_log_loss')
+        X = pd.DataFrame(self.imputer.transform(new[self.features]), columns=self.features)
+        loss = holdout_log_loss(new['Position'], self.model.predict_proba(X), self.model.classes_)
+        if baseline and loss > baseline * DRIFT_LOSS_TOLERANCE:
+            reasons.append(f"log loss {loss:.2f} against a baseline of {baseline:.2f}")
+
+        means, stds = metadata.get('feature_means', {}), metadata.get('feature_stds', {})
+        for feature in self.features:
+            if feature in BASE_FEATURES or not stds.get(feature):
+                continue
+            shift = abs(new[feature].mean() - means[feature]) / stds[feature]
+            if shift > DRIFT_FEATURE_SHIFT:
+                reasons.append(f"{feature} shifted by {shift:.1f} standard deviations")
+        return reasons
+
+    def _retrain(self, years, reasons, rounds, started):
+        print(f"\nFull retrain: {'; '.join(reasons)}")
+        mode = 'retrained' if self.train_model(years) else 'failed'
+        return {'mode': mode, 'rounds': rounds, 'reasons': reasons, 'seconds': time.perf_counter() - started}
+
+    def _training_metadata(self, data, **extra):
+        """Metadata stored with the artifact, including the statistics the drift checks compare against"""
+        return {
+            'trained_at': pd.Timestamp.now(tz='UTC').isoformat(),
+            'years': sorted(int(year) for year in data['Year'].unique()),
+            'last_round': list(divmod(int(race_order(data).max()), 100)),
+            'samples': int(len(data)),
+            'params': self._model_params(),
+            'online_updates': 0,
+            'feature_means': {f: float(data[f].mean()) for f in self.features if data[f].notna().any()},
+            'feature_stds': {f: float(data[f].std()) for f in self.features if data[f].notna().any()},
+            'feature_table_version': FEATURE_TABLE_VERSION,
+            'sklearn_version': sklearn.__version__,
+            **extra
+        }
+
+    def _model_params(self):
+        params = self.model.get_params()
+        return {name: params[name] for name in ('n_estimators', 'learning_rate', 'max_depth')}
+
+    @quiet
     def predict_next_race(self):
         """Predict the winner of the next race"""
         try:
@@ -185,20 +372,7 @@ class F1Predictor:
             current_year = current_date.year
             print(f"\nCurrent date: {current_date}")
             
-            # Get the current year's schedule
-            schedule = fastf1.get_event_schedule(current_year)
-            
-            # Filter out testing sessions and find next race
-            race_schedule = schedule[schedule['EventName'] != 'Pre-Season Testing']
-            next_races = race_schedule[race_schedule['EventDate'] > current_date]
-            
-            if next_races.empty:
-                print(f"No more races in {current_year}, looking at next year")
-                schedule = fastf1.get_event_schedule(current_year + 1)
-                race_schedule = schedule[schedule['EventName'] != 'Pre-Season Testing']
-                next_race = race_schedule.iloc[0]
-            else:
-                next_race = next_races.iloc[0]
+            race_schedule, next_race = find_next_race(current_date)
             
             print(f"\nNext race: {next_race['EventName']} on {next_race['EventDate']}")
             
@@ -233,9 +407,20 @@ class F1Predictor:
             prediction_data['RoundNumber'] = next_race['RoundNumber']
             prediction_data['Year'] = next_race['EventDate'].year  # Add year feature
             prediction_data['DriverNumber'] = pd.to_numeric(last_quali.results['DriverNumber'], errors='coerce')
+            prediction_data['Abbreviation'] = last_quali.results['Abbreviation']
+            prediction_data['TeamName'] = last_quali.results['TeamName']
+            prediction_data['Track'] = next_race['EventName']
+
+            if self.use_form_features:
+                prediction_data = self.feature_store.attach(prediction_data)
             
+            if self.use_practice_features:
+                prediction_data = self.add_practice_features(
+                    prediction_data, next_race['EventDate'].year, next_race['RoundNumber']
+                )
+
             # Handle NaN values in prediction data
-            features = ['QualifyingPosition', 'RoundNumber', 'Year']
+            features = self.features
             prediction_features = prediction_data[features]
             
             prediction_features = pd.DataFrame(self.imputer.transform(prediction_features), columns=features)
@@ -248,7 +433,7 @@ class F1Predictor:
             
             # Merge with current driver information
             final_predictions = pd.merge(
-                prediction_data,
+                prediction_data.drop(columns=['Abbreviation', 'TeamName']),
                 drivers_df,
                 on='DriverNumber',
                 how='left'
@@ -260,6 +445,8 @@ class F1Predictor:
             result = {
                 'race_name': next_race['EventName'],
                 'race_date': next_race['EventDate'].strftime('%Y-%m-%d'),
+                'year': int(next_race['EventDate'].year),
+                'round': int(next_race['RoundNumber']),
                 'predicted_winner': {
                     'name': final_predictions.iloc[0]['FullName'],
                     'team': final_predictions.iloc[0]['TeamName'],
@@ -291,31 +478,98 @@ class F1Predictor:
             traceback.print_exc()
             return None
         
-    def print_to_json(self, data, filename):
-        """Print the data to a json file"""
-        # Print the data to a json file
-        path_to_file = f"/Users/daniyalshahid/Desktop/personal projects/f1-winners/f1-prediction-app/backend/data/{filename}.json"
-        with open(path_to_file, 'w') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        print(f"Data printed to {path_to_file}")
-
-# Usage example
+    def save_model(self, model_dir=MODEL_DIR):
+        """
+        Write the trained model, imputer, feature list and training metadata
+        as a new versioned artifact and point the served model at it
+
+        Returns:
+            str: Path of the written artifact
+        """
+        os.makedirs(model_dir, exist_ok=True)
+        version = pd.Timestamp.now(tz='UTC').strftime('%Y%m%dT%H%M%S')
+        artifact = {
+            'format': MODEL_ARTIFACT_FORMAT,
+            'version': version,
+            'model': self.model,
+            'imputer': self.imputer,
+            'features': list(self.features),
+            'metadata': getattr(self, 'training_metadata', {})
+        }
+        path = os.path.join(model_dir, f"f1_model_{version}.joblib")
+        joblib.dump(artifact, path)
+
+        # Swap the pointer atomically so a running server never reads a partial file
+        pointer = os.path.join(model_dir, MODEL_POINTER)
+        with open(f"{pointer}.tmp", 'w') as f:
+            json.dump({'version': version, 'path': os.path.basename(path)}, f)
+        os.replace(f"{pointer}.tmp", pointer)
+        self.model_version = version
+        print(f"Model artifact written to {path}")
+        return path
+
+    def load_model(self, model_dir=MODEL_DIR):
+        """
+        Load the artifact the pointer file names, e.g. to update it online
+
+        Returns:
+            str: Version of the loaded artifact, or None if there is none
+        """
+        pointer = os.path.join(model_dir, MODEL_POINTER)
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer) as f:
+            latest = json.load(f)
+        artifact = joblib.load(os.path.join(model_dir, latest['path']))
+
+        self.model = artifact['model']
+        self.imputer = artifact['imputer']
+        self.features = artifact['features']
+        self.training_metadata = dict(artifact['metadata'])
+        self.model_version = artifact['version']
+        return artifact['version']
+
+    def record_prediction(self, prediction, history=None):
+        """Store a prediction from predict_next_race in the prediction history"""
+        history = history or PredictionHistory()
+        entries = [{
+            'driver': driver['name'],
+            'abbreviation': driver['abbreviation'],
+            'team': driver['team'],
+            'confidence': None
+        } for driver in prediction['top_3']]
+        if history.record_prediction(prediction['year'], prediction['round'], prediction['race_name'], 'ml',
+                                     getattr(self, 'model_version', 'unsaved'), entries, prediction):
+            print(f"Prediction stored in {history.db_path}")
+
+# Usage example (run from the backend directory: python -m ml.f1_predictor_ml)
 if __name__ == "__main__":
+    warnings.filterwarnings('ignore')
     predictor = F1Predictor()
-    data_folder = pathlib.Path('/Users/daniyalshahid/Desktop/personal projects/f1-winners/f1-prediction-app/backend/data')
+
+    if '--update' in sys.argv[1:]:
+        # Fold newly completed rounds into the saved model: python -m ml.f1_predictor_ml --update
+        predictor.load_model()
+        update = predictor.update_model()
+        print(f"\nModel update: {update['mode']} ({update['rounds']} new rounds, {update['seconds']:.1f}s)")
+        if update['mode'] in ('online', 'retrained'):
+            predictor.save_model()
+        sys.exit(0)
+
+    history = PredictionHistory()
     print("\nChecking for existing predictions...")
 
     # Get the next race name first (without running the full model)
-    current_date = pd.Timestamp.now()
-    schedule_2025 = fastf1.get_event_schedule(2025)
-    race_schedule = schedule_2025[schedule_2025['EventName'] != 'Pre-Season Testing']
-    next_race = race_schedule[race_schedule['EventDate'] > current_date].iloc[0]
+    _, next_race = find_next_race(pd.Timestamp.now())
     next_race_name = next_race['EventName']
     
     # Check if prediction already exists
-    prediction_file = data_folder / f"{next_race_name}.json"
+    existing_prediction = next((
+        stored for stored in history.get_history(season=next_race['EventDate'].year, source='ml')
+        if stored['round'] == int(next_race['RoundNumber'])
+    ), None)
     
-    if prediction_file.exists():
+    if existing_prediction:
         print(f"\nFound existing prediction for {next_race_name}")
         print("Do you want to generate a new prediction? (y/n)")
         regenerate = input().lower()
@@ -323,25 +577,25 @@ if __name__ == "__main__":
         if regenerate != 'y':
             # Load and display existing prediction
             print(f"\nLoading existing prediction for {next_race_name}...")
-            with open(prediction_file, 'r') as f:
-                prediction = json.load(f)
+            prediction = existing_prediction
             print("\nPrediction details:")
-            print(f"Race: {prediction['race_name']} on {prediction['race_date']}")
-            print(f"Predicted Winner: {prediction['predicted_winner']['name']} ({prediction['predicted_winner']['team']})")
+            print(f"Race: {prediction['race_name']} (model {prediction['model_version']}, {prediction['created_at']})")
+            print(f"Predicted Winner: {prediction['top_3'][0]['driver']} ({prediction['top_3'][0]['team']})")
             print("\nTop 3 Predictions:")
             for pos, driver in enumerate(prediction['top_3'], 1):
-                print(f"{pos}. {driver['name']} ({driver['team']})")
+                print(f"{pos}. {driver['driver']} ({driver['team']})")
         else:
             # Generate new prediction
             print("\n=== Starting Model Training ===")
             training_success = predictor.train_model()
             
             if training_success:
+                predictor.save_model()
                 print("\n=== Making New Predictions ===")
                 prediction = predictor.predict_next_race()
                 if prediction:
-                    print("\nSaving new prediction to file...")
-                    predictor.print_to_json(prediction, prediction['race_name'])
+                    print("\nSaving new prediction to the prediction history...")
+                    predictor.record_prediction(prediction, history)
             else:
                 print("\nTraining failed, cannot make predictions.")
     else:
@@ -351,11 +605,12 @@ if __name__ == "__main__":
         training_success = predictor.train_model()
         
         if training_success:
+            predictor.save_model()
             print("\n=== Making Predictions ===")
             prediction = predictor.predict_next_race()
             if prediction:
-                print("\nSaving prediction to file...")
-                predictor.print_to_json(prediction, prediction['race_name'])
+                print("\nSaving prediction to the prediction history...")
+                predictor.record_prediction(prediction, history)
         else:
             print("\nTraining failed, cannot make predictions.")
 
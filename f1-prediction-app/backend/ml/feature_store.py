@@ -0,0 +1,186 @@
+import os
+import numpy as np
+import pandas as pd
+from config import FEATURE_STORE_PATH
+
+# Point-in-time features attached to every training and inference row
+FORM_FEATURES = ['FormFinish', 'FormPoints', 'FormDNFRate', 'FormTeammateDelta',
+                 'TeamFormPoints', 'TrackFinish']
+
+# Statuses that count as finishing the race, including lapped cars
+FINISHED_STATUS = r'^(Finished|\+\d+ Laps?)$'
+
+
+class FeatureStore:
+    """
+    Rolling driver, team and track form, maintained round by round.
+
+    After each round every driver gets a state row holding their form
+    *including* that round. A race is then described by the latest state
+    strictly before it, looked up with an as-of join, so training rows and
+    next-race inference rows read the same precomputed states and never see
+    the result they are predicting.
+    """
+
+    WINDOW = 5  # Races in each rolling window
+
+    STATE_COLUMNS = ['Seq', 'Year', 'RoundNumber', 'Abbreviation', 'TeamName', 'Track',
+                     'Position', 'Points', 'DNF', 'TeammateDelta', 'TeamRoundPoints',
+                     'TrackSum', 'TrackCount'] + FORM_FEATURES
+
+    def __init__(self, path=FEATURE_STORE_PATH, window=WINDOW):
+        self.path = path
+        self.window = window
+        self.states = self._read()
+
+    def _read(self):
+        if os.path.exists(self.path):
+            return pd.read_parquet(self.path)
+        return pd.DataFrame(columns=self.STATE_COLUMNS)
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        self.states.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _seq(data):
+        """Orderable race index: season then round"""
+        return data['Year'].astype(int) * 100 + data['RoundNumber'].astype(int)
+
+    def append(self, results):
+        """
+        Add state rows for rounds not in the store yet
+
+        Args:
+            results (pd.DataFrame): Per-driver results with Year, RoundNumber,
+                Abbreviation, TeamName, Track, Position, Points and Status
+
+        Returns:
+            int: Number of rounds added
+        """
+        results = results.dropna(subset=['Abbreviation']).copy()
+        results['Seq'] = self._seq(results)
+        stored = set(self.states['Seq'].astype(int)) if not self.states.empty else set()
+        new = results[~results['Seq'].isin(stored)]
+        if new.empty:
+            return 0
+
+        rows = self._round_rows(new)
+        if not stored:
+            self.states = self._compute_states(rows)
+        elif rows['Seq'].min() < max(stored):
+            # An earlier round arrived late: later states depend on it, so rebuild them all
+            history = pd.concat([self.states[rows.columns], rows], ignore_index=True)
+            self.states = self._compute_states(history, context=None)
+        else:
+            self.states = pd.concat([self.states, self._compute_states(rows, context=self.states)],
+                                    ignore_index=True)
+
+        self.states = self.states.sort_values(['Seq', 'Position'], na_position='last').reset_index(drop=True)
+        self._write()
+        return rows['Seq'].nunique()
+
+    def _round_rows(self, results):
+        """Per-driver values of each round that the rolling windows aggregate"""
+        rows = results[['Seq', 'Year', 'RoundNumber', 'Abbreviation', 'TeamName', 'Track', 'Position', 'Points']].copy()
+        rows['Position'] = pd.to_numeric(rows['Position'], errors='coerce')
+        rows['Points'] = pd.to_numeric(rows['Points'], errors='coerce').fillna(0.0)
+        rows['DNF'] = (~results['Status'].fillna('').str.match(FINISHED_STATUS)).astype(float)
+
+        team_round = rows.groupby(['Seq', 'TeamName'])
+        team_sum = team_round['Position'].transform('sum')
+        team_count = team_round['Position'].transform('count')
+        # Against the team-mates' average finish in the same race
+        rows['TeammateDelta'] = rows['Position'] - (team_sum - rows['Position']) / (team_count - 1).replace(0, np.nan)
+        rows['TeamRoundPoints'] = team_round['Points'].transform('sum')
+        return rows
+
+    def _compute_states(self, rows, context=None):
+        """
+        Form states for ``rows``. Rolling windows are seeded from the last
+        stored rows of each driver and team, so only new rows are computed.
+        """
+        rows = rows.sort_values('Seq', kind='stable')
+        seed = None
+        if context is not None and not context.empty:
+            drivers = context[context['Abbreviation'].isin(rows['Abbreviation'])]
+            seed = drivers.groupby('Abbreviation').tail(self.window - 1)
+
+        data = (pd.concat([seed[rows.columns], rows], ignore_index=True) if seed is not None
+                else rows.reset_index(drop=True))
+        data['IsNew'] = np.r_[np.zeros(len(data) - len(rows), dtype=bool), np.ones(len(rows), dtype=bool)]
+
+        by_driver = data.groupby('Abbreviation', sort=False)
+        rolling = lambda column: (by_driver[column].rolling(self.window, min_periods=1).mean()
+                                  .reset_index(level=0, drop=True))
+        data['FormFinish'] = rolling('Position')
+        data['FormPoints'] = rolling('Points')
+        data['FormDNFRate'] = rolling('DNF')
+        data['FormTeammateDelta'] = rolling('TeammateDelta')
+
+        # One value per team per round, rolled over the team's own rounds
+        teams = rows[['Seq', 'TeamName', 'TeamRoundPoints']].drop_duplicates(['Seq', 'TeamName'])
+        if context is not None and not context.empty:
+            team_seed = (context[['Seq', 'TeamName', 'TeamRoundPoints']]
+                         .drop_duplicates(['Seq', 'TeamName'])
+                         .groupby('TeamName').tail(self.window - 1))
+            teams = pd.concat([team_seed, teams], ignore_index=True)
+        teams = teams.sort_values('Seq', kind='stable')
+        teams['TeamFormPoints'] = (teams.groupby('TeamName')['TeamRoundPoints']
+                                   .rolling(self.window, min_periods=1).mean()
+                                   .reset_index(level=0, drop=True))
+        data = data.merge(teams[['Seq', 'TeamName', 'TeamFormPoints']], on=['Seq', 'TeamName'], how='left')
+
+        # Track history is a running sum and count, continued from the last stored visit
+        data = data[data['IsNew']].copy()
+        track_keys = [data['Abbreviation'], data['Track']]
+        data['TrackSum'] = data['Position'].fillna(0.0).groupby(track_keys).cumsum()
+        data['TrackCount'] = data['Position'].notna().astype(float).groupby(track_keys).cumsum()
+        if context is not None and not context.empty:
+            last_visit = context.groupby(['Abbreviation', 'Track'])[['TrackSum', 'TrackCount']].last()
+            offset = data[['Abbreviation', 'Track']].merge(
+                last_visit, left_on=['Abbreviation', 'Track'], right_index=True, how='left'
+            ).fillna(0.0)
+            data['TrackSum'] += offset['TrackSum'].to_numpy()
+            data['TrackCount'] += offset['TrackCount'].to_numpy()
+        data['TrackFinish'] = data['TrackSum'] / data['TrackCount'].replace(0, np.nan)
+
+        return data[self.STATE_COLUMNS].reset_index(drop=True)
+
+    def attach(self, rows):
+        """
+        Add the point-in-time form features to training or inference rows
+
+        Args:
+            rows (pd.DataFrame): Rows with Year, RoundNumber, Abbreviation, TeamName and Track
+
+        Returns:
+            pd.DataFrame: ``rows`` with FORM_FEATURES, taken from the latest
+                          states strictly before each row's race
+        """
+        rows = rows.copy()
+        rows['Seq'] = self._seq(rows)
+        rows['_order'] = np.arange(len(rows))
+        if self.states.empty:
+            for feature in FORM_FEATURES:
+                rows[feature] = np.nan
+            return rows.drop(columns=['Seq', '_order'])
+
+        states = self.states.assign(Seq=self.states['Seq'].astype('int64')).sort_values('Seq')
+        rows = rows.assign(Seq=rows['Seq'].astype('int64')).sort_values('Seq')
+        rows = rows.drop(columns=[f for f in FORM_FEATURES if f in rows.columns])
+
+        def as_of(columns, by):
+            return pd.merge_asof(
+                rows[['Seq', '_order'] + by], states[['Seq'] + by + columns].dropna(subset=by),
+                on='Seq', by=by, allow_exact_matches=False
+            ).set_index('_order')[columns]
+
+        driver_form = as_of(['FormFinish', 'FormPoints', 'FormDNFRate', 'FormTeammateDelta'], ['Abbreviation'])
+        team_form = as_of(['TeamFormPoints'], ['TeamName'])
+        track_form = as_of(['TrackFinish'], ['Abbreviation', 'Track'])
+
+        rows = rows.set_index('_order').join(driver_form).join(team_form).join(track_form)
+        return rows.sort_index().drop(columns=['Seq']).reset_index(drop=True)
@@ -0,0 +1,179 @@
+import argparse
+import itertools
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import log_loss
+
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'learning_rate': [0.05, 0.1],
+    'max_depth': [2, 3]
+}
+
+
+def race_order(data):
+    """Orderable race index: season then round"""
+    return data['Year'].astype(int) * 100 + data['RoundNumber'].astype(int)
+
+
+def walk_forward_splits(data, n_folds=4, test_races=5, min_train_races=20):
+    """
+    Season- and round-ordered splits: each fold trains on every race before
+    its test block, so no fold ever sees a race later than the ones it scores.
+
+    Returns:
+        list: (train index, test index) pairs, oldest test block first
+    """
+    order = race_order(data)
+    races = np.sort(order.unique())
+    splits = []
+    for fold in range(n_folds, 0, -1):
+        test_start = len(races) - fold * test_races
+        if test_start < min_train_races:
+            continue
+        test = races[test_start:test_start + test_races]
+        splits.append((
+            data.index[order < test[0]].to_numpy(),
+            data.index[order.isin(test)].to_numpy()
+        ))
+    return splits
+
+
+def ranking_metrics(test, probabilities, classes):
+    """
+    Per-race ranking quality, averaged over the races in ``test``
+
+    Returns:
+        dict: winner hit rate, top-3 overlap and mean Spearman correlation
+    """
+    classes = np.asarray(classes, dtype=float)
+    scored = test[['Position']].assign(
+        Race=race_order(test).to_numpy(),
+        WinProbability=probabilities[:, classes == 1.0].sum(axis=1),
+        ExpectedPosition=probabilities @ classes
+    )
+    scored['PredictedRank'] = scored.groupby('Race')['ExpectedPosition'].rank(method='first')
+    scored['ActualRank'] = scored.groupby('Race')['Position'].rank(method='first')
+
+    winner_hits, overlaps, correlations = [], [], []
+    for _, race in scored.groupby('Race'):
+        predicted_winner = race['WinProbability'].idxmax()
+        winner_hits.append(float(race.loc[predicted_winner, 'Position'] == 1))
+        predicted_top3 = set(race.nsmallest(3, 'PredictedRank').index)
+        actual_top3 = set(race.nsmallest(3, 'ActualRank').index)
+        overlaps.append(len(predicted_top3 & actual_top3) / 3)
+        if len(race) > 2:
+            correlations.append(np.corrcoef(race['PredictedRank'], race['ActualRank'])[0, 1])
+
+    return {
+        'winner_hit_rate': float(np.mean(winner_hits)),
+        'top3_overlap': float(np.mean(overlaps)),
+        'spearman': float(np.nanmean(correlations)) if correlations else float('nan')
+    }
+
+
+def holdout_log_loss(positions, probabilities, classes):
+    """Log loss over the rows whose finishing position the model has a class for"""
+    known = np.isin(positions.to_numpy(dtype=float), np.asarray(classes, dtype=float))
+    if not known.any():
+        return float('nan')
+    return float(log_loss(positions[known], probabilities[known], labels=classes))
+
+
+def evaluate_fold(params, fold, train, test, features, base_model=None):
+    """Fit one parameter set on one fold and score it. Runs in a joblib worker."""
+    started = time.perf_counter()
+    imputer = SimpleImputer(strategy='mean')
+    model = clone(base_model) if base_model is not None else GradientBoostingClassifier(random_state=42)
+    model.set_params(**params)
+
+    X_train = imputer.fit_transform(train[features])
+    model.fit(X_train, train['Position'])
+    probabilities = model.predict_proba(imputer.transform(test[features]))
+
+    return {
+        'params': params,
+        'fold': fold,
+        'train_races': int(race_order(train).nunique()),
+        'test_races': int(race_order(test).nunique()),
+        **ranking_metrics(test, probabilities, model.classes_),
+        'log_loss': holdout_log_loss(test['Position'], probabilities, model.classes_),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def select_model(data, features, param_grid=None, n_folds=4, test_races=5, n_jobs=-1, base_model=None):
+    """
+    Walk-forward evaluation of every parameter combination, in parallel
+
+    Args:
+        data (pd.DataFrame): Rows with features, Position, Year and RoundNumber
+        features (list): Feature columns
+        param_grid (dict): Parameter name to candidate values
+        n_jobs (int): joblib workers, -1 for every core
+
+    Returns:
+        dict: Best parameters, a summary per parameter set and every fold's result
+    """
+    data = data.dropna(subset=['Position']).reset_index(drop=True)
+    param_grid = param_grid or DEFAULT_PARAM_GRID
+    candidates = [dict(zip(param_grid, values)) for values in itertools.product(*param_grid.values())]
+    splits = walk_forward_splits(data, n_folds=n_folds, test_races=test_races)
+    if not splits:
+        raise ValueError("Not enough races for walk-forward evaluation")
+
+    started = time.perf_counter()
+    folds = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_fold)(params, fold, data.loc[train], data.loc[test], features, base_model)
+        for params in candidates
+        for fold, (train, test) in enumerate(splits)
+    )
+
+    results = pd.DataFrame(folds)
+    results['key'] = results['params'].map(lambda p: tuple(sorted(p.items())))
+    summary = (results.groupby('key')[['winner_hit_rate', 'top3_overlap', 'spearman', 'log_loss', 'seconds']]
+               .mean()
+               .sort_values(['winner_hit_rate', 'top3_overlap', 'spearman'], ascending=False))
+
+    return {
+        'best_params': dict(summary.index[0]),
+        'summary': [{'params': dict(key), **row} for key, row in summary.to_dict('index').items()],
+        'folds': results.drop(columns=['key']).to_dict('records'),
+        'wall_seconds': time.perf_counter() - started
+    }
+
+
+def print_report(selection):
+    print("\nWalk-forward model selection")
+    print(f"{'params':<60} {'winner':>7} {'top3':>6} {'rho':>6} {'fold s':>7}")
+    for row in selection['summary']:
+        print(f"{str(row['params']):<60} {row['winner_hit_rate']:>7.3f} {row['top3_overlap']:>6.3f} "
+              f"{row['spearman']:>6.3f} {row['seconds']:>7.2f}")
+    print(f"\nBest parameters: {selection['best_params']}")
+    print(f"Total wall time: {selection['wall_seconds']:.1f}s")
+
+
+# Run from the backend directory: python -m ml.model_selection
+if __name__ == "__main__":
+    from ml.f1_predictor_ml import F1Predictor
+
+    parser = argparse.ArgumentParser(description="Walk-forward hyperparameter search")
+    parser.add_argument('--years', type=int, nargs='+', default=[2021, 2022, 2023, 2024])
+    parser.add_argument('--folds', type=int, default=4)
+    parser.add_argument('--test-races', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=-1)
+    parser.add_argument('--save', action='store_true', help="Refit the best parameters on all data and save the model")
+    args = parser.parse_args()
+
+    predictor = F1Predictor()
+    selection = predictor.select_model(
+        years=args.years, n_folds=args.folds, test_races=args.test_races, n_jobs=args.jobs
+    )
+    print_report(selection)
+    if args.save:
+        predictor.save_model()
@@ -1,7 +1,8 @@
 import fastf1
+from services.fastf1_cache import enable_cache
 
-# Enable caching for faster data retrieval
-fastf1.Cache.enable_cache('/Users/daniyalshahid/Desktop/personal projects/f1-winners/f1-prediction-app/backend/cache') 
+# Enable caching for faster data retrieval (run from the backend directory: python -m ml.test)
+enable_cache()
 
 # Load a specific race session (e.g., 2024 Bahrain GP - Race)
 session = fastf1.get_session(2024, "Bahrain", "Race")
@@ -0,0 +1,183 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fastf1
+import pandas as pd
+from config import FEATURE_TABLE_DIR
+from services.fastf1_cache import enable_cache
+
+# Bump when the columns or their meaning change; old versions are left untouched
+FEATURE_TABLE_VERSION = 1
+
+RESULT_COLUMNS = ['DriverNumber', 'Abbreviation', 'FullName', 'TeamName',
+                  'Position', 'Points', 'GridPosition', 'Status']
+
+
+def _init_worker(cache_dir):
+    if cache_dir:
+        enable_cache(cache_dir)
+
+
+def load_round(year, race_round, event_name, circuit_id):
+    """
+    Race and qualifying results of one round, without laps, telemetry,
+    weather or messages. Runs in a worker process.
+    """
+    race_session = fastf1.get_session(year, race_round, 'Race')
+    race_session.load(laps=False, telemetry=False, weather=False, messages=False)
+    quali_session = fastf1.get_session(year, race_round, 'Qualifying')
+    quali_session.load(laps=False, telemetry=False, weather=False, messages=False)
+
+    race_results = race_session.results[RESULT_COLUMNS].copy()
+    if pd.to_numeric(race_results['Position'], errors='coerce').isna().all():
+        raise ValueError("No classified results yet")
+    quali_results = quali_session.results[['DriverNumber', 'Position']].rename(
+        columns={'Position': 'QualifyingPosition'}
+    )
+    merged = pd.merge(race_results, quali_results, on='DriverNumber', how='outer')
+
+    merged['Position'] = pd.to_numeric(merged['Position'], errors='coerce')
+    merged['QualifyingPosition'] = pd.to_numeric(merged['QualifyingPosition'], errors='coerce')
+    merged['GridPosition'] = pd.to_numeric(merged['GridPosition'], errors='coerce')
+    merged['Points'] = pd.to_numeric(merged['Points'], errors='coerce')
+    merged['Track'] = event_name
+    merged['RoundNumber'] = int(race_round)
+    merged['Year'] = int(year)
+    merged['CircuitId'] = circuit_id
+    return merged
+
+
+class FeatureTable:
+    """
+    Versioned Parquet table of per-driver race results, one partition per season.
+
+    Seasons are extended round by round: only rounds missing from a partition
+    are ingested, in parallel, and finished past seasons are never revisited.
+    """
+
+    def __init__(self, table_dir=FEATURE_TABLE_DIR, max_workers=None, cache_dir=None):
+        self.table_dir = os.path.join(table_dir, f"v{FEATURE_TABLE_VERSION}")
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(self.table_dir, 'manifest.json')
+        os.makedirs(self.table_dir, exist_ok=True)
+
+    def partition_path(self, year):
+        return os.path.join(self.table_dir, f"season={year}", 'results.parquet')
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def load(self, years, update=True):
+        """
+        Results for the given seasons, ingesting any completed rounds not stored yet
+
+        Args:
+            years (list): Seasons to include
+            update (bool): Ingest missing rounds first; False reads the table as is
+
+        Returns:
+            pd.DataFrame: One row per driver per round
+        """
+        if update:
+            self.update(years)
+
+        partitions = [
+            pd.read_parquet(self.partition_path(year))
+            for year in years if os.path.exists(self.partition_path(year))
+        ]
+        if not partitions:
+            return pd.DataFrame()
+        return pd.concat(partitions, ignore_index=True)
+
+    def update(self, years):
+        """
+        Ingest completed rounds missing from the table
+
+        Returns:
+            dict: Rounds added per season
+        """
+        manifest = self._read_manifest()
+        pending = {}
+        for year in years:
+            entry = manifest.get(str(year), {'rounds': [], 'complete': False})
+            if entry['complete']:
+                continue
+            rounds, season_over = self._completed_rounds(year)
+            pending[year] = [r for r in rounds if r[0] not in entry['rounds']]
+            entry['complete'] = season_over and not pending[year]
+            entry['scheduled'] = len(rounds) if season_over else None
+            manifest[str(year)] = entry
+        pending = {year: races for year, races in pending.items() if races}
+
+        added = {}
+        if pending:
+            started = time.perf_counter()
+            jobs = [(year, *race) for year, races in pending.items() for race in races]
+            print(f"Ingesting {len(jobs)} rounds across {self.max_workers} processes...")
+
+            results = {year: [] for year in pending}
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.cache_dir,)) as executor:
+                futures = {executor.submit(load_round, *job): job for job in jobs}
+                for future in as_completed(futures):
+                    year, race_round, event_name, _ = futures[future]
+                    try:
+                        results[year].append(future.result())
+                    except Exception as e:
+                        # Not recorded in the manifest, so it is retried on the next run
+                        print(f"Error processing race {event_name} ({year}): {str(e)}")
+
+            for year, frames in results.items():
+                if not frames:
+                    continue
+                self._append_partition(year, pd.concat(frames, ignore_index=True))
+                entry = manifest[str(year)]
+                entry['rounds'] = sorted(set(entry['rounds']) | {int(f['RoundNumber'].iloc[0]) for f in frames})
+                entry['complete'] = entry['scheduled'] is not None and len(entry['rounds']) >= entry['scheduled']
+                added[year] = len(frames)
+
+            print(f"Ingested {sum(added.values())} rounds in {time.perf_counter() - started:.1f}s")
+
+        self._write_manifest(manifest)
+        return added
+
+    def _append_partition(self, year, data):
+        """Add new rounds to a season's partition, replacing the file atomically"""
+        path = self.partition_path(year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            existing = pd.read_parquet(path)
+            existing = existing[~existing['RoundNumber'].isin(data['RoundNumber'].unique())]
+            data = pd.concat([existing, data], ignore_index=True)
+
+        data = data.sort_values(['RoundNumber', 'Position'], na_position='last').reset_index(drop=True)
+        tmp_path = f"{path}.tmp"
+        data.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _completed_rounds(self, year):
+        """
+        Rounds of a season that have been raced
+
+        Returns:
+            tuple: (list of (round, event name, official name), whether the season is over)
+        """
+        schedule = fastf1.get_event_schedule(year, include_testing=False)
+        now = pd.Timestamp.now()
+        completed = schedule[schedule['EventDate'] < now]
+        rounds = [
+            (int(race['RoundNumber']), race['EventName'], race['OfficialEventName'])
+            for _, race in completed.iterrows()
+        ]
+        return rounds, len(completed) == len(schedule)
@@ -1,57 +1,604 @@
-from flask import Blueprint, jsonify
-from services.f1_predictor import F1Predictor
-from services.sentiment_analyzer import F1SentimentAnalyzer
-from services.race_analyzer import RaceAnalyzer
-from services.race_calendar import RaceCalendarService  # Import the new service
+from flask import Blueprint, Response, jsonify, make_response, request, stream_with_context, url_for
+from importlib import import_module
+from config import JOB_QUEUE_SIZE, JOB_WORKERS
+from services.service_registry import ServiceRegistry
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import logging
+import threading
+import time
 
 api_bp = Blueprint('api', __name__)
-predictor = F1Predictor()
-race_analyzer = RaceAnalyzer()
-race_calendar_service = RaceCalendarService()  # Initialize the new service
+
+# Services are built on first use, or ahead of time by services.warm_up() in app.py,
+# so importing this module stays cheap: fastf1, pandas, TextBlob and scikit-learn load later
+services = ServiceRegistry()
+shared_cache = services.register(
+    'shared_cache', lambda: import_module('services.shared_cache').SharedCache()
+)
+job_queue = services.register(
+    'job_queue',
+    lambda: import_module('services.job_queue').JobQueue(shared_cache.get(), JOB_WORKERS, JOB_QUEUE_SIZE),
+    requires=[shared_cache]
+)
+fastf1_cache = services.register(
+    'fastf1_cache', lambda: import_module('services.fastf1_cache').enable_cache()
+)
+race_calendar_service = services.register(
+    'race_calendar', lambda: import_module('services.race_calendar').RaceCalendarService(),
+    requires=[fastf1_cache]
+)
+predictor = services.register(
+    'predictor', lambda: import_module('services.f1_predictor').F1Predictor(), requires=[fastf1_cache]
+)
+sentiment_feeds = services.register(
+    'sentiment_feeds', lambda: predictor.sentiment_analyzer.refresh(), requires=[predictor]
+)
+race_analyzer = services.register(
+    'race_analyzer', lambda: import_module('services.race_analyzer').RaceAnalyzer(), requires=[fastf1_cache]
+)
+season_analyzer = services.register(
+    'season_analyzer',
+    lambda: import_module('services.season_analyzer').SeasonAnalyzer(calendar_service=race_calendar_service.get()),
+    requires=[race_calendar_service]
+)
+telemetry_comparison = services.register(
+    'telemetry_comparison',
+    lambda: import_module('services.telemetry_comparison').TelemetryComparison(predictor.performance_analyzer),
+    requires=[predictor]
+)
+championship_simulator = services.register(
+    'championship_simulator',
+    lambda: import_module('services.championship_simulator').ChampionshipSimulator(predictor.championship_calculator),
+    requires=[predictor]
+)
+standings_history = services.register(
+    'standings_history',
+    lambda: import_module('services.standings_history').StandingsHistory(predictor.championship_calculator),
+    requires=[predictor]
+)
+ml_prediction_service = services.register(
+    'ml_prediction',
+    lambda: import_module('services.ml_prediction_service').MLPredictionService(predictor=predictor.get()),
+    requires=[predictor]
+)
+prediction_history = services.register(
+    'prediction_history', lambda: import_module('services.prediction_history').PredictionHistory()
+)
+
+# Workers compare this counter with the one in the shared cache to spot data
+# another worker has ingested, and key shared results by it
+DATA_GENERATION = 'data'
+# A new model artifact only needs workers to reload it; results keyed by the
+# model version are replaced without discarding everything derived from the data
+MODEL_GENERATION = 'model'
+GENERATION_CHECK_INTERVAL = 1.0  # Seconds between checks, per worker
+# Shared results outlive their data generation by at most this long
+RESULT_TTL = 7 * 24 * 3600
+# Results keyed by client-supplied parameters expire sooner, so arbitrary
+# parameters cannot grow the shared cache without limit
+PARAMETERIZED_TTL = 6 * 3600
+_generation = {'seen': None, 'model_seen': None, 'checked_at': 0.0}
+
+def sync_generation():
+    """Drop this worker's local caches once another worker has published new data or a new model"""
+    now = time.monotonic()
+    if now - _generation['checked_at'] < GENERATION_CHECK_INTERVAL:
+        return _generation['seen']
+    _generation['checked_at'] = now
+
+    generation = shared_cache.generation(DATA_GENERATION)
+    if _generation['seen'] is not None and generation != _generation['seen']:
+        # Only services already built hold caches worth dropping
+        if predictor.ready:
+            predictor.invalidate()
+            predictor.championship_calculator.invalidate()
+        if ml_prediction_service.ready:
+            ml_prediction_service.invalidate()
+        if telemetry_comparison.ready:
+            telemetry_comparison.invalidate()
+    _generation['seen'] = generation
+
+    model_generation = shared_cache.generation(MODEL_GENERATION)
+    if _generation['model_seen'] is not None and model_generation != _generation['model_seen']:
+        if ml_prediction_service.ready:
+            ml_prediction_service.load(force=True)
+            ml_prediction_service.invalidate()
+    _generation['model_seen'] = model_generation
+    return generation
+
+def shared(name, compute, ttl=RESULT_TTL):
+    """Result of ``compute`` for the current data, computed once by whichever worker asks first"""
+    return _get_or_compute(f"{name}:{sync_generation()}", compute, ttl)
+
+def _get_or_compute(key, compute, ttl):
+    def compute_versioned():
+        value = compute()
+        if value is not None:
+            _store_version(key, value, ttl)
+        return value
+    return shared_cache.get_or_compute(key, compute_versioned, ttl)
+
+def _store_version(key, value, ttl):
+    """Record a shared result's validators beside it, so revalidation never loads the result"""
+    body = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    version = {
+        'etag': f"{key.rsplit(':', 1)[1]}-{hashlib.sha256(body).hexdigest()[:24]}",
+        'modified': datetime.now(timezone.utc).isoformat()
+    }
+    shared_cache.write(f"version:{key}", version, ttl)
+    return version
+
+def shared_response(name, compute, fallback, ttl=RESULT_TTL, max_age=60, background=False):
+    """
+    JSON response for a shared result, revalidated against its ETag and Last-Modified
+
+    Args:
+        name (str): Shared cache key of the result, without the data generation
+        compute (callable): Builds the result; None means it is unavailable
+        fallback (callable): Response to send when the result is unavailable
+        ttl (float): Seconds to keep the result and its validators
+        max_age (int): Seconds clients may reuse the response without asking
+        background (bool): Compute a missing result in the job pool and answer 202
+    """
+    key = f"{name}:{sync_generation()}"
+    version = shared_cache.read(f"version:{key}")
+    value = None
+    if version is None:
+        if background:
+            return background_response(key, compute, fallback, ttl)
+        value = _get_or_compute(key, compute, ttl)
+        if value is None:
+            return fallback()
+        version = shared_cache.read(f"version:{key}") or _store_version(key, value, ttl)
+
+    def build():
+        result = value if value is not None else _get_or_compute(key, compute, ttl)
+        return jsonify(result) if result is not None else fallback()
+
+    return conditional_response(version['etag'], build, datetime.fromisoformat(version['modified']), max_age)
+
+# A job that failed or found nothing answers requests for its result this long
+# before another attempt, so polling clients do not resubmit it in a loop
+JOB_RETRY_INTERVAL = timedelta(seconds=60)
+
+def finished_job(key):
+    """The job that last computed ``key``, if it finished within JOB_RETRY_INTERVAL"""
+    job = job_queue.find(job_queue.job_id(key))
+    if job is not None and job['finished_at'] is not None and \
+            datetime.now(timezone.utc) - datetime.fromisoformat(job['finished_at']) < JOB_RETRY_INTERVAL:
+        return job
+    return None
+
+def submit_job(key, compute, ttl):
+    """Compute a shared result in the job pool, joining the job already running for it"""
+    return job_queue.submit(key, lambda: _get_or_compute(key, compute, ttl), kind=key.split(':', 1)[0],
+                            url=request.full_path.rstrip('?'))
+
+def background_response(key, compute, fallback, ttl):
+    """202 pointing at the job computing a missing shared result, started unless already running"""
+    job = finished_job(key)
+    if job is not None:
+        if job['state'] == 'failed':
+            return jsonify({'error': job['error']}), 500
+        if not job['found']:
+            return fallback()
+
+    job = submit_job(key, compute, ttl)
+    if job is None:
+        response = jsonify({'error': 'Too many jobs queued, try again shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers['Location'] = url_for('api.get_job', job_id=job['id'])
+    response.headers['Retry-After'] = '1'
+    return response
+
+def conditional_response(etag, build, last_modified=None, max_age=60):
+    """
+    304 when the client already holds ``etag``, otherwise the response build() makes.
+    build() only runs when a body is sent, so a revalidation skips serialization.
+
+    Args:
+        etag (str): Strong validator derived from the data version behind the response
+        build (callable): Makes the full response; anything but a 200 is sent as is
+        last_modified (datetime): When that data version was produced, for If-Modified-Since
+        max_age (int): Seconds clients may reuse the response without asking
+    """
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = (last_modified is not None and request.if_modified_since is not None
+                        and last_modified.replace(microsecond=0) <= request.if_modified_since)
+
+    if not_modified:
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+@api_bp.after_request
+def default_cache_headers(response):
+    """Errors, status and other responses without a validator are never reused"""
+    if 'Cache-Control' not in response.headers:
+        response.cache_control.no_store = True
+    return response
+
+def publish_update(job=None):
+    """Tell every worker that data changed, then fill the shared results they will ask for"""
+    _generation['seen'] = shared_cache.bump(DATA_GENERATION)
+    _generation['checked_at'] = time.monotonic()
+    shared('prediction', build_prediction, ttl=3600)
+    shared('last-race', predictor.get_last_race_results)
+    shared('championship', predictor.get_championship_standings)
+
+def publish_model():
+    """Tell every worker to load the model artifact this worker just switched to"""
+    _generation['model_seen'] = shared_cache.bump(MODEL_GENERATION)
+
+def update_ml_model(job):
+    """Race results landed: fold the round into the model and have every worker serve it"""
+    update = ml_prediction_service.update_model(job)
+    if update is not None and update['mode'] in ('online', 'retrained'):
+        publish_model()
+
+def build_prediction(recent_races=None):
+    """Race and qualifying predictions, or None so that a failed race prediction is not shared"""
+    race_prediction = predict_and_record(recent_races)
+    if race_prediction is None:
+        return None
+    quali_prediction = predictor.predict_qualifying(recent_races)
+
+    # Debug logging
+    logging.info("Race prediction sentiment data: %s", race_prediction.get('sentiment'))
+    logging.info("Quali prediction sentiment data: %s",
+                 quali_prediction.get('sentiment') if quali_prediction else None)
+
+    return {
+        'prediction': {
+            'race': race_prediction,
+            'qualifying': quali_prediction
+        }
+    }
+
+def predict_and_record(recent_races=None):
+    """Heuristic prediction for the next race, stored in the prediction history"""
+    race_prediction = predictor.predict_next_race(recent_races)
+    prediction_history.record_heuristic(race_calendar_service.get_next_race(), race_prediction,
+                                        predictor.MODEL_VERSION)
+    return race_prediction
+
+def rebuild_after_results(job):
+    """Race or sprint results landed: invalidate standings and race data, then rebuild them"""
+    predictor.championship_calculator.invalidate()
+    predictor.invalidate()
+    predictor.get_last_race_results()
+    predictor.championship_calculator.calculate_championship_status()
+    standings_history.update(job['year'])
+    predict_and_record()
+
+def rebuild_prediction(job):
+    """Practice or qualifying data landed: rebuild the prediction that uses it"""
+    predict_and_record()
+
+def ingest_season_round(job):
+    """Race results landed: add the round to the season summaries"""
+    season_analyzer.ingest_round(job['year'], job['round'])
+
+def score_predictions(job):
+    """Race results landed: store them and score every prediction made for the round"""
+    prediction_history.record_results(job['year'], job['round'])
+
+def build_ingestion_scheduler():
+    scheduler = import_module('services.ingestion_scheduler').IngestionScheduler(race_calendar_service.get())
+    scheduler.subscribe(rebuild_after_results, ('S', 'R'))
+    scheduler.subscribe(rebuild_prediction, ('FP1', 'FP2', 'FP3', 'SQ', 'Q'))
+    scheduler.subscribe(lambda job: ml_prediction_service.invalidate(job), ('FP1', 'FP2', 'FP3', 'Q', 'R'))
+    scheduler.subscribe(update_ml_model, ('R',))
+    scheduler.subscribe(score_predictions, ('R',))
+    scheduler.subscribe(ingest_season_round, ('R',))
+    scheduler.subscribe(publish_update)  # Last, once this worker has rebuilt
+    return scheduler
+
+ingestion_scheduler = services.register('ingestion_scheduler', build_ingestion_scheduler,
+                                        requires=[race_calendar_service])
+
+@api_bp.route('/ready', methods=['GET'])
+def get_readiness():
+    """Endpoint reporting which services are built, for load balancers and deploy checks."""
+    status = services.status()
+    return jsonify(status), 200 if status['ready'] else 503
 
 @api_bp.route('/prediction', methods=['GET'])
 def get_prediction():
     try:
-        race_prediction = predictor.predict_next_race()
-        quali_prediction = predictor.predict_qualifying()
-        
-        # Debug logging
-        logging.info("Race prediction sentiment data: %s", 
-                    race_prediction.get('sentiment') if race_prediction else None)
-        logging.info("Quali prediction sentiment data: %s", 
-                    quali_prediction.get('sentiment') if quali_prediction else None)
-        
-        return jsonify({
-            'prediction': {
-                'race': race_prediction,
-                'qualifying': quali_prediction
-            }
-        })
+        # Sentiment in the prediction moves with the news feeds, so it expires hourly
+        return shared_response(
+            'prediction', build_prediction,
+            fallback=lambda: jsonify({'prediction': {'race': None, 'qualifying': predictor.predict_qualifying()}}),
+            ttl=3600, background=True
+        )
     except Exception as e:
         logging.error(f"Error in prediction endpoint: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/last-race', methods=['GET'])
 def get_last_race():
-    results = predictor.get_last_race_results()
-    if results:
-        return jsonify(results)
-    return jsonify({'error': 'Unable to fetch last race results'}), 500
+    return shared_response(
+        'last-race', predictor.get_last_race_results,
+        fallback=lambda: (jsonify({'error': 'Unable to fetch last race results'}), 500)
+    )
 
 @api_bp.route('/championship', methods=['GET'])
 def get_championship():
-    championship_data = predictor.get_championship_standings()
-    if championship_data:
-        return jsonify(championship_data)
-    return jsonify({'error': 'Unable to fetch championship data'}), 500
+    return shared_response(
+        'championship', predictor.get_championship_standings,
+        fallback=lambda: (jsonify({'error': 'Unable to fetch championship data'}), 500)
+    )
+
+# Inputs the dashboard sections build from. Each is loaded once per data
+# generation, by whichever section job needs it first, and handed to the others.
+DASHBOARD_INPUTS = {
+    'recent_races': lambda: predictor.get_recent_races(),
+    'season_data': lambda: predictor.championship_calculator.get_season_data()
+}
+_dashboard_inputs = {name: {'generation': None, 'value': None, 'lock': threading.Lock()} for name in DASHBOARD_INPUTS}
+
+def dashboard_input(name, generation):
+    """A dashboard input for ``generation``, loaded unless already held; a failed load is retried"""
+    entry = _dashboard_inputs[name]
+    with entry['lock']:
+        if entry['generation'] != generation or entry['value'] is None:
+            entry['value'] = DASHBOARD_INPUTS[name]()
+            entry['generation'] = generation
+        return entry['value']
+
+# Sections of /api/dashboard: the shared result behind each, how long to keep it,
+# the inputs it is built from and how to build it. They reuse the results of the
+# standalone endpoints. Jobs are queued in this order, so sections loading
+# different inputs start first and a small pool still loads both at once.
+DASHBOARD_SECTIONS = {
+    'prediction': ('prediction', 3600, ('recent_races',), build_prediction),
+    'championship': ('championship', RESULT_TTL, ('season_data',),
+                     lambda season_data: predictor.get_championship_standings(season_data)),
+    'last_race': ('last-race', RESULT_TTL, ('recent_races',), lambda races: predictor.get_last_race_results(races))
+}
+
+def section_compute(build, inputs, generation):
+    """Build a dashboard section from the shared inputs of ``generation``"""
+    return lambda: build(*(dashboard_input(name, generation) for name in inputs))
+
+def build_dashboard():
+    """
+    Every dashboard section with its own status. Warm sections are read from
+    the shared cache; cold ones are computed concurrently by background jobs
+    over one set of inputs, shared by every client asking for them, and
+    reported as pending until they finish.
+    """
+    generation = sync_generation()
+    sections = {}
+    for section, (name, ttl, inputs, build) in DASHBOARD_SECTIONS.items():
+        started = time.perf_counter()
+        key = f"{name}:{generation}"
+        data, job = shared_cache.read(key), None
+        if data is None:
+            job = finished_job(key)
+            if job is None or (job['state'] != 'failed' and job['found']):
+                job = submit_job(key, section_compute(build, inputs, generation), ttl)
+                if job is None:
+                    # Queue full; the next poll tries again
+                    sections[section] = {'status': 'pending', 'data': None, 'error': None, 'job': None, 'seconds': None}
+                    continue
+            if job['state'] in job_queue.ACTIVE_STATES:
+                sections[section] = {'status': 'pending', 'data': None, 'error': None, 'job': job['id'], 'seconds': None}
+                continue
+            data = shared_cache.read(key)
+
+        sections[section] = {
+            'status': 'ok' if data is not None else 'error',
+            'data': data,
+            'error': None if data is not None else (job or {}).get('error') or f'Unable to fetch {section.replace("_", " ")}',
+            'job': None,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+    return {'sections': sections}
+
+@api_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """Endpoint for the prediction, last race and championship in one response, each with its own status."""
+    try:
+        generation = sync_generation()
+        versions = [shared_cache.read(f"version:{name}:{generation}") for name, *_ in DASHBOARD_SECTIONS.values()]
+        if not all(versions):
+            # Something is cold or failed; send what is ready without validators
+            dashboard = build_dashboard()
+            response = jsonify(dashboard)
+            if any(section['status'] == 'pending' for section in dashboard['sections'].values()):
+                response.headers['Retry-After'] = str(JOB_POLL_INTERVAL)
+            return response
+
+        etag = hashlib.sha256(':'.join(version['etag'] for version in versions).encode('utf-8')).hexdigest()[:32]
+        return conditional_response(
+            etag, lambda: jsonify(build_dashboard()),
+            max(datetime.fromisoformat(version['modified']) for version in versions)
+        )
+    except Exception as e:
+        logging.error(f"Error in dashboard endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+SIMULATION_SIZES = (10000, 50000, 200000, 1000000)
+
+@api_bp.route('/championship/simulation', methods=['GET'])
+def get_championship_simulation():
+    """Endpoint to estimate title probabilities by simulating the remaining races."""
+    try:
+        requested = request.args.get('simulations', championship_simulator.DEFAULT_SIMULATIONS, type=int)
+        # Snap to a few sizes, so each is simulated and stored once
+        simulations = next((n for n in SIMULATION_SIZES if n >= requested), SIMULATION_SIZES[-1])
+        seed = request.args.get('seed', type=int)
+
+        # Runs larger than the default take seconds, so they go to the job queue
+        return shared_response(
+            f"simulation:{simulations}:{seed}",
+            lambda: championship_simulator.simulate(simulations, seed=seed),
+            fallback=lambda: (jsonify({'error': 'Unable to simulate championship'}), 500),
+            ttl=PARAMETERIZED_TTL, max_age=300,
+            background=simulations > championship_simulator.DEFAULT_SIMULATIONS
+        )
+    except Exception as e:
+        logging.error(f"Error in championship simulation endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/championship/progression', methods=['GET'])
+def get_championship_progression():
+    """Endpoint for cumulative points and positions after every round of a season."""
+    try:
+        year = request.args.get('year', datetime.now().year, type=int)
+        kind = request.args.get('type', 'drivers')
+        if kind not in standings_history.KINDS:
+            return jsonify({'error': 'type must be drivers or constructors'}), 400
+
+        return shared_response(
+            f"progression:{year}:{kind}", lambda: standings_history.get_progression(year, kind),
+            fallback=lambda: (jsonify({'error': f'No standings history for {year}'}), 404),
+            ttl=PARAMETERIZED_TTL
+        )
+    except Exception as e:
+        logging.error(f"Error in championship progression endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/championship/gap-to-leader', methods=['GET'])
+def get_championship_gap_to_leader():
+    """Endpoint for each entry's points gap to the leader after every round."""
+    try:
+        year = request.args.get('year', datetime.now().year, type=int)
+        kind = request.args.get('type', 'drivers')
+        if kind not in standings_history.KINDS:
+            return jsonify({'error': 'type must be drivers or constructors'}), 400
+
+        return shared_response(
+            f"gap-to-leader:{year}:{kind}", lambda: standings_history.get_gap_to_leader(year, kind),
+            fallback=lambda: (jsonify({'error': f'No standings history for {year}'}), 404),
+            ttl=PARAMETERIZED_TTL
+        )
+    except Exception as e:
+        logging.error(f"Error in gap-to-leader endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/ml-prediction', methods=['GET'])
+def get_ml_prediction():
+    """Endpoint for the trained model's win probabilities over the next race's grid."""
+    try:
+        if ml_prediction_service.artifact is None and not ml_prediction_service.load():
+            return jsonify({'error': 'No trained model available'}), 404
+
+        def predict_and_record_ml():
+            prediction = ml_prediction_service.predict_next_race()
+            prediction_history.record_ml(prediction)
+            return prediction
+
+        return shared_response(
+            f"ml-prediction:{ml_prediction_service.get_model_info()['version']}", predict_and_record_ml,
+            fallback=lambda: (jsonify({'error': 'Unable to generate ML prediction'}), 500)
+        )
+    except Exception as e:
+        logging.error(f"Error in ML prediction endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/ml-prediction/reload', methods=['POST'])
+def reload_ml_model():
+    """Endpoint to load the newest model artifact without restarting the server."""
+    try:
+        if not ml_prediction_service.load(force=True):
+            return jsonify({'error': 'No trained model available'}), 404
+        ml_prediction_service.invalidate()
+        publish_model()  # Other workers load the new artifact too
+        return jsonify(ml_prediction_service.get_model_info())
+    except Exception as e:
+        logging.error(f"Error reloading ML model: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/predictions/history', methods=['GET'])
+def get_prediction_history():
+    """Endpoint for stored predictions, newest first, scored once results are in."""
+    try:
+        source = request.args.get('source')
+        if source is not None and source not in prediction_history.SOURCES:
+            return jsonify({'error': 'source must be heuristic or ml'}), 400
+
+        season = request.args.get('year', type=int)
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return history_response(
+            f"history:{season}:{source}:{limit}",
+            lambda: jsonify({'predictions': prediction_history.get_history(season=season, source=source, limit=limit)})
+        )
+    except Exception as e:
+        logging.error(f"Error in prediction history endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/predictions/leaderboard', methods=['GET'])
+def get_prediction_leaderboard():
+    """Endpoint for winner hit rate, top-3 overlap and Brier score per model version."""
+    try:
+        since = request.args.get('since', type=int)
+        return history_response(
+            f"leaderboard:{since}",
+            lambda: jsonify({'leaderboard': prediction_history.get_leaderboard(since=since)})
+        )
+    except Exception as e:
+        logging.error(f"Error in prediction leaderboard endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/predictions/calibration', methods=['GET'])
+def get_prediction_calibration():
+    """Endpoint comparing predicted win likelihood with the observed win rate."""
+    try:
+        source = request.args.get('source', 'ml')
+        if source not in prediction_history.SOURCES:
+            return jsonify({'error': 'source must be heuristic or ml'}), 400
+
+        bins = min(max(request.args.get('bins', 10, type=int), 2), 50)
+        since = request.args.get('since', type=int)
+        return history_response(
+            f"calibration:{source}:{bins}:{since}",
+            lambda: jsonify({
+                'source': source,
+                'bins': prediction_history.get_calibration(source=source, bins=bins, since=since)
+            })
+        )
+    except Exception as e:
+        logging.error(f"Error in prediction calibration endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def history_response(query, build):
+    """Prediction history responses, revalidated until a prediction or result is stored"""
+    version = prediction_history.get_version()
+    etag = hashlib.sha256(f"{query}:{version['version']}".encode('utf-8')).hexdigest()[:32]
+    return conditional_response(etag, build, version['modified'], max_age=0)
 
 @api_bp.route('/driver-sentiment/<driver_name>')
 def get_driver_sentiment_details(driver_name):
     try:
-        analyzer = F1SentimentAnalyzer()
-        sentiment_data = analyzer.get_driver_sentiment_details(driver_name)
-        return jsonify(sentiment_data)
+        # Feeds refresh hourly, so the shared result expires with them
+        return shared_response(
+            f"sentiment:{driver_name.lower()}",
+            lambda: predictor.sentiment_analyzer.get_driver_sentiment_details(driver_name),
+            fallback=lambda: jsonify(None),
+            ttl=3600, max_age=300
+        )
     except Exception as e:
         logging.error(f"Error getting sentiment details: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -59,17 +606,19 @@ def get_driver_sentiment_details(driver_name):
 @api_bp.route('/race-analysis/<driver>', methods=['GET'])
 def get_race_analysis(driver):
     try:
-        logging.info(f"Fetching race analysis for driver: {driver}")
-        analysis = race_analyzer.get_driver_race_analysis(driver)
-        
-        if not analysis:
+        def not_found():
             logging.error(f"No analysis data found for driver: {driver}")
             return jsonify({
                 'error': 'No analysis data found',
                 'message': f'Could not find race data for driver: {driver}'
             }), 404
-            
-        return jsonify(analysis)
+
+        def analyze():
+            logging.info(f"Fetching race analysis for driver: {driver}")
+            return race_analyzer.get_driver_race_analysis(driver) or None
+
+        return shared_response(f"race-analysis:{driver.lower()}", analyze, fallback=not_found,
+                               ttl=PARAMETERIZED_TTL, max_age=300, background=True)
         
     except Exception as e:
         logging.error(f"Error in race analysis endpoint for {driver}: {str(e)}")
@@ -78,15 +627,157 @@ def get_race_analysis(driver):
             'message': str(e)
         }), 500
 
+@api_bp.route('/driver-season/<driver>', methods=['GET'])
+def get_driver_season(driver):
+    """Endpoint to fetch a driver's round-by-round history for a season."""
+    try:
+        year = request.args.get('year', type=int)
+
+        def build_season():
+            logging.info(f"Fetching season history for driver: {driver} ({year or 'current season'})")
+            return season_analyzer.get_driver_season(driver, year) or None
+
+        return shared_response(
+            f"driver-season:{driver.lower()}:{year}", build_season,
+            fallback=lambda: (jsonify({
+                'error': 'No season data found',
+                'message': f'Could not find season data for driver: {driver}'
+            }), 404),
+            ttl=PARAMETERIZED_TTL, max_age=300, background=True
+        )
+
+    except Exception as e:
+        logging.error(f"Error in driver season endpoint for {driver}: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
+COMPARISON_FORMAT = 1  # Bump whenever the comparison's output changes, so clients refetch
+
+@api_bp.route('/telemetry/compare', methods=['GET'])
+def compare_telemetry():
+    """Endpoint to overlay two drivers' fastest laps on a common distance grid."""
+    drivers = [d.strip() for d in request.args.get('drivers', '').split(',') if d.strip()]
+    race_round = request.args.get('round', type=int)
+    session_type = request.args.get('session', 'Q')
+    year = request.args.get('year', datetime.now().year, type=int)
+
+    if len(drivers) != 2 or race_round is None:
+        return jsonify({
+            'error': 'Invalid request',
+            'message': 'Expected drivers=A,B and a numeric round'
+        }), 400
+
+    def build_comparison():
+        comparison = telemetry_comparison.compare_drivers(
+            year, race_round, session_type, drivers[0], drivers[1]
+        )
+        if not comparison:
+            return jsonify({
+                'error': 'No telemetry data found',
+                'message': f'Could not compare {drivers[0]} and {drivers[1]} in round {race_round} {session_type}'
+            }), 404
+        return jsonify(comparison)
+
+    try:
+        # A settled session's fastest laps never change, so the session, the drivers and
+        # the comparison's format are the version. Until then its data may still land,
+        # so the data generation is part of the version and clients revalidate often.
+        settled = ingestion_scheduler.is_settled(year, race_round, session_type.upper())
+        data_version = 'settled' if settled else sync_generation()
+        session_id = (f"{COMPARISON_FORMAT}:{data_version}:{year}:{race_round}:{session_type.upper()}:"
+                      f"{drivers[0].upper()}:{drivers[1].upper()}")
+        etag = hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:32]
+        return conditional_response(etag, build_comparison, max_age=86400 if settled else 60)
+
+    except Exception as e:
+        logging.error(f"Error in telemetry comparison endpoint: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
+@api_bp.route('/ingestion/status', methods=['GET'])
+def get_ingestion_status():
+    """Endpoint to monitor the calendar-driven ingestion jobs."""
+    try:
+        return jsonify(ingestion_scheduler.get_status())
+    except Exception as e:
+        logging.error(f"Error in ingestion status endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Request threads are few, so a poll holds one only briefly; clients poll again after Retry-After
+JOB_MAX_WAIT = 2.0
+JOB_POLL_INTERVAL = 1
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Endpoint to poll a background job; wait=N holds the request briefly (up to JOB_MAX_WAIT) for it to finish."""
+    try:
+        wait = min(max(request.args.get('wait', 0, type=float), 0), JOB_MAX_WAIT)
+        job = job_queue.wait(job_id, wait) if wait else job_queue.find(job_id)
+        if job is None:
+            return jsonify({'error': f'No job {job_id}'}), 404
+
+        response = jsonify(job)
+        if job['state'] == 'done' and job['url']:
+            response.headers['Location'] = job['url']
+        elif job['state'] in job_queue.ACTIVE_STATES:
+            response.headers['Retry-After'] = str(JOB_POLL_INTERVAL)
+        return response
+    except Exception as e:
+        logging.error(f"Error in job endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """Endpoint to monitor this worker's job pool, recent jobs and their wait and run times."""
+    try:
+        return jsonify(job_queue.get_status())
+    except Exception as e:
+        logging.error(f"Error in jobs endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/race-calendar', methods=['GET'])
 def get_race_calendar():
-    """Endpoint to fetch the current season's race calendar."""
+    """Endpoint to fetch the current season's race calendar, revalidated by ETag."""
     try:
-        race_calendar = race_calendar_service.get_race_calendar()
-        if race_calendar:
-            return jsonify(race_calendar)
-        else:
+        artifact = race_calendar_service.get_calendar_artifact()
+        if not artifact:
             return jsonify({'error': 'Unable to fetch race calendar'}), 500
+
+        return conditional_response(
+            artifact['etag'], lambda: Response(artifact['body'], mimetype='application/json'),
+            artifact['built_at'], _calendar_max_age(artifact)
+        )
     except Exception as e:
         logging.error(f"Error in race calendar endpoint: {str(e)}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/race-calendar.ics', methods=['GET'])
+def get_race_calendar_ics():
+    """Endpoint to stream every session of the season as an iCalendar feed."""
+    try:
+        artifact = race_calendar_service.get_calendar_artifact()
+        if not artifact:
+            return jsonify({'error': 'Unable to fetch race calendar'}), 500
+
+        def build_ics():
+            response = Response(
+                stream_with_context(race_calendar_service.iter_ical(artifact['year'])),
+                mimetype='text/calendar'
+            )
+            response.headers['Content-Disposition'] = f"attachment; filename=f1-{artifact['year']}.ics"
+            return response
+
+        return conditional_response(f"{artifact['etag']}-ics", build_ics, artifact['built_at'],
+                                    _calendar_max_age(artifact))
+    except Exception as e:
+        logging.error(f"Error in race calendar export endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def _calendar_max_age(artifact):
+    """Cached until the next session starts and at most an hour"""
+    seconds = race_calendar_service.seconds_to_next_session(artifact)
+    return int(min(seconds, 3600)) if seconds is not None else 3600
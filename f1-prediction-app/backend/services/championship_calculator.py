@@ -1,28 +1,330 @@
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
 import logging
+from .championship_elimination import EliminationSolver
 
 class ChampionshipCalculator:
+    REQUEST_TIMEOUT = (3.05, 10)  # Connect and read timeouts per request, in seconds
+    FETCH_DEADLINE = 15  # Seconds allowed for the whole concurrent batch
+    RESULTS_LAG = timedelta(hours=3)  # Time after lights out before results are expected upstream
+    RETRY_INTERVAL = timedelta(minutes=10)  # How often to re-check while upstream lags behind
+
+    ENDPOINTS = {
+        'driver_standings': 'current/driverStandings',
+        'constructor_standings': 'current/constructorStandings',
+        'last_race': 'current/last',
+        'season': 'current'
+    }
+
+    # Shared by every instance: one pooled HTTP session and one response cache
+    _http = None
+    _executor = ThreadPoolExecutor(max_workers=len(ENDPOINTS), thread_name_prefix='ergast')
+    _cache = None
+    _lock = threading.Lock()
+    _fetched = threading.Condition(_lock)  # Signalled when a refetch finishes
+    _fetching = False
+
     def __init__(self):
         self.BASE_URL = "https://api.jolpi.ca/ergast/f1"
+        self.elimination_cache = {}
+
+    @classmethod
+    def _get_http(cls):
+        if cls._http is None:
+            http = requests.Session()
+            retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+            http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=len(cls.ENDPOINTS), max_retries=retries))
+            cls._http = http
+        return cls._http
+
+    def _fetch(self, path):
+        response = self._get_http().get(f"{self.BASE_URL}/{path}", timeout=self.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_all(self):
+        """Fetch every endpoint concurrently within FETCH_DEADLINE"""
+        futures = {name: self._executor.submit(self._fetch, path) for name, path in self.ENDPOINTS.items()}
+        done, not_done = wait(futures.values(), timeout=self.FETCH_DEADLINE)
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            raise TimeoutError(f"Ergast requests did not finish within {self.FETCH_DEADLINE}s")
+        return {name: future.result() for name, future in futures.items()}
+
+    def _fetch_paged(self, path, limit=100):
+        """Fetch every page of a race table endpoint, later pages concurrently"""
+        first = self._fetch(f"{path}?limit={limit}&offset=0")
+        total = int(first['MRData']['total'])
+        futures = [
+            self._executor.submit(self._fetch, f"{path}?limit={limit}&offset={offset}")
+            for offset in range(limit, total, limit)
+        ]
+        done, not_done = wait(futures, timeout=self.FETCH_DEADLINE)
+        if not_done:
+            raise TimeoutError(f"Ergast requests did not finish within {self.FETCH_DEADLINE}s")
+
+        # A race can be split across pages, so merge result lists by round
+        races = {}
+        for page in [first] + [future.result() for future in futures]:
+            for race in page['MRData']['RaceTable']['Races']:
+                result_key = 'SprintResults' if 'SprintResults' in race else 'Results'
+                if race['round'] in races:
+                    races[race['round']][result_key].extend(race[result_key])
+                else:
+                    races[race['round']] = race
+        return [races[r] for r in sorted(races, key=int)]
+
+    def _expected_completed(self, season_data, now):
+        """
+        Last round and number of sprints whose results should be available,
+        judged from the cached schedule
+
+        Returns:
+            tuple: (round, sprints)
+        """
+        completed, sprints = 0, 0
+        for race in season_data['MRData']['RaceTable']['Races']:
+            if 'Sprint' in race and self._session_start(race['Sprint']) + self.RESULTS_LAG <= now:
+                sprints += 1
+            if self._session_start(race) + self.RESULTS_LAG <= now:
+                completed = int(race['round'])
+        return completed, sprints
+
+    @staticmethod
+    def _session_start(session):
+        return datetime.fromisoformat(f"{session['date']}T{session.get('time', '00:00:00Z').replace('Z', '+00:00')}")
+
+    def get_season_data(self):
+        """
+        Get standings and schedule data, refetching only when a race or sprint has finished
+
+        Returns:
+            dict: Raw Ergast responses keyed by ENDPOINTS name, or None if unavailable
+        """
+        with self._lock:
+            while True:
+                cache = ChampionshipCalculator._cache
+                now = datetime.now(timezone.utc)
+                if cache is not None and not cache.get('stale'):
+                    expected_round, expected_sprints = self._expected_completed(cache['data']['season'], now)
+                    same_season = cache['data']['season']['MRData']['RaceTable']['season'] == str(now.year)
+                    if same_season and cache['round'] >= expected_round and cache['sprints'] >= expected_sprints:
+                        return cache['data']
+                    # Upstream may lag behind the calendar or be down; don't hammer it
+                    # while it catches up, whether the last attempt succeeded or failed
+                    last_attempt = max(cache['fetched_at'], cache.get('failed_at', cache['fetched_at']))
+                    if now - last_attempt < self.RETRY_INTERVAL:
+                        return cache['data']
+                elif cache is not None and now - cache.get('failed_at', datetime.min.replace(tzinfo=timezone.utc)) < self.RETRY_INTERVAL:
+                    # Invalidated, but the last refetch failed; retry on the same interval
+                    return cache['data']
+
+                if not ChampionshipCalculator._fetching:
+                    break
+                if cache is not None:
+                    # Another thread is refetching; serve what we have meanwhile
+                    return cache['data']
+                self._fetched.wait()
+                if ChampionshipCalculator._cache is None:
+                    return None  # The fetch this thread waited on failed
+            ChampionshipCalculator._fetching = True
+
+        # The network I/O runs outside the lock, so one slow fetch never blocks readers
+        try:
+            data = self._fetch_all()
+        except Exception as e:
+            logging.error(f"Error fetching championship data: {e}")
+            data = None
+
+        with self._lock:
+            ChampionshipCalculator._fetching = False
+            self._fetched.notify_all()
+            if data is None:
+                if cache is not None:
+                    cache['failed_at'] = now
+                return cache['data'] if cache is not None else None
+
+            last_round = int(data['last_race']['MRData']['RaceTable'].get('round', 0))
+            # Sprints past their results lag at fetch time are taken to be in the standings
+            _, sprints = self._expected_completed(data['season'], now)
+            ChampionshipCalculator._cache = {
+                'data': data,
+                'round': last_round,
+                'sprints': sprints,
+                'fetched_at': now
+            }
+            return data
+
+    @classmethod
+    def invalidate(cls):
+        """Refetch on the next read, e.g. once a race or sprint result has landed"""
+        with cls._lock:
+            if cls._cache is not None:
+                cls._cache['stale'] = True
+                cls._cache.pop('failed_at', None)
+
+    def get_season_results(self):
+        """
+        Race results of the current season, fetched once per completed round
+
+        Returns:
+            list: Ergast race entries with their 'Results', or None if unavailable
+        """
+        data = self.get_season_data()
+        if data is None:
+            return None
+
+        with self._lock:
+            cache = ChampionshipCalculator._cache
+            if 'results' in cache:
+                return cache['results']
+
+        # Fetched outside the lock, so a slow page never holds up other callers
+        try:
+            results = self._fetch_paged('current/results')
+        except Exception as e:
+            logging.error(f"Error fetching season results: {e}")
+            return None
+        with self._lock:
+            cache['results'] = results
+        return results
+
+    def get_round_results(self, season, race_round, sprint=False):
+        """
+        Classified results of one round, plus its sprint when there is one
+
+        Returns:
+            tuple: (race results, sprint results) as Ergast result lists
+        """
+        paths = [f"{season}/{race_round}/results?limit=100"]
+        if sprint:
+            paths.append(f"{season}/{race_round}/sprint?limit=100")
+
+        futures = [self._executor.submit(self._fetch, path) for path in paths]
+        done, not_done = wait(futures, timeout=self.FETCH_DEADLINE)
+        if not_done:
+            raise TimeoutError(f"Ergast requests did not finish within {self.FETCH_DEADLINE}s")
+
+        races = [future.result()['MRData']['RaceTable']['Races'] for future in futures]
+        race_results = races[0][0]['Results'] if races[0] else []
+        sprint_results = races[1][0]['SprintResults'] if sprint and races[1] else []
+        return race_results, sprint_results
+
+    def get_schedule(self, season):
+        """Race schedule of any season, served from the cached data for the current one"""
+        data = self.get_season_data()
+        if data is not None and data['season']['MRData']['RaceTable']['season'] == str(season):
+            return data['season']['MRData']['RaceTable']['Races']
+        return self._fetch(f"{season}?limit=100")['MRData']['RaceTable']['Races']
+
+    def get_completed_round(self, season):
+        """Last round of a season with results, from the cached data for the current one"""
+        data = self.get_season_data()
+        if data is not None and data['last_race']['MRData']['RaceTable']['season'] == str(season):
+            return int(data['last_race']['MRData']['RaceTable'].get('round', 0))
+        if int(season) > datetime.now(timezone.utc).year:
+            return 0
+        races = self._fetch(f"{season}/last")['MRData']['RaceTable']['Races']
+        return int(races[0]['round']) if races else 0
 
-    def get_current_standings(self):
+    def get_remaining_rounds(self, season_data=None):
+        """Rounds still to run this season and whether each has a sprint"""
+        data = season_data or self.get_season_data()
+        if data is None:
+            return None
+
+        current_round = int(data['last_race']['MRData']['RaceTable'].get('round', 0))
+        return [{
+            'round': int(race['round']),
+            'name': race['raceName'],
+            'sprint': 'Sprint' in race
+        } for race in data['season']['MRData']['RaceTable']['Races'] if int(race['round']) > current_round]
+
+    def get_current_standings(self, season_data=None):
         try:
-            # Get driver standings
-            driver_response = requests.get(f"{self.BASE_URL}/current/driverStandings")
-            driver_data = driver_response.json()['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
+            data = season_data or self.get_season_data()
+            if data is None:
+                return None, None
 
-            # Get constructor standings
-            constructor_response = requests.get(f"{self.BASE_URL}/current/constructorStandings")
-            constructor_data = constructor_response.json()['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
+            driver_data = data['driver_standings']['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
+            constructor_data = data['constructor_standings']['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
 
             return driver_data, constructor_data
         except Exception as e:
             logging.error(f"Error fetching standings: {e}")
             return None, None
 
-    def calculate_championship_status(self):
-        driver_data, constructor_data = self.get_current_standings()
+    def get_latest_entries(self, season_data=None):
+        """Ergast results of the latest race, one per car entered, or an empty list"""
+        try:
+            races = (season_data or self.get_season_data())['last_race']['MRData']['RaceTable']['Races']
+            return races[0]['Results'] if races else []
+        except Exception as e:
+            logging.error(f"Error reading the latest race entries: {e}")
+            return []
+
+    def _active_entries(self, driver_standings, constructor_standings, season_data=None):
+        """
+        Indices of the drivers and constructors entered in the latest race, who
+        are taken to be the ones racing in the remaining rounds. A driver who has
+        lost their seat keeps their points but takes no more places.
+
+        Returns:
+            tuple: (driver indices, constructor indices), each None if unknown
+        """
+        results = self.get_latest_entries(season_data)
+        if not results:
+            return None, None
+
+        drivers = {r['Driver']['givenName'] + ' ' + r['Driver']['familyName'] for r in results}
+        teams = {r['Constructor']['name'] for r in results}
+        return ({i for i, d in enumerate(driver_standings) if d['driver'] in drivers},
+                {i for i, c in enumerate(constructor_standings) if c['team'] in teams})
+
+    def _solve_elimination(self, season, driver_standings, constructor_standings, season_data=None):
+        """
+        Exact contenders and clinch scenarios for both championships.
+        Memoized per standings, so repeated refreshes of the same round are free.
+        """
+        remaining = self.get_remaining_rounds(season_data) or []
+        driver_points = [d['points'] for d in driver_standings]
+        constructor_points = [c['points'] for c in constructor_standings]
+        active_drivers, active_constructors = self._active_entries(driver_standings, constructor_standings,
+                                                                   season_data)
+        cache_key = (season, tuple((r['round'], r['sprint']) for r in remaining),
+                     tuple(driver_points), tuple(constructor_points),
+                     active_drivers and tuple(sorted(active_drivers)),
+                     active_constructors and tuple(sorted(active_constructors)))
+        if cache_key in self.elimination_cache:
+            return self.elimination_cache[cache_key]
+
+        solver = EliminationSolver(season, remaining)
+        elimination = {
+            'drivers': solver.contenders(driver_points, active=active_drivers),
+            'constructors': solver.contenders(constructor_points, cars=2, active=active_constructors),
+            'driver_clinch': solver.clinch_scenarios(
+                [d['driver'] for d in driver_standings], driver_points, active=active_drivers
+            ),
+            'constructor_clinch': solver.clinch_scenarios(
+                [c['team'] for c in constructor_standings], constructor_points, cars=2,
+                active=active_constructors
+            )
+        }
+        self.elimination_cache = {cache_key: elimination}
+        return elimination
+
+    def calculate_championship_status(self, season_data=None):
+        """
+        Standings, contenders and clinch scenarios, built from ``season_data``
+        when the caller has already loaded it
+        """
+        season_data = season_data or self.get_season_data()
+        driver_data, constructor_data = self.get_current_standings(season_data)
         if not driver_data or not constructor_data:
             return {
                 'status': 'no_data',
@@ -37,20 +339,17 @@ class ChampionshipCalculator:
             }
 
         try:
+            data = season_data
+
             # Get current round from the season schedule
-            schedule_response = requests.get(f"{self.BASE_URL}/current/last")
-            schedule_data = schedule_response.json()
+            schedule_data = data['last_race']
             current_round = int(schedule_data['MRData']['RaceTable']['round'])
+            season = schedule_data['MRData']['RaceTable']['season']
 
             # Get total rounds in the season
-            season_response = requests.get(f"{self.BASE_URL}/current")
-            total_rounds = int(season_response.json()['MRData']['total'])
+            total_rounds = int(data['season']['MRData']['total'])
             remaining_races = total_rounds - current_round
 
-            # Calculate maximum points available per race
-            max_points_per_race = 26  # 25 for win + 1 for fastest lap
-            max_remaining_points = remaining_races * max_points_per_race
-
             # Process driver standings
             driver_standings = [{
                 'driver': d['Driver']['givenName'] + ' ' + d['Driver']['familyName'],
@@ -64,47 +363,30 @@ class ChampionshipCalculator:
                 'points': float(c['points'])
             } for c in constructor_data]
 
-            # Calculate championship contenders
-            driver_contenders = []
-            constructor_contenders = []
-
             if remaining_races > 0:
+                elimination = self._solve_elimination(season, driver_standings, constructor_standings, data)
+
+                # Calculate championship contenders
                 leader_points = driver_standings[0]['points']
-                second_place_points = driver_standings[1]['points'] if len(driver_standings) > 1 else 0
+                driver_contenders = [{
+                    'driver': driver_standings[i]['driver'],
+                    'team': driver_standings[i]['team'],
+                    'points': driver_standings[i]['points'],
+                    'points_needed': max(leader_points - driver_standings[i]['points'], 0)
+                } for i in elimination['drivers']]
+
                 constructor_leader_points = constructor_standings[0]['points']
-                constructor_second_points = constructor_standings[1]['points'] if len(constructor_standings) > 1 else 0
-
-                # Calculate driver contenders
-                for driver in driver_standings:
-                    points_behind = leader_points - driver['points']
-                    if points_behind <= max_remaining_points:
-                        driver_contenders.append({
-                            'driver': driver['driver'],
-                            'team': driver['team'],
-                            'points': driver['points'],
-                            'points_needed': points_behind if points_behind > 0 else 0
-                        })
-
-                # Calculate constructor contenders
-                max_constructor_remaining = max_remaining_points * 2  # Two cars per team
-                for constructor in constructor_standings:
-                    points_behind = constructor_leader_points - constructor['points']
-                    if points_behind <= max_constructor_remaining:
-                        constructor_contenders.append({
-                            'team': constructor['team'],
-                            'points': constructor['points'],
-                            'points_needed': points_behind if points_behind > 0 else 0
-                        })
-
-                # Get current season
-                season = schedule_data['MRData']['RaceTable']['season']
-
-                # Calculate if championships are mathematically decided
+                constructor_contenders = [{
+                    'team': constructor_standings[i]['team'],
+                    'points': constructor_standings[i]['points'],
+                    'points_needed': max(constructor_leader_points - constructor_standings[i]['points'], 0)
+                } for i in elimination['constructors']]
+
+                # A championship is decided once only the leader can still win it
                 driver_champion = None
                 constructor_champion = None
-                
-                # Check if driver championship is decided
-                if (leader_points - second_place_points) > max_remaining_points:
+
+                if elimination['drivers'] == [0]:
                     driver_champion = {
                         'name': driver_standings[0]['driver'],
                         'team': driver_standings[0]['team'],
@@ -112,8 +394,7 @@ class ChampionshipCalculator:
                         'season': season
                     }
 
-                # Check if constructor championship is decided
-                if (constructor_leader_points - constructor_second_points) > (max_remaining_points * 2):
+                if elimination['constructors'] == [0]:
                     constructor_champion = {
                         'name': constructor_standings[0]['team'],
                         'points': constructor_standings[0]['points'],
@@ -130,7 +411,11 @@ class ChampionshipCalculator:
                         'constructors': constructor_contenders
                     },
                     'driver_champion': driver_champion,
-                    'constructor_champion': constructor_champion
+                    'constructor_champion': constructor_champion,
+                    'clinch_scenarios': {
+                        'drivers': elimination['driver_clinch'],
+                        'constructors': elimination['constructor_clinch']
+                    }
                 }
             else:
                 return {
@@ -0,0 +1,215 @@
+import logging
+from .points_system import RACE_POINTS, sprint_points, fastest_lap_points
+
+
+class EliminationSolver:
+    """
+    Exact title elimination for drivers and constructors.
+
+    A contender can still win if there is some assignment of the remaining
+    results in which nobody finishes above them. The contender takes the top
+    ``cars`` places (and the fastest lap) in every remaining session, which is
+    always best for them. Rivals with enough slack to absorb any result are
+    unconstrained and take the most valuable of the remaining scoring places.
+    Only the lowest scoring places that are left over have to be packed into the
+    slack of the remaining, constrained rivals, and that small packing problem
+    is solved exactly with a memoized search.
+
+    Entries outside ``active`` have no seat in the remaining rounds: they keep
+    their points but score nothing more, and the grid shrinks to the cars of
+    the active entries.
+    """
+
+    def __init__(self, season, remaining_rounds):
+        """
+        Args:
+            season (int): Season year, which selects the points rules
+            remaining_rounds (list): Dicts with 'round' and 'sprint' flags, in order
+        """
+        self.season = int(season)
+        self.remaining_rounds = remaining_rounds
+
+    def _sessions(self, rounds):
+        """Points tables of every scoring session in the given rounds"""
+        sessions = []
+        for race_round in rounds:
+            if race_round['sprint']:
+                sessions.append((tuple(sprint_points(self.season)), 0))
+            sessions.append((tuple(RACE_POINTS), fastest_lap_points(self.season)))
+        return sessions
+
+    @staticmethod
+    def _best_points(sessions, cars, skip=0):
+        """Most points ``cars`` cars can take over the sessions, after ``skip`` places are taken"""
+        return sum(sum(table[skip:skip + cars]) + bonus for table, bonus in sessions)
+
+    def can_win(self, points, index, cars=1, sessions=None, active=None):
+        """
+        Decide whether the entry at ``index`` can still finish first
+
+        Args:
+            points (list): Current points of every entry
+            index (int): Entry to test
+            cars (int): Cars per entry, 1 for drivers and 2 for constructors
+            active (set): Indices of entries still racing, every entry if None
+
+        Returns:
+            bool: True if some assignment of remaining results makes them champion
+                  (a tie on points counts as still possible)
+        """
+        sessions = self._sessions(self.remaining_rounds) if sessions is None else sessions
+        active = set(range(len(points))) if active is None else set(active)
+        racing = index in active
+        # Without a seat the entry keeps its points; the places it would take go to rivals
+        skip = cars if racing else 0
+        best_total = points[index] + (self._best_points(sessions, cars) if racing else 0)
+
+        slack = [best_total - points[i] for i in range(len(points)) if i != index]
+        if any(s < 0 for s in slack):
+            return False
+        # Only rivals still racing can score more
+        slack = [best_total - points[i] for i in active if i != index]
+
+        rival_max = self._best_points(sessions, cars, skip=skip) if racing else self._best_points(sessions, cars)
+        constrained = sorted(s for s in slack if s < rival_max)
+        if not constrained:
+            return True
+
+        free_cars = (len(slack) - len(constrained)) * cars
+        forced = []
+        for table, bonus in sessions:
+            # Only as many places as there are cars on the grid can be filled
+            places = [value for value in table[skip:len(active) * cars] if value > 0]
+            # Unconstrained rivals take the most valuable places, the rest is forced
+            leftover = sorted(places[free_cars:], reverse=True)
+            if len(leftover) > len(constrained) * cars:
+                return False
+            if leftover:
+                forced.append(tuple(leftover))
+            if bonus and not racing and not free_cars:
+                # The fastest lap goes to a constrained rival on top of their place
+                forced.append((bonus,))
+
+        if sum(sum(items) for items in forced) > sum(constrained):
+            return False
+        return self._pack(forced, constrained, cars)
+
+    def _pack(self, forced, slack, cars):
+        """Assign each session's forced places to distinct rivals within their slack"""
+        memo = set()
+
+        def search(session, item, state):
+            # state: sorted (remaining slack, places taken this session) per rival
+            if session == len(forced):
+                return True
+            if item == len(forced[session]):
+                next_state = tuple(sorted((s, 0) for s, _ in state))
+                return search(session + 1, 0, next_state)
+
+            key = (session, item, state)
+            if key in memo:
+                return False
+
+            value = forced[session][item]
+            tried = set()
+            # Largest slack first finds a packing quickly when one exists
+            for i in range(len(state) - 1, -1, -1):
+                remaining, used = state[i]
+                if used >= cars or remaining < value or state[i] in tried:
+                    continue
+                tried.add(state[i])
+                next_state = list(state)
+                next_state[i] = (remaining - value, used + 1)
+                if search(session, item + 1, tuple(sorted(next_state))):
+                    return True
+
+            memo.add(key)
+            return False
+
+        return search(0, 0, tuple(sorted((s, 0) for s in slack)))
+
+    def contenders(self, points, cars=1, active=None):
+        """Indices of every entry that can still win the title"""
+        sessions = self._sessions(self.remaining_rounds)
+        return [i for i in range(len(points)) if self.can_win(points, i, cars, sessions, active)]
+
+    def clinch_scenarios(self, names, points, cars=1, max_conditions=5, active=None):
+        """
+        Minimal conditions for the leader to clinch the title at the next round
+
+        Rivals are assumed to take the best places the leader leaves free at
+        the next round. On a sprint weekend the leader is assumed to score
+        nothing in the sprint, so the conditions are conservative.
+
+        Returns:
+            dict: The next round, the points margin needed over each rival and,
+                  for drivers, finishing positions that clinch the title
+        """
+        try:
+            if not self.remaining_rounds or len(points) < 2:
+                return None
+
+            leader = max(range(len(points)), key=lambda i: points[i])
+            next_round = self.remaining_rounds[0]
+            after = self._sessions(self.remaining_rounds[1:])
+            after_max = self._best_points(after, cars)
+            weekend = self._sessions([next_round])
+            race_table, race_bonus = weekend[-1]
+
+            active = set(range(len(points))) if active is None else set(active)
+            # Rivals without a seat cannot score, so they cannot stop the leader clinching
+            rivals = [i for i in sorted(active) if i != leader]
+            # Points the leader must outscore each rival by over the weekend
+            margins = {i: points[i] + after_max - points[leader] + 1 for i in rivals}
+            threats = [i for i in rivals if margins[i] > -self._best_points(weekend, cars)]
+
+            scenario = {
+                'round': next_round['round'],
+                'leader': names[leader],
+                'clinched': self.contenders(points, cars, active) == [leader],
+                'must_outscore': [
+                    {'rival': names[i], 'points': max(0, margins[i])} for i in threats if margins[i] > 0
+                ],
+                'conditions': []
+            }
+            if cars != 1 or scenario['clinched']:
+                return scenario
+
+            sprint_max = self._best_points(weekend[:-1], 1)
+            conditional = []
+            # From the lowest scoring place upwards, stopping at the first that clinches outright
+            for position in range(len(race_table), 0, -1):
+                leader_points = race_table[position - 1]
+                rival_conditions = []
+                for i in threats:
+                    # Best the rival can do with the leader in this position
+                    rival_best = (race_table[1] if position == 1 else race_table[0]) + race_bonus + sprint_max
+                    allowed = leader_points - margins[i]
+                    if allowed >= rival_best:
+                        continue
+                    allowed_race = allowed - sprint_max - race_bonus
+                    worst = next((p for p in range(1, len(race_table) + 2)
+                                  if p != position and (race_table[p - 1] if p <= len(race_table) else 0) <= allowed_race),
+                                 None)
+                    if allowed_race < 0 or worst is None:
+                        rival_conditions = None
+                        break
+                    rival_conditions.append(f"{names[i]} finishes P{worst} or lower")
+
+                if rival_conditions is None:
+                    continue
+                condition = {
+                    'leader_finish': f"P{position} or better",
+                    'requires': rival_conditions
+                }
+                if not rival_conditions:
+                    scenario['conditions'].append(condition)
+                    break
+                conditional.append(condition)
+
+            scenario['conditions'] += conditional[::-1][:max(0, max_conditions - len(scenario['conditions']))]
+            return scenario
+
+        except Exception as e:
+            logging.error(f"Error computing clinch scenarios: {str(e)}")
+            return None
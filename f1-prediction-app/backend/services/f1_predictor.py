@@ -2,32 +2,64 @@ import fastf1
 import pandas as pd
 import numpy as np
 import logging
+import threading
 from datetime import datetime, timedelta
 from .championship_calculator import ChampionshipCalculator
 from .sentiment_analyzer import F1SentimentAnalyzer
 from .car_performance_analyzer import CarPerformanceAnalyzer
+from .long_run_analyzer import LongRunAnalyzer
 import requests
 import time
+import warnings
 from requests.exceptions import HTTPError
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 class F1Predictor:
     
+    # Recorded with each stored prediction; bump when the scoring below changes
+    MODEL_VERSION = 'heuristic-1'
+
+    # Score weight per standardized car performance feature
+    PERFORMANCE_WEIGHTS = {
+        'top_speed': 1.0,
+        'avg_speed': 1.0,
+        'mean_acceleration': 2.0,
+        'braking_intensity': 1.0,
+        'full_throttle_fraction': 1.0,
+        'corner_min_speed': 2.0,
+        'lap_time_consistency': -2.0  # Lower spread is better
+    }
+    LONG_RUN_WEIGHT = 10.0  # Score lost per second of long-run deficit in practice
+    # Race caches are dropped by invalidate() when new results land; this bounds
+    # their age when no ingestion scheduler runs, e.g. under `flask run`
+    CACHE_FALLBACK_TTL = timedelta(hours=12)
+
     def __init__(self):
         self.current_year = datetime.now().year
         self.recent_races_cache = None
         self.last_race_cache = None
         self.cache_timestamp = None
-        self.cache_duration = timedelta(hours=1)
+        self._races_lock = threading.Lock()  # Concurrent callers share one load
         self.sentiment_analyzer = F1SentimentAnalyzer()
         self.performance_analyzer = CarPerformanceAnalyzer()
+        self.long_run_analyzer = LongRunAnalyzer()
+        self.championship_calculator = ChampionshipCalculator()
 
     def get_recent_races(self, limit=5):
-        if (self.recent_races_cache is not None and 
-            self.cache_timestamp is not None and 
-            datetime.now() - self.cache_timestamp < self.cache_duration):
+        self._expire_caches()
+        if self.recent_races_cache is not None:
+            return self.recent_races_cache
+        with self._races_lock:
+            if self.recent_races_cache is None:
+                self.recent_races_cache = self._load_recent_races(limit)
+                self.cache_timestamp = datetime.now()
             return self.recent_races_cache
 
+    def _expire_caches(self):
+        if self.cache_timestamp is not None and datetime.now() - self.cache_timestamp >= self.CACHE_FALLBACK_TTL:
+            self.invalidate()
+
+    def _load_recent_races(self, limit):
         current_date = datetime.now()
         current_year = current_date.year
         
@@ -74,17 +106,20 @@ class F1Predictor:
             futures = [executor.submit(process_race, race) for _, race in completed_races.tail(limit).iterrows()]
             processed_races = [future.result() for future in as_completed(futures) if future.result() is not None]
 
-        self.recent_races_cache = {
-            'races': processed_races,
+        return {
+            'races': sorted(processed_races, key=lambda race: race['round']),
             'using_previous_season': self.using_previous_season,
             'season_used': previous_year if self.using_previous_season else current_year
         }
-        
-        self.cache_timestamp = datetime.now()
-        return self.recent_races_cache
 
-    def get_driver_stats(self):
-        races = self.get_recent_races()
+    def invalidate(self):
+        """Drop cached race results so the next request rebuilds them from new data"""
+        self.recent_races_cache = None
+        self.last_race_cache = None
+        self.cache_timestamp = None
+
+    def get_driver_stats(self, recent_data=None):
+        races = recent_data or self.get_recent_races()
         if not races:
             return None
 
@@ -130,23 +165,34 @@ class F1Predictor:
             
         return driver_stats
 
-    def predict_next_race(self):
-        """Predict next race winner based on recent performance"""
-        recent_data = self.get_recent_races()
+    def predict_next_race(self, recent_data=None):
+        """Predict next race winner based on recent performance, from ``recent_data`` when already loaded"""
+        recent_data = recent_data or self.get_recent_races()
         if not recent_data:
             return None
 
-        driver_stats = self.get_driver_stats()
+        driver_stats = self.get_driver_stats(recent_data)
         if not driver_stats:
             return None
 
-        # Get performance data from last race
-        last_race = recent_data['races'][0]
-        performance_data = self.performance_analyzer.get_car_performance_data(
-            recent_data['season_used'],
-            last_race['round']
+        # Get car performance features from last race's qualifying
+        last_race = recent_data['races'][-1]
+        performance_scores = self._performance_scores(
+            self.performance_analyzer.get_feature_matrix(
+                recent_data['season_used'],
+                last_race['round']
+            )
         )
 
+        # Get race-sim pace from the upcoming weekend's practice sessions
+        long_run_features = self.get_long_run_features()
+        long_run_scores = {}
+        if long_run_features is not None:
+            long_run_scores = dict(zip(
+                long_run_features['FullName'],
+                (-long_run_features['LongRunDelta'] * self.LONG_RUN_WEIGHT).tolist()
+            ))
+
         predictions = []
         for driver, stats in driver_stats.items():
             score = (
@@ -157,15 +203,9 @@ class F1Predictor:
                 (stats['avg_finish'] * 2 if stats['avg_finish'] is not None else 0)
             )
             
-            # Add performance metrics to score if available
-            if performance_data and driver in performance_data:
-                perf = performance_data[driver]
-                score += (
-                    perf['top_speed'] * 0.01 +
-                    perf['acceleration_score'] * 2 +
-                    (20 - perf['tyre_management']['lap_time_consistency']) * 0.5
-                    if perf['tyre_management']['lap_time_consistency'] is not None else 0
-                )
+            # Add performance metrics and practice race-sim pace if available
+            score += performance_scores.get(driver, 0.0)
+            score += long_run_scores.get(driver, 0.0)
             
             predictions.append({
                 'driver': driver,
@@ -188,6 +228,8 @@ class F1Predictor:
             reasons.append("Strong qualifying performance")
         if stats['dnfs'] == 0:
             reasons.append("Consistent reliability")
+        if long_run_scores and long_run_scores.get(winner_prediction['driver']) == 0:
+            reasons.append("Fastest race-sim pace in practice")
 
         return self._format_prediction_response(
             winner_prediction,
@@ -196,6 +238,56 @@ class F1Predictor:
             recent_data
         )
 
+    def get_next_event(self):
+        """Get the year, round and name of the next race weekend, or None"""
+        try:
+            schedule = fastf1.get_event_schedule(self.current_year, include_testing=False)
+            event_dates = pd.to_datetime(schedule['EventDate']).dt.tz_localize(None)
+            upcoming = schedule[event_dates >= pd.Timestamp.now().normalize()]
+            if upcoming.empty:
+                return None
+            event = upcoming.iloc[0]
+            return {
+                'year': self.current_year,
+                'round': int(event['RoundNumber']),
+                'name': event['EventName']
+            }
+        except Exception as e:
+            logging.error(f"Error finding next event: {str(e)}")
+            return None
+
+    def get_long_run_features(self):
+        """Long-run pace features from the upcoming weekend's practice sessions"""
+        next_event = self.get_next_event()
+        if next_event is None:
+            return None
+        return self.long_run_analyzer.get_long_run_features(next_event['year'], next_event['round'])
+
+    def _performance_scores(self, feature_data):
+        """
+        Turn the car performance feature matrix into a score per driver.
+        Each feature is standardized across the field and weighted, so the
+        whole grid is scored with one matrix-vector product.
+        
+        Args:
+            feature_data (dict): Output of CarPerformanceAnalyzer.get_feature_matrix
+            
+        Returns:
+            dict: Score contribution by driver name
+        """
+        if not feature_data:
+            return {}
+
+        matrix = feature_data['matrix']
+        weights = np.array([self.PERFORMANCE_WEIGHTS.get(name, 0.0) for name in feature_data['features']])
+
+        with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            z_scores = (matrix - np.nanmean(matrix, axis=0)) / np.nanstd(matrix, axis=0)
+        scores = np.nan_to_num(z_scores, nan=0.0, posinf=0.0, neginf=0.0) @ weights
+
+        return dict(zip(feature_data['drivers'], scores.tolist()))
+
     def format_time_delta(self, seconds):
         """Format time delta in F1 style (m:ss.fff)"""
         if seconds is None:
@@ -209,23 +301,22 @@ class F1Predictor:
         else:
             return f"{remaining_seconds:.3f}"
 
-    def get_last_race_results(self):
-        """Get the results from the most recent race with time gaps"""
-        # Check if cache needs refresh
-        if (self.last_race_cache is not None and 
-            self.cache_timestamp is not None and 
-            datetime.now() - self.cache_timestamp < self.cache_duration):
+    def get_last_race_results(self, recent_data=None):
+        """Get the results from the most recent race with time gaps, from ``recent_data`` when already loaded"""
+        self._expire_caches()
+        if self.last_race_cache is not None:
             return self.last_race_cache
 
-        races = self.get_recent_races(limit=1)
-        if not races:
+        # Same load as the predictions, whichever asks first
+        races = recent_data or self.get_recent_races()
+        if not races or not races['races']:
             return None
 
         try:
             # Load the race session
             race_session = fastf1.get_session(
                 races['season_used'],
-                races['races'][0]['round'],
+                races['races'][-1]['round'],
                 'R'
             )
             race_session.load()
@@ -274,7 +365,7 @@ class F1Predictor:
             highlights = []
             winner = next((r for r in processed_results if r['position'] == 1), None)
             if winner:
-                highlights.append(f"{winner['driver']} wins the {races['races'][0]['name']}")
+                highlights.append(f"{winner['driver']} wins the {races['races'][-1]['name']}")
             
             # Add fastest lap highlight
             fastest_lap_driver_result = next((r for r in processed_results if r['fastest_lap']), None)
@@ -317,7 +408,7 @@ class F1Predictor:
                 highlights.append(f"DNFs: {dnf_drivers}")
 
             race_data = {
-                'name': races['races'][0]['name'],
+                'name': races['races'][-1]['name'],
                 'results': [r for r in processed_results if r['position'] is not None][:10],  # Top 10 finishers
                 'highlights': highlights,
                 'total_laps': race_session.total_laps
@@ -325,7 +416,6 @@ class F1Predictor:
             
             # Update cache
             self.last_race_cache = race_data
-            self.cache_timestamp = datetime.now()
             
             return race_data
             
@@ -333,9 +423,10 @@ class F1Predictor:
             logging.error(f"Error processing race results: {str(e)}")
             return None
 
-    def predict_qualifying(self):
-        """Predict qualifying performance based on recent data"""
-        driver_stats = self.get_driver_stats()
+    def predict_qualifying(self, recent_data=None):
+        """Predict qualifying performance based on recent data, from ``recent_data`` when already loaded"""
+        recent_data = recent_data or self.get_recent_races()
+        driver_stats = self.get_driver_stats(recent_data)
         if not driver_stats:
             return None
 
@@ -397,9 +488,6 @@ class F1Predictor:
         if stats['dnfs'] == 0:
             reasons.append("Consistent reliability in recent races")
 
-        # Get recent data for metadata
-        recent_data = self.get_recent_races()
-        
         return self._format_prediction_response(
             pole_prediction,
             quali_predictions[1:3],  # 2nd and 3rd place
@@ -407,10 +495,9 @@ class F1Predictor:
             recent_data
         )
 
-    def get_championship_standings(self):
+    def get_championship_standings(self, season_data=None):
         """Calculate current championship standings and potential winners"""
-        calculator = ChampionshipCalculator()
-        return calculator.calculate_championship_status()
+        return self.championship_calculator.calculate_championship_status(season_data)
     pass
 
     def _calculate_confidence_score(self, score, all_scores):
@@ -0,0 +1,151 @@
+import fastf1
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from config import FASTF1_CACHE_DIR
+from .race_calendar import RaceCalendarService
+
+
+def enable_cache(cache_dir=FASTF1_CACHE_DIR):
+    """Point fastf1 at the configured cache directory, creating it if needed"""
+    os.makedirs(cache_dir, exist_ok=True)
+    fastf1.Cache.enable_cache(cache_dir)
+    return cache_dir
+
+
+def _directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path) for name in files
+    )
+
+
+def warm_session(cache_dir, year, race_round, session_type, telemetry=True):
+    """
+    Load one session through fastf1 so its parsed data lands in the cache.
+    Runs in a worker process.
+
+    Returns:
+        dict: Seconds taken and bytes of parsed data cached for the session
+    """
+    enable_cache(cache_dir)
+    started = time.perf_counter()
+    session = fastf1.get_session(year, race_round, session_type)
+    session.load(laps=True, telemetry=telemetry, weather=True, messages=True)
+    return {
+        'seconds': round(time.perf_counter() - started, 2),
+        'bytes': _directory_size(os.path.join(cache_dir, session.api_path[len('/static/'):]))
+    }
+
+
+class CacheWarmer:
+    """
+    Prefetches fastf1 sessions into the shared cache with bounded parallelism.
+
+    Every finished session is recorded in a manifest next to the cache, so an
+    interrupted run picks up where it stopped and repeated runs only fetch
+    sessions that are new.
+    """
+
+    MANIFEST_FILE = 'warm_manifest.json'
+
+    def __init__(self, cache_dir=FASTF1_CACHE_DIR, max_workers=4, calendar_service=None):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.manifest_path = os.path.join(cache_dir, self.MANIFEST_FILE)
+        self.calendar_service = calendar_service or RaceCalendarService()
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def plan(self, years, rounds=None, session_types=('Q', 'R'), now=None):
+        """
+        Sessions of the given seasons that have finished
+
+        Returns:
+            list: (year, round, session identifier) tuples in calendar order
+        """
+        now = now or datetime.now(timezone.utc)
+        durations = self.calendar_service.SESSION_DURATIONS
+        sessions = []
+        for year in years:
+            for session in self.calendar_service.get_session_schedule(year):
+                if rounds and session['round'] not in rounds:
+                    continue
+                if session['session'] not in session_types:
+                    continue
+                if session['start'] + durations[session['session']] > now:
+                    continue
+                sessions.append((year, session['round'], session['session']))
+        return sessions
+
+    def warm(self, years, rounds=None, session_types=('Q', 'R'), telemetry=True, force=False, report=print):
+        """
+        Load every planned session not cached yet
+
+        Args:
+            years (list): Seasons to prefetch
+            rounds (list): Rounds to prefetch, all finished rounds if None
+            session_types (tuple): Session identifiers, e.g. FP1, Q, S, R
+            telemetry (bool): Also fetch car telemetry, the bulk of the download
+            force (bool): Reload sessions the manifest already lists
+            report (callable): Receives one progress line per session
+
+        Returns:
+            dict: Counts of warmed, skipped and failed sessions, bytes and wall time
+        """
+        enable_cache(self.cache_dir)
+        manifest = self._read_manifest()
+        planned = self.plan(years, rounds, session_types)
+        key = lambda session: f"{session[0]}_{session[1]}_{session[2]}"
+        # A session cached without telemetry still needs loading when telemetry is wanted
+        pending = planned if force else [
+            session for session in planned
+            if key(session) not in manifest or (telemetry and not manifest[key(session)]['telemetry'])
+        ]
+        report(f"{len(planned)} sessions planned, {len(planned) - len(pending)} already cached, "
+               f"warming {len(pending)} with {self.max_workers} workers")
+
+        started = time.perf_counter()
+        summary = {'warmed': 0, 'skipped': len(planned) - len(pending), 'failed': 0, 'bytes': 0}
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(warm_session, self.cache_dir, *session, telemetry): session
+                    for session in pending
+                }
+                for future in as_completed(futures):
+                    session = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Left out of the manifest, so the next run retries it
+                        summary['failed'] += 1
+                        logging.error(f"Error warming {key(session)}: {str(e)}")
+                        report(f"  {key(session):<14} failed: {str(e)}")
+                        continue
+
+                    manifest[key(session)] = {
+                        **result,
+                        'telemetry': telemetry,
+                        'warmed_at': datetime.now(timezone.utc).isoformat()
+                    }
+                    self._write_manifest(manifest)
+                    summary['warmed'] += 1
+                    summary['bytes'] += result['bytes']
+                    report(f"  {key(session):<14} {result['seconds']:>7.1f}s {result['bytes'] / 1e6:>8.1f} MB")
+
+        summary['seconds'] = round(time.perf_counter() - started, 2)
+        return summary
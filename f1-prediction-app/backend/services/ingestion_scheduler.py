@@ -0,0 +1,225 @@
+import fastf1
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from .race_calendar import RaceCalendarService
+
+
+def session_data_available(year, race_round, session_name):
+    """
+    Probe whether a session's data has been published
+
+    Practice sessions count as available once lap data exists; qualifying,
+    sprints and races once classified results exist.
+    """
+    session = fastf1.get_session(year, race_round, session_name)
+    practice = session_name.startswith('FP')
+    session.load(laps=practice, telemetry=False, weather=False, messages=False)
+    if practice:
+        return session.laps is not None and not session.laps.empty
+    return session.results is not None and session.results['Position'].notna().any()
+
+
+class IngestionScheduler:
+    """
+    Schedules data ingestion from the race calendar instead of fixed expiry times.
+
+    Each session gets a job due when its data should be published. The job
+    probes for the data, backing off exponentially until it appears, and only
+    then notifies subscribers so they can invalidate and rebuild their caches.
+    """
+
+    AVAILABILITY_LAG = timedelta(minutes=30)  # Time after a session ends before data is usually published
+    INITIAL_RETRY = timedelta(minutes=5)
+    MAX_RETRY = timedelta(hours=1)
+    GIVE_UP_AFTER = timedelta(days=2)
+    CALENDAR_REFRESH = timedelta(hours=12)
+
+    def __init__(self, calendar_service=None, probe=None):
+        self.calendar_service = calendar_service or RaceCalendarService()
+        self.probe = probe or session_data_available
+        self.jobs = {}
+        self.listeners = []
+        self._queue = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._next_calendar_refresh = None
+
+    def subscribe(self, callback, session_types=None):
+        """
+        Call ``callback(job)`` whenever new data lands
+
+        Args:
+            callback (callable): Receives the job dict of the session that landed
+            session_types (iterable): Session identifiers to listen for, all if None
+        """
+        self.listeners.append((set(session_types) if session_types else None, callback))
+
+    def _job_key(self, session):
+        return f"{session['year']}_{session['round']}_{session['session']}"
+
+    def plan(self, now=None):
+        """
+        Add a job for every session whose data is not due yet or may still land
+
+        Sessions whose data was due less than ``GIVE_UP_AFTER`` ago are planned
+        as due immediately, so a restarted process or a worker taking over
+        leadership picks up data that landed while nobody was watching.
+        """
+        now = now or datetime.now(timezone.utc)
+        try:
+            sessions = self.calendar_service.get_session_schedule()
+        except Exception as e:
+            logging.error(f"Error planning ingestion jobs: {str(e)}")
+            with self._condition:
+                self._next_calendar_refresh = now + self.MAX_RETRY
+            return
+
+        with self._condition:
+            for session in sessions:
+                key = self._job_key(session)
+                available_at = (session['start'] + RaceCalendarService.SESSION_DURATIONS[session['session']] +
+                                self.AVAILABILITY_LAG)
+                job = self.jobs.get(key)
+                if job is not None:
+                    # Rescheduled sessions move their pending job with them
+                    if job['state'] == 'pending' and job['attempts'] == 0 and job['available_at'] != available_at:
+                        job.update(start=session['start'], available_at=available_at, due=available_at)
+                        heapq.heappush(self._queue, (available_at, key))
+                    continue
+                if now - available_at > self.GIVE_UP_AFTER:
+                    continue
+
+                due = max(available_at, now)
+                self.jobs[key] = {
+                    **session,
+                    'available_at': available_at,
+                    'due': due,
+                    'attempts': 0,
+                    'state': 'pending',
+                    'landed_at': None
+                }
+                heapq.heappush(self._queue, (due, key))
+
+            self._next_calendar_refresh = now + self.CALENDAR_REFRESH
+            self._condition.notify()
+
+    def is_settled(self, year, race_round, session_name, now=None):
+        """
+        Whether a session's data can no longer land or change: it was due
+        longer ago than the scheduler keeps probing for it. Unknown sessions
+        are never settled.
+        """
+        now = now or datetime.now(timezone.utc)
+        try:
+            sessions = self.calendar_service.get_session_schedule(year)
+        except Exception as e:
+            logging.error(f"Error reading the {year} session schedule: {str(e)}")
+            return False
+        for session in sessions:
+            if session['round'] == race_round and session['session'] == session_name:
+                available_at = (session['start'] + RaceCalendarService.SESSION_DURATIONS[session_name] +
+                                self.AVAILABILITY_LAG)
+                return now - available_at > self.GIVE_UP_AFTER
+        return False
+
+    def start(self):
+        """Plan the calendar and run jobs on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self.plan()
+        self._thread = threading.Thread(target=self._run, name='ingestion-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _next_due(self):
+        """Pop the next job that is due, or return how long to wait for one"""
+        now = datetime.now(timezone.utc)
+        while self._queue:
+            due, key = self._queue[0]
+            job = self.jobs.get(key)
+            if job is None or job['state'] != 'pending' or job['due'] != due:
+                heapq.heappop(self._queue)  # Superseded entry
+                continue
+            if due <= now:
+                heapq.heappop(self._queue)
+                return job, None
+            return None, (due - now).total_seconds()
+        return None, None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                job, wait_seconds = self._next_due()
+                if job is None:
+                    refresh_in = (self._next_calendar_refresh - datetime.now(timezone.utc)).total_seconds()
+                    if refresh_in > 0:
+                        self._condition.wait(min(refresh_in, wait_seconds or refresh_in))
+                        continue
+
+            if job is None:
+                self.calendar_service.invalidate()
+                self.plan()
+            else:
+                self._run_job(job)
+
+    def _run_job(self, job):
+        """Probe for a session's data, then notify subscribers or schedule a retry"""
+        now = datetime.now(timezone.utc)
+        job['attempts'] += 1
+        try:
+            landed = self.probe(job['year'], job['round'], job['session'])
+        except Exception as e:
+            logging.info(f"Probe for {self._job_key(job)} failed: {str(e)}")
+            landed = False
+
+        if landed:
+            job['state'] = 'landed'
+            job['landed_at'] = now
+            logging.info(f"Data landed for {self._job_key(job)} after {job['attempts']} attempt(s)")
+            for session_types, callback in self.listeners:
+                if session_types is None or job['session'] in session_types:
+                    try:
+                        callback(job)
+                    except Exception as e:
+                        logging.error(f"Error rebuilding after {self._job_key(job)}: {str(e)}")
+            return
+
+        if now - job['available_at'] > self.GIVE_UP_AFTER:
+            job['state'] = 'abandoned'
+            logging.error(f"Giving up on {self._job_key(job)} after {job['attempts']} attempts")
+            return
+
+        delay = min(self.INITIAL_RETRY * 2 ** (job['attempts'] - 1), self.MAX_RETRY)
+        with self._condition:
+            job['due'] = now + delay
+            heapq.heappush(self._queue, (job['due'], self._job_key(job)))
+
+    def get_status(self):
+        """Pending, landed and abandoned jobs, for monitoring"""
+        with self._condition:
+            jobs = sorted(self.jobs.values(), key=lambda job: job['available_at'])
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'jobs': [{
+                    'year': job['year'],
+                    'round': job['round'],
+                    'event': job['event'],
+                    'session': job['session'],
+                    'start': job['start'].isoformat(),
+                    'available_at': job['available_at'].isoformat(),
+                    'next_attempt': job['due'].isoformat() if job['state'] == 'pending' else None,
+                    'attempts': job['attempts'],
+                    'state': job['state'],
+                    'landed_at': job['landed_at'].isoformat() if job['landed_at'] else None
+                } for job in jobs]
+            }
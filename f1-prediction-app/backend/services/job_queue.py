@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+class JobQueue:
+    """
+    Bounded pool for computations too slow to run inside a request.
+
+    A job is keyed by the result it computes, so identical requests share one
+    job. Job records live in the shared cache, so whichever worker a client
+    polls can report on a job another worker runs.
+    """
+
+    ACTIVE_STATES = ('queued', 'running')
+    ACTIVE_TTL = 600      # A job left active this long belonged to a worker that died
+    FINISHED_TTL = 3600
+    HISTORY_SIZE = 200    # Jobs this worker keeps for the monitoring endpoint
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, cache, max_workers=2, max_pending=32):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.history = OrderedDict()
+        self.active = {}  # Jobs queued or running in this worker, by id
+        self.pending = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def job_id(key):
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    def find(self, job_id):
+        """The job record, from whichever worker runs it, or None if unknown or expired"""
+        return self.cache.read(f"job:{job_id}")
+
+    def _save(self, job):
+        ttl = self.ACTIVE_TTL if job['state'] in self.ACTIVE_STATES else self.FINISHED_TTL
+        self.cache.write(f"job:{job['id']}", job, ttl)
+        with self._lock:
+            self.history[job['id']] = dict(job)
+            self.history.move_to_end(job['id'])
+            while len(self.history) > self.HISTORY_SIZE:
+                self.history.popitem(last=False)
+
+    def submit(self, key, compute, kind, url=None):
+        """
+        Run ``compute`` in the pool unless a job for ``key`` is already queued or running
+
+        Args:
+            key (str): Identifies the result, and so the job
+            compute (callable): Computes and stores the result; returns None if unavailable
+            kind (str): Groups jobs in the timing summary
+            url (str): Where the client fetches the result once the job is done
+
+        Returns:
+            dict: The job record, or None if the queue is full
+        """
+        job_id = self.job_id(key)
+        with self._lock:
+            # Checked and recorded under one lock, so concurrent requests share a single job
+            existing = self.active.get(job_id) or self.find(job_id)
+            if existing is not None and existing['state'] in self.ACTIVE_STATES:
+                return dict(existing)
+            if self.pending >= self.max_pending:
+                return None
+            self.pending += 1
+
+            job = {
+                'id': job_id,
+                'key': key,
+                'kind': kind,
+                'url': url,
+                'state': 'queued',
+                'worker': os.getpid(),
+                'submitted_at': datetime.now(timezone.utc).isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'wait_seconds': None,
+                'run_seconds': None,
+                'found': None,
+                'error': None
+            }
+            self.active[job_id] = job
+            self._save(job)
+            record = dict(job)
+        submitted = time.perf_counter()
+        self.executor.submit(self._run, job, compute, submitted)
+        return record
+
+    def _run(self, job, compute, submitted):
+        started = time.perf_counter()
+        job.update(state='running', started_at=datetime.now(timezone.utc).isoformat(),
+                   wait_seconds=round(started - submitted, 3))
+        self._save(job)
+        try:
+            job['found'] = compute() is not None
+            job['state'] = 'done'
+        except Exception as e:
+            job.update(state='failed', error=str(e))
+            logging.error(f"Error in {job['kind']} job {job['id']}: {str(e)}")
+        finally:
+            job.update(finished_at=datetime.now(timezone.utc).isoformat(),
+                       run_seconds=round(time.perf_counter() - started, 3))
+            with self._lock:
+                self._save(job)
+                self.active.pop(job['id'], None)
+                self.pending -= 1
+
+    def wait(self, job_id, timeout):
+        """The job record once it finishes, or as it stands after ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        job = self.find(job_id)
+        while job is not None and job['state'] in self.ACTIVE_STATES and time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            job = self.find(job_id)
+        return job
+
+    def get_status(self):
+        """This worker's pool, recent jobs and wait and run times per kind"""
+        with self._lock:
+            jobs = list(reversed(self.history.values()))
+            pending = self.pending
+
+        timings = {}
+        for job in jobs:
+            summary = timings.setdefault(job['kind'], {
+                'jobs': 0, 'failed': 0, 'mean_wait_seconds': 0.0, 'mean_run_seconds': 0.0, 'max_run_seconds': 0.0
+            })
+            if job['state'] in self.ACTIVE_STATES:
+                continue
+            summary['jobs'] += 1
+            summary['failed'] += job['state'] == 'failed'
+            summary['mean_wait_seconds'] += job['wait_seconds'] or 0.0
+            summary['mean_run_seconds'] += job['run_seconds']
+            summary['max_run_seconds'] = max(summary['max_run_seconds'], job['run_seconds'])
+        for summary in timings.values():
+            if summary['jobs']:
+                summary['mean_wait_seconds'] = round(summary['mean_wait_seconds'] / summary['jobs'], 3)
+                summary['mean_run_seconds'] = round(summary['mean_run_seconds'] / summary['jobs'], 3)
+
+        return {
+            'worker': os.getpid(),
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': pending,
+            'timings': timings,
+            'jobs': jobs
+        }
@@ -0,0 +1,161 @@
+import fastf1
+import pandas as pd
+import logging
+
+
+class LongRunAnalyzer:
+    """Race-simulation pace from the long runs of a weekend's practice sessions"""
+
+    PRACTICE_SESSIONS = ('FP1', 'FP2', 'FP3')
+    MIN_LONG_RUN_LAPS = 5
+    FUEL_EFFECT_PER_LAP = 0.055  # Seconds gained per lap as fuel burns off
+    OUTLIER_THRESHOLD = 1.07  # Laps slower than this multiple of the run median are dropped
+
+    def __init__(self):
+        self.session_cache = {}
+        self.feature_cache = {}
+
+    def get_long_run_features(self, year, race_round):
+        """
+        Rank drivers and teams by fuel-corrected long-run pace for one weekend
+
+        Args:
+            year (int): Season year
+            race_round (int): Round number of the weekend
+
+        Returns:
+            pd.DataFrame: One row per driver, indexed by DriverNumber, with
+                          LongRunPace, LongRunDelta, LongRunLaps and
+                          LongRunTeamRank columns; None if no long runs were found
+        """
+        try:
+            long_runs = [
+                runs for runs in (
+                    self._session_long_runs(year, race_round, session_name)
+                    for session_name in self.PRACTICE_SESSIONS
+                ) if runs is not None and not runs.empty
+            ]
+            if not long_runs:
+                return None
+
+            # Keyed by the sessions used, so later practice sessions refresh the ranking
+            cache_key = f"{year}_{race_round}_" + "_".join(runs['Session'].iloc[0] for runs in long_runs)
+            if cache_key in self.feature_cache:
+                return self.feature_cache[cache_key]
+
+            laps = pd.concat(long_runs, ignore_index=True)
+            grouped = laps.groupby('DriverNumber')
+            features = pd.DataFrame({
+                'Abbreviation': grouped['Driver'].first(),
+                'FullName': grouped['FullName'].first(),
+                'TeamName': grouped['Team'].first(),
+                'LongRunPace': grouped['CorrectedLapTime'].median(),
+                'LongRunLaps': grouped.size()
+            })
+            features['LongRunDelta'] = features['LongRunPace'] - features['LongRunPace'].min()
+
+            # Teams are ranked by their quicker driver's race-sim pace
+            team_pace = features.groupby('TeamName')['LongRunPace'].min()
+            features['LongRunTeamRank'] = features['TeamName'].map(team_pace.rank(method='min'))
+
+            features = features.sort_values('LongRunPace')
+            self.feature_cache[cache_key] = features
+            return features
+
+        except Exception as e:
+            logging.error(f"Error analyzing long runs for {year} round {race_round}: {str(e)}")
+            return None
+
+    def get_team_ranking(self, year, race_round):
+        """Teams ordered by long-run pace, for display"""
+        features = self.get_long_run_features(year, race_round)
+        if features is None:
+            return None
+
+        team_pace = features.groupby('TeamName')['LongRunPace'].min().sort_values()
+        return [{
+            'team': team,
+            'pace': float(pace),
+            'delta': float(pace - team_pace.iloc[0]),
+            'rank': rank
+        } for rank, (team, pace) in enumerate(team_pace.items(), start=1)]
+
+    def _session_long_runs(self, year, race_round, session_name):
+        """Load a practice session with laps only and extract its long-run laps"""
+        cache_key = f"{year}_{race_round}_{session_name}"
+        if cache_key in self.session_cache:
+            return self.session_cache[cache_key]
+
+        try:
+            session = fastf1.get_session(year, race_round, session_name)
+        except ValueError:
+            # Sprint weekends have no FP2/FP3
+            self.session_cache[cache_key] = None
+            return None
+
+        if pd.notna(session.date) and session.date > pd.Timestamp.now(tz='UTC').tz_localize(None):
+            return None
+
+        try:
+            session.load(laps=True, telemetry=False, weather=False, messages=False)
+        except Exception as e:
+            # Not cached on purpose: the session may simply not have run yet
+            logging.info(f"Practice session {session_name} of {year} round {race_round} unavailable: {str(e)}")
+            return None
+
+        long_runs = self.detect_long_runs(session.laps)
+        names = session.results.set_index('DriverNumber')
+        long_runs['FullName'] = long_runs['DriverNumber'].map(
+            names['FirstName'] + ' ' + names['LastName']
+        )
+        long_runs['Session'] = session_name
+
+        # An empty result may mean the session has not run yet, so only cache real data
+        if not long_runs.empty:
+            self.session_cache[cache_key] = long_runs
+        return long_runs
+
+    def detect_long_runs(self, laps):
+        """
+        Find runs of consecutive clean laps on one compound and fuel-correct them
+
+        All drivers are processed together; runs are identified with shifted
+        comparisons instead of a per-driver loop.
+        """
+        laps = laps.copy()
+        laps['LapTimeSeconds'] = laps['LapTime'].dt.total_seconds()
+
+        clean = (
+            laps['LapTimeSeconds'].notna() &
+            laps['PitInTime'].isna() &
+            laps['PitOutTime'].isna() &
+            laps['TrackStatus'].astype(str).str.fullmatch(r'1+')
+        )
+        if 'Deleted' in laps.columns:
+            clean &= ~laps['Deleted'].fillna(False).astype(bool)
+        laps = laps[clean].sort_values(['DriverNumber', 'LapNumber'])
+
+        # A new run starts whenever driver, stint or compound changes or a lap is skipped
+        new_run = (
+            (laps['DriverNumber'] != laps['DriverNumber'].shift()) |
+            (laps['Stint'] != laps['Stint'].shift()) |
+            (laps['Compound'] != laps['Compound'].shift()) |
+            (laps['LapNumber'].diff() != 1)
+        )
+        laps['RunId'] = new_run.cumsum()
+
+        # Drop cool-down and traffic laps relative to each run's median
+        run_median = laps.groupby('RunId')['LapTimeSeconds'].transform('median')
+        laps = laps[laps['LapTimeSeconds'] <= run_median * self.OUTLIER_THRESHOLD]
+
+        run_length = laps.groupby('RunId')['LapTimeSeconds'].transform('size')
+        laps = laps[run_length >= self.MIN_LONG_RUN_LAPS].copy()
+
+        # Correct every lap back to the fuel load at the start of its run
+        lap_in_run = laps.groupby('RunId').cumcount()
+        laps['CorrectedLapTime'] = laps['LapTimeSeconds'] + self.FUEL_EFFECT_PER_LAP * lap_in_run
+
+        return laps[[
+            'DriverNumber', 'Driver', 'Team', 'Compound', 'RunId',
+            'LapNumber', 'LapTimeSeconds', 'CorrectedLapTime'
+        ]]
@@ -0,0 +1,247 @@
+import fastf1
+import joblib
+import json
+import logging
+import os
+import threading
+import numpy as np
+import pandas as pd
+from config import FEATURE_STORE_PATH, MODEL_DIR, MODEL_POINTER
+from ml.feature_store import FeatureStore, FORM_FEATURES
+from .f1_predictor import F1Predictor
+
+
+class MLPredictionService:
+    """Serves the trained race model from memory, reloading it when a new artifact is written"""
+
+    def __init__(self, model_dir=MODEL_DIR, predictor=None):
+        self.model_dir = model_dir
+        self.predictor = predictor or F1Predictor()
+        self.artifact = None
+        self.pointer_mtime = None
+        self.grid_cache = {}
+        self.feature_store = None
+        self.feature_store_mtime = None
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self.load()
+
+    def load(self, force=False):
+        """
+        Load the artifact the pointer file names, unless it is already loaded
+
+        Returns:
+            bool: True if a model is loaded afterwards
+        """
+        pointer = os.path.join(self.model_dir, MODEL_POINTER)
+        try:
+            mtime = os.path.getmtime(pointer)
+        except OSError:
+            return self.artifact is not None
+
+        if not force and mtime == self.pointer_mtime:
+            return True
+
+        try:
+            with open(pointer) as f:
+                latest = json.load(f)
+            artifact = joblib.load(os.path.join(self.model_dir, latest['path']))
+        except Exception as e:
+            logging.error(f"Error loading model artifact: {str(e)}")
+            return self.artifact is not None
+
+        # Swap in one assignment so in-flight requests keep a consistent model
+        with self._lock:
+            self.artifact = artifact
+            self.pointer_mtime = mtime
+        logging.info(f"Loaded model artifact {artifact['version']}")
+        return True
+
+    def invalidate(self, job=None):
+        """Drop cached grids, e.g. once qualifying results land"""
+        self.grid_cache = {}
+
+    def update_model(self, job=None):
+        """
+        Fold a newly completed round into the served model, falling back to a
+        full retrain if the drift checks fail, then serve the new artifact
+
+        Returns:
+            dict: The update summary, or None if there is no model or an update is already running
+        """
+        if not self._update_lock.acquire(blocking=False):
+            return None
+        try:
+            # Imported here so the training stack only loads in the process that updates
+            from ml.f1_predictor_ml import F1Predictor as RaceModel
+
+            race_model = RaceModel()
+            if race_model.load_model(self.model_dir) is None:
+                return None
+            update = race_model.update_model()
+            if update['mode'] in ('online', 'retrained'):
+                race_model.save_model(self.model_dir)
+                self.load(force=True)
+                self.invalidate()
+            logging.info(f"Model update: {update['mode']} with {update['rounds']} new rounds "
+                         f"in {update['seconds']:.1f}s")
+            return update
+
+        except Exception as e:
+            logging.error(f"Error updating model: {str(e)}")
+            return None
+        finally:
+            self._update_lock.release()
+
+    def get_model_info(self):
+        artifact = self.artifact
+        if artifact is None:
+            return None
+        return {
+            'version': artifact['version'],
+            'features': artifact['features'],
+            'metadata': artifact['metadata']
+        }
+
+    def predict_next_race(self):
+        """
+        Win probabilities for every driver on the next race's grid
+
+        Returns:
+            dict: Event, model version and drivers ordered by win probability,
+                  or None if there is no model or no grid
+        """
+        self.load()
+        artifact = self.artifact
+        if artifact is None:
+            return None
+
+        try:
+            next_event = self.predictor.get_next_event()
+            if next_event is None:
+                return None
+
+            grid = self.get_grid(next_event['year'], next_event['round'], next_event['name'], artifact['features'])
+            if grid is None or grid.empty:
+                return None
+
+            predictions = self.predict_grid(grid, artifact)
+            return {
+                'race_name': next_event['name'],
+                'year': next_event['year'],
+                'round': next_event['round'],
+                'grid_source': grid.attrs.get('source'),
+                'model': {
+                    'version': artifact['version'],
+                    'trained_at': artifact['metadata'].get('trained_at')
+                },
+                'predictions': predictions
+            }
+
+        except Exception as e:
+            logging.error(f"Error making ML prediction: {str(e)}")
+            return None
+
+    def predict_grid(self, grid, artifact=None):
+        """Batch inference over the whole grid in one call"""
+        artifact = artifact or self.artifact
+        model = artifact['model']
+        features = artifact['features']
+
+        X = pd.DataFrame(artifact['imputer'].transform(grid[features]), columns=features)
+        probabilities = model.predict_proba(X)
+        classes = np.asarray(model.classes_, dtype=float)
+
+        # P(position 1) per driver, renormalized so exactly one winner is expected
+        win = probabilities[:, classes == 1.0].sum(axis=1) if (classes == 1.0).any() else np.zeros(len(X))
+        win = win / win.sum() if win.sum() > 0 else np.full(len(X), 1.0 / len(X))
+        podium = probabilities[:, classes <= 3.0].sum(axis=1)
+        expected_position = probabilities @ classes
+
+        results = grid.assign(
+            WinProbability=win,
+            PodiumProbability=podium,
+            ExpectedPosition=expected_position
+        ).sort_values(['WinProbability', 'ExpectedPosition'], ascending=[False, True])
+
+        return [{
+            'name': row.FullName,
+            'abbreviation': row.Abbreviation,
+            'team': row.TeamName,
+            'qualifying_position': None if pd.isna(row.QualifyingPosition) else int(row.QualifyingPosition),
+            'win_probability': round(float(row.WinProbability), 4),
+            'podium_probability': round(float(row.PodiumProbability), 4),
+            'expected_position': round(float(row.ExpectedPosition), 2)
+        } for row in results.itertuples(index=False)]
+
+    def get_grid(self, year, race_round, track, features):
+        """
+        Feature rows for the grid of a race weekend. Uses that weekend's
+        qualifying once it has run, otherwise the last completed qualifying.
+        """
+        cache_key = (year, race_round, tuple(features), self._feature_store_mtime())
+        if cache_key in self.grid_cache:
+            return self.grid_cache[cache_key]
+
+        results, source = self._qualifying_results(year, race_round)
+        if results is None:
+            return None
+
+        grid = pd.DataFrame({
+            'DriverNumber': results['DriverNumber'].astype(str),
+            'Abbreviation': results['Abbreviation'],
+            'FullName': results['FullName'],
+            'TeamName': results['TeamName'],
+            'QualifyingPosition': pd.to_numeric(results['Position'], errors='coerce'),
+            'RoundNumber': race_round,
+            'Year': year,
+            'Track': track
+        }).reset_index(drop=True)
+
+        if any(feature in FORM_FEATURES for feature in features):
+            # The same precomputed form states the model was trained on
+            grid = self._get_feature_store().attach(grid)
+
+        practice_features = [f for f in features if f.startswith('LongRun')]
+        if practice_features:
+            long_runs = self.predictor.long_run_analyzer.get_long_run_features(year, race_round)
+            for feature in practice_features:
+                grid[feature] = (grid['DriverNumber'].map(long_runs[feature])
+                                 if long_runs is not None else np.nan)
+
+        grid.attrs['source'] = source
+        self.grid_cache[cache_key] = grid
+        return grid
+
+    def _feature_store_mtime(self):
+        try:
+            return os.path.getmtime(FEATURE_STORE_PATH)
+        except OSError:
+            return None
+
+    def _get_feature_store(self):
+        """Form states written by training, re-read when the store file changes"""
+        mtime = self._feature_store_mtime()
+        if self.feature_store is None or mtime != self.feature_store_mtime:
+            self.feature_store = FeatureStore()
+            self.feature_store_mtime = mtime
+        return self.feature_store
+
+    def _qualifying_results(self, year, race_round):
+        """Qualifying results of this weekend if available, else of the previous round"""
+        candidates = [(year, race_round)]
+        candidates.append((year, race_round - 1) if race_round > 1 else (year - 1, None))
+
+        for candidate_year, candidate_round in candidates:
+            try:
+                if candidate_round is None:
+                    schedule = fastf1.get_event_schedule(candidate_year, include_testing=False)
+                    candidate_round = int(schedule['RoundNumber'].max())
+                session = fastf1.get_session(candidate_year, candidate_round, 'Qualifying')
+                session.load(laps=False, telemetry=False, weather=False, messages=False)
+                results = session.results
+                if results is not None and pd.to_numeric(results['Position'], errors='coerce').notna().any():
+                    return results, f"{candidate_year} round {candidate_round} qualifying"
+            except Exception as e:
+                logging.info(f"Qualifying for {candidate_year} round {candidate_round} unavailable: {str(e)}")
+        return None, None
@@ -0,0 +1,31 @@
+import numpy as np
+
+# Points for P1..P10 of a Grand Prix and P1..P8 of a sprint (2022 onwards)
+RACE_POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+SPRINT_POINTS = (8, 7, 6, 5, 4, 3, 2, 1)
+SPRINT_POINTS_2021 = (3, 2, 1)
+
+
+def sprint_points(season):
+    """Sprint points by finishing position for a season"""
+    return SPRINT_POINTS_2021 if int(season) == 2021 else SPRINT_POINTS
+
+
+def fastest_lap_points(season):
+    """Bonus for the fastest lap, awarded to a top-10 finisher from 2019 to 2024"""
+    return 1 if 2019 <= int(season) <= 2024 else 0
+
+
+def points_table(points, positions):
+    """Points per finishing position, padded with zeros to ``positions`` entries"""
+    table = np.zeros(max(positions, len(points)))
+    table[:len(points)] = points
+    return table
+
+
+def max_weekend_points(season, sprint=False):
+    """Most points a single driver can score over one race weekend"""
+    total = RACE_POINTS[0] + fastest_lap_points(season)
+    if sprint:
+        total += sprint_points(season)[0]
+    return total
@@ -0,0 +1,332 @@
+import fastf1
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import pandas as pd
+from config import PREDICTION_HISTORY_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    race_name TEXT,
+    source TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    winner_correct INTEGER,
+    top3_hits INTEGER,
+    brier REAL,
+    scored_at TEXT,
+    UNIQUE (season, round, source, model_version)
+);
+CREATE TABLE IF NOT EXISTS prediction_entries (
+    prediction_id INTEGER NOT NULL REFERENCES predictions(id) ON DELETE CASCADE,
+    predicted_rank INTEGER NOT NULL,
+    driver TEXT NOT NULL,
+    abbreviation TEXT,
+    team TEXT,
+    confidence REAL,
+    finish_position INTEGER,
+    PRIMARY KEY (prediction_id, predicted_rank)
+);
+CREATE TABLE IF NOT EXISTS results (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver TEXT NOT NULL,
+    abbreviation TEXT,
+    position INTEGER,
+    PRIMARY KEY (season, round, driver)
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_model ON predictions (source, model_version, season);
+CREATE INDEX IF NOT EXISTS idx_results_abbreviation ON results (season, round, abbreviation);
+"""
+
+# Scoring a round: each entry is matched to the classification by abbreviation
+# where both have one, else by name, then every prediction's accuracy is
+# aggregated from its entries. Queries afterwards never touch the results table.
+MATCH_ENTRIES = """
+UPDATE prediction_entries SET finish_position = (
+    SELECT r.position FROM predictions p
+    JOIN results r ON r.season = p.season AND r.round = p.round
+    WHERE p.id = prediction_entries.prediction_id
+      AND (r.abbreviation = prediction_entries.abbreviation OR r.driver = prediction_entries.driver)
+    LIMIT 1
+)
+WHERE prediction_id IN (SELECT id FROM predictions WHERE season = :season AND round = :round)
+"""
+
+SCORE_PREDICTIONS = """
+UPDATE predictions SET
+    winner_correct = (SELECT COALESCE(MAX(finish_position = 1), 0) FROM prediction_entries e
+                      WHERE e.prediction_id = predictions.id AND e.predicted_rank = 1),
+    top3_hits = (SELECT COUNT(*) FROM prediction_entries e
+                 WHERE e.prediction_id = predictions.id AND e.predicted_rank <= 3 AND e.finish_position <= 3),
+    brier = (SELECT AVG((confidence - (COALESCE(finish_position, 0) = 1)) * (confidence - (COALESCE(finish_position, 0) = 1)))
+             FROM prediction_entries e WHERE e.prediction_id = predictions.id AND e.confidence IS NOT NULL),
+    scored_at = :scored_at
+WHERE season = :season AND round = :round
+"""
+
+
+class PredictionHistory:
+    """
+    SQLite store of every race prediction, heuristic and ML, keyed by season,
+    round, source and model version. Predictions are scored against the
+    results as soon as a round's results are recorded, so accuracy queries
+    only aggregate stored scores.
+    """
+
+    SOURCES = ('heuristic', 'ml')
+
+    def __init__(self, db_path=PREDICTION_HISTORY_PATH):
+        self.db_path = db_path
+        self._recorded = {}  # Payload hash of the last write per prediction key
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+            # Earlier versions stored the heuristic's relative scores as probabilities
+            connection.execute("UPDATE prediction_entries SET confidence = NULL WHERE confidence IS NOT NULL "
+                               "AND prediction_id IN (SELECT id FROM predictions WHERE source = 'heuristic')")
+            connection.execute("UPDATE predictions SET brier = NULL WHERE source = 'heuristic' AND brier IS NOT NULL")
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits on success, rolls back on error and is always closed"""
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA foreign_keys=ON')
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record_prediction(self, season, race_round, race_name, source, model_version, entries, payload):
+        """
+        Store the prediction for a round, replacing an earlier one from the same
+        model. Rounds whose results are already stored are left untouched.
+
+        Args:
+            entries (list): Dicts with driver, abbreviation, team and confidence
+                            (the source's win likelihood scaled to 0-1, or None),
+                            in predicted finishing order
+
+        Returns:
+            bool: True if the prediction was written
+        """
+        key = (int(season), int(race_round), source, str(model_version))
+        body = json.dumps(payload, sort_keys=True, default=str)
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        if self._recorded.get(key) == digest:
+            return False
+
+        try:
+            with self._lock, self._connect() as connection:
+                if connection.execute('SELECT 1 FROM results WHERE season = ? AND round = ? LIMIT 1',
+                                      key[:2]).fetchone():
+                    return False
+
+                connection.execute('DELETE FROM predictions WHERE season = ? AND round = ? AND source = ? '
+                                   'AND model_version = ?', key)
+                prediction_id = connection.execute(
+                    'INSERT INTO predictions (season, round, race_name, source, model_version, created_at, payload) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (*key[:2], race_name, source, key[3], datetime.now(timezone.utc).isoformat(), body)
+                ).lastrowid
+                connection.executemany(
+                    'INSERT INTO prediction_entries (prediction_id, predicted_rank, driver, abbreviation, team, confidence) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(prediction_id, rank, entry['driver'], entry.get('abbreviation'), entry.get('team'),
+                      entry.get('confidence')) for rank, entry in enumerate(entries, 1)]
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Error recording prediction for {key}: {str(e)}")
+            return False
+        self._recorded[key] = digest
+        return True
+
+    def record_heuristic(self, event, prediction, model_version):
+        """
+        Store a prediction from F1Predictor.predict_next_race for the given event.
+        Its confidence is a relative score over its top picks, not a win
+        probability over the field, so it is left out of Brier and calibration.
+        """
+        if not event or not prediction:
+            return False
+        picks = [prediction] + prediction.get('other_predictions', [])
+        entries = [{
+            'driver': pick['driver'],
+            'team': pick['team'],
+            'confidence': None
+        } for pick in picks]
+        return self.record_prediction(event['year'], event['round'], event['name'], 'heuristic',
+                                      model_version, entries, prediction)
+
+    def record_ml(self, prediction):
+        """Store a prediction from MLPredictionService.predict_next_race"""
+        if not prediction:
+            return False
+        entries = [{
+            'driver': driver['name'],
+            'abbreviation': driver['abbreviation'],
+            'team': driver['team'],
+            'confidence': driver['win_probability']
+        } for driver in prediction['predictions']]
+        return self.record_prediction(prediction['year'], prediction['round'], prediction['race_name'], 'ml',
+                                      prediction['model']['version'], entries, prediction)
+
+    def record_results(self, season, race_round, results=None):
+        """
+        Store a round's classification and score every prediction for it
+
+        Args:
+            results (list): Dicts with driver, abbreviation and position; loaded
+                            from the race session when omitted
+
+        Returns:
+            int: Number of predictions scored
+        """
+        if results is None:
+            results = self.load_results(season, race_round)
+        if not results:
+            return 0
+
+        with self._lock, self._connect() as connection:
+            connection.execute('DELETE FROM results WHERE season = ? AND round = ?', (season, race_round))
+            connection.executemany(
+                'INSERT INTO results (season, round, driver, abbreviation, position) VALUES (?, ?, ?, ?, ?)',
+                [(season, race_round, r['driver'], r.get('abbreviation'), r.get('position')) for r in results]
+            )
+            scope = {'season': season, 'round': race_round}
+            connection.execute(MATCH_ENTRIES, scope)
+            return connection.execute(SCORE_PREDICTIONS, {
+                **scope,
+                'scored_at': datetime.now(timezone.utc).isoformat()
+            }).rowcount
+
+    def load_results(self, season, race_round):
+        """Race classification from fastf1, or None if it is not available"""
+        try:
+            session = fastf1.get_session(season, race_round, 'Race')
+            session.load(laps=False, telemetry=False, weather=False, messages=False)
+            positions = pd.to_numeric(session.results['Position'], errors='coerce')
+            if positions.isna().all():
+                return None
+            return [{
+                'driver': f"{row.FirstName} {row.LastName}",
+                'abbreviation': row.Abbreviation,
+                'position': int(position) if pd.notna(position) else None
+            } for row, position in zip(session.results.itertuples(index=False), positions)]
+        except Exception as e:
+            logging.error(f"Error loading results for {season} round {race_round}: {str(e)}")
+            return None
+
+    def get_version(self):
+        """
+        Version of the stored data, which changes whenever a prediction or result is stored
+
+        Returns:
+            dict: Version string and the time of the latest write, or None if empty
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) AS predictions, MAX(created_at) AS created, MAX(scored_at) AS scored "
+                "FROM predictions"
+            ).fetchone()
+        latest = max(filter(None, (row['created'], row['scored'])), default=None)
+        return {
+            'version': f"{row['predictions']}:{row['created']}:{row['scored']}",
+            'modified': datetime.fromisoformat(latest) if latest else None
+        }
+
+    def get_history(self, season=None, source=None, limit=50):
+        """Stored predictions, newest round first, with their scores once results are in"""
+        clauses, params = [], []
+        if season is not None:
+            clauses.append('season = ?')
+            params.append(season)
+        if source is not None:
+            clauses.append('source = ?')
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT id, season, round, race_name, source, model_version, created_at, "
+                f"winner_correct, top3_hits, brier, scored_at FROM predictions {where} "
+                f"ORDER BY season DESC, round DESC, source LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            entries = {}
+            if rows:
+                ids = [row['id'] for row in rows]
+                for entry in connection.execute(
+                    f"SELECT prediction_id, predicted_rank, driver, team, confidence FROM prediction_entries "
+                    f"WHERE prediction_id IN ({','.join('?' * len(ids))}) AND predicted_rank <= 3 "
+                    f"ORDER BY prediction_id, predicted_rank", ids
+                ):
+                    entries.setdefault(entry['prediction_id'], []).append({
+                        'driver': entry['driver'],
+                        'team': entry['team'],
+                        'confidence': entry['confidence']
+                    })
+
+        return [{
+            'season': row['season'],
+            'round': row['round'],
+            'race_name': row['race_name'],
+            'source': row['source'],
+            'model_version': row['model_version'],
+            'created_at': row['created_at'],
+            'top_3': entries.get(row['id'], []),
+            'scored': row['scored_at'] is not None,
+            'winner_correct': None if row['winner_correct'] is None else bool(row['winner_correct']),
+            'top3_hits': row['top3_hits'],
+            'brier': row['brier']
+        } for row in rows]
+
+    def get_leaderboard(self, since=None):
+        """Accuracy per source and model version over every scored round"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT source, model_version, COUNT(*) AS races, MIN(season) AS first_season, "
+                "MAX(season) AS last_season, AVG(winner_correct) AS winner_hit_rate, "
+                "AVG(top3_hits) / 3.0 AS top3_overlap, AVG(brier) AS brier "
+                "FROM predictions WHERE scored_at IS NOT NULL AND season >= ? "
+                "GROUP BY source, model_version ORDER BY winner_hit_rate DESC, top3_overlap DESC",
+                (since or 0,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_calibration(self, source='ml', bins=10, since=None):
+        """
+        Predicted win likelihood against the observed win rate, in equal-width bins
+
+        Returns:
+            list: One dict per non-empty bin with its range, count, mean
+                  predicted likelihood and observed win rate
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT MIN(CAST(e.confidence * :bins AS INTEGER), :bins - 1) AS bin, COUNT(*) AS entries, "
+                "AVG(e.confidence) AS predicted, AVG(COALESCE(e.finish_position, 0) = 1) AS observed "
+                "FROM predictions p JOIN prediction_entries e ON e.prediction_id = p.id "
+                "WHERE p.scored_at IS NOT NULL AND p.source = :source AND p.season >= :since "
+                "AND e.confidence IS NOT NULL GROUP BY bin ORDER BY bin",
+                {'bins': bins, 'source': source, 'since': since or 0}
+            ).fetchall()
+        return [{
+            'range': [row['bin'] / bins, (row['bin'] + 1) / bins],
+            'entries': row['entries'],
+            'predicted': row['predicted'],
+            'observed': row['observed']
+        } for row in rows]
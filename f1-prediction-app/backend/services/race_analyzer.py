@@ -4,10 +4,12 @@ from datetime import datetime
 import fastf1
 import logging
 from collections import defaultdict
+from .session_stats import SessionFieldStats
 
 class RaceAnalyzer:
     def __init__(self):
         self.cache = {}
+        self.session_stats = {}
         
     def get_driver_race_analysis(self, driver_name, race_round=None, year=None):
         """Get comprehensive race analysis for a specific driver"""
@@ -48,7 +50,9 @@ class RaceAnalyzer:
                 'lap_times': self._analyze_lap_times(driver_laps),
                 'sector_performance': self._analyze_sectors(driver_laps),
                 'tyre_performance': self._analyze_tyre_performance(driver_laps),
-                'race_pace': self._analyze_race_pace(driver_laps, session.laps),
+                'race_pace': self._analyze_race_pace(
+                    driver_laps, self.get_session_stats(year, race_round, session)
+                ),
                 'position_changes': self._analyze_position_changes(driver_laps),
                 'race_summary': self._get_race_summary(session, driver_name)
             }
@@ -111,16 +115,21 @@ class RaceAnalyzer:
             
         return dict(tyre_performance)
         
-    def _analyze_race_pace(self, driver_laps, all_laps):
-        """Compare race pace with field average"""
-        field_lap_times = all_laps['LapTime'].dt.total_seconds()
-        driver_lap_times = driver_laps['LapTime'].dt.total_seconds()
-        
-        return {
-            'driver_average': driver_lap_times.mean(),
-            'field_average': field_lap_times.mean(),
-            'pace_delta': driver_lap_times.mean() - field_lap_times.mean()
-        }
+    def _analyze_race_pace(self, driver_laps, field_stats):
+        """Compare race pace with the precomputed field statistics"""
+        driver = driver_laps['Driver'].iloc[0]
+        team = driver_laps['Team'].iloc[0] if 'Team' in driver_laps.columns else None
+        return field_stats.driver_summary(driver, team)
+
+    def get_session_stats(self, year, race_round, session=None):
+        """Get field statistics for a race session, building them once per session"""
+        stats_key = f"{year}_{race_round}"
+        if stats_key not in self.session_stats:
+            if session is None:
+                session = fastf1.get_session(year, race_round, 'R')
+                session.load(telemetry=False, weather=False, messages=False)
+            self.session_stats[stats_key] = SessionFieldStats.from_session(session)
+        return self.session_stats[stats_key]
         
     def _analyze_position_changes(self, driver_laps):
         """Track position changes throughout the race"""
@@ -1,25 +1,244 @@
 import fastf1
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import bisect
+import hashlib
+import json
+import threading
 import logging
 
 class RaceCalendarService:
+    # fastf1 session names mapped to the identifiers used across the backend
+    SESSION_IDENTIFIERS = {
+        'Practice 1': 'FP1',
+        'Practice 2': 'FP2',
+        'Practice 3': 'FP3',
+        'Sprint Qualifying': 'SQ',
+        'Sprint Shootout': 'SQ',
+        'Sprint': 'S',
+        'Qualifying': 'Q',
+        'Race': 'R'
+    }
+
+    # Typical session lengths, used to estimate when each session ends
+    SESSION_DURATIONS = {
+        'FP1': timedelta(hours=1),
+        'FP2': timedelta(hours=1),
+        'FP3': timedelta(hours=1),
+        'SQ': timedelta(minutes=45),
+        'S': timedelta(hours=1),
+        'Q': timedelta(hours=1),
+        'R': timedelta(hours=2)
+    }
+
+    UTC_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
     def __init__(self):
         self.current_year = datetime.now().year
+        self.schedule_cache = {}
+        self.artifact_cache = {}
+        self._lock = threading.Lock()
+
+    def get_event_schedule(self, year=None):
+        """Season schedule from fastf1, kept until invalidate() is called"""
+        year = year or self.current_year
+        with self._lock:
+            if year not in self.schedule_cache:
+                self.schedule_cache[year] = fastf1.get_event_schedule(year)
+            return self.schedule_cache[year]
+
+    def invalidate(self):
+        """
+        Drop cached schedules so the next lookup picks up calendar changes.
+        Calendar artifacts are kept and only replaced if their content changes.
+        """
+        with self._lock:
+            self.current_year = datetime.now().year
+            self.schedule_cache = {}
+        for year in list(self.artifact_cache):
+            self._build_artifact(year)
+
+    def get_session_schedule(self, year=None):
+        """
+        Every session of a season with its start time in UTC
+
+        Returns:
+            list: Dicts with year, round, event, session identifier and UTC start,
+                  ordered by start time
+        """
+        year = year or self.current_year
+        sessions = self._session_frame(year)
+        return [{
+            'year': int(year),
+            'round': int(row.RoundNumber),
+            'event': row.EventName,
+            'session': row.Session,
+            'start': row.Start.to_pydatetime()
+        } for row in sessions.itertuples(index=False)]
+
+    def _session_frame(self, year):
+        """One row per session of the season, built column-wise from the wide schedule"""
+        schedule = self.get_event_schedule(year)
+        schedule = schedule[schedule['RoundNumber'] > 0]  # Pre-season testing has no results
+        sessions = pd.concat([
+            pd.DataFrame({
+                'RoundNumber': schedule['RoundNumber'].to_numpy(),
+                'EventName': schedule['EventName'].to_numpy(),
+                'Session': schedule[f'Session{i}'].map(self.SESSION_IDENTIFIERS).to_numpy(),
+                'Name': schedule[f'Session{i}'].to_numpy(),
+                'Start': pd.to_datetime(schedule[f'Session{i}DateUtc']).to_numpy()
+            }) for i in range(1, 6)
+        ], ignore_index=True)
+        sessions['Start'] = sessions['Start'].dt.tz_localize('UTC')
+        sessions = sessions.dropna(subset=['Session', 'Start'])
+        return sessions.sort_values('Start', kind='stable').reset_index(drop=True)
+
+    def get_calendar_artifact(self, year=None):
+        """
+        The serialized calendar for a season, built once per schedule change
+
+        Returns:
+            dict: JSON body, strong ETag, UTC session starts and build time
+        """
+        year = year or self.current_year
+        artifact = self.artifact_cache.get(year)
+        if artifact is None:
+            artifact = self._build_artifact(year)
+        return artifact
+
+    def _build_artifact(self, year):
+        try:
+            calendar = self._build_calendar(year)
+        except Exception as e:
+            logging.error(f"Error building race calendar for {year}: {str(e)}")
+            return self.artifact_cache.get(year)
+
+        body = json.dumps(calendar, separators=(',', ':')).encode('utf-8')
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        previous = self.artifact_cache.get(year)
+        if previous is not None and previous['etag'] == etag:
+            return previous
+
+        artifact = {
+            'year': year,
+            'calendar': calendar,
+            'body': body,
+            'etag': etag,
+            'session_starts': sorted(
+                self._parse_utc(session['start'])
+                for event in calendar for session in event['sessions']
+            ),
+            'built_at': datetime.now(timezone.utc)
+        }
+        self.artifact_cache[year] = artifact
+        return artifact
+
+    def _build_calendar(self, year):
+        """Race weekends with every session in UTC, in the list format the frontend reads"""
+        schedule = self.get_event_schedule(year)
+        sessions = self._session_frame(year)
+        sessions['StartIso'] = sessions['Start'].dt.strftime(self.UTC_FORMAT)
+        by_round = {
+            race_round: [{
+                'session': session,
+                'name': name,
+                'start': start
+            } for session, name, start in zip(group['Session'], group['Name'], group['StartIso'])]
+            for race_round, group in sessions.groupby('RoundNumber')
+        }
+
+        race_calendar = []
+        for event in schedule.to_dict('records'):
+            race_start = event['Session5Date']
+            weekend = by_round.get(event['RoundNumber'], [])
+            race = next((s for s in weekend if s['session'] == 'R'), None)
+            race_calendar.append({
+                'round': int(event['RoundNumber']),
+                'name': event['EventName'],
+                'location': f"{event['Location']}, {event['Country']}",
+                'date': event['EventDate'].strftime('%Y-%m-%d'),
+                'time': race_start.strftime('%H:%M') if pd.notna(race_start) else 'TBD',
+                'start': race['start'] if race else None,
+                'sprint': 'Sprint' in event['EventFormat'],
+                'sessions': weekend
+            })
+        return race_calendar
+
+    def _parse_utc(self, value):
+        return datetime.strptime(value, self.UTC_FORMAT).replace(tzinfo=timezone.utc)
+
+    def seconds_to_next_session(self, artifact, now=None):
+        """Seconds until the next session starts, None once the season is over"""
+        now = now or datetime.now(timezone.utc)
+        starts = artifact['session_starts']
+        index = bisect.bisect_right(starts, now)
+        return (starts[index] - now).total_seconds() if index < len(starts) else None
+
+    def get_next_race(self, now=None):
+        """
+        The next race that has not started yet, from the cached calendar artifact
+
+        Returns:
+            dict: Year, round and name of the race, or None once the season is over
+        """
+        now = now or datetime.now(timezone.utc)
+        artifact = self.get_calendar_artifact()
+        if artifact is None:
+            return None
+        for event in artifact['calendar']:
+            if event['start'] and event['round'] > 0 and self._parse_utc(event['start']) > now:
+                return {'year': artifact['year'], 'round': event['round'], 'name': event['name']}
+        return None
+
+    @staticmethod
+    def _ical_property(name, value):
+        """
+        One content line with its text value escaped and folded as RFC 5545 requires:
+        at most 75 octets per line, continuation lines starting with a space
+        """
+        value = (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                 .replace('\r\n', '\\n').replace('\n', '\\n'))
+        line = f"{name}:{value}".encode('utf-8')
+        parts = []
+        limit = 75
+        while len(line) > limit:
+            cut = limit
+            while line[cut] & 0xC0 == 0x80:  # Never split a multi-byte character
+                cut -= 1
+            parts.append(line[:cut])
+            line = b' ' + line[cut:]
+        parts.append(line)
+        return '\r\n'.join(part.decode('utf-8') for part in parts) + '\r\n'
+
+    def iter_ical(self, year=None):
+        """Stream the season's sessions as an iCalendar document, line by line"""
+        artifact = self.get_calendar_artifact(year)
+        if artifact is None:
+            return
+
+        stamp = artifact['built_at'].strftime('%Y%m%dT%H%M%SZ')
+        yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//f1-winners//race calendar//EN\r\nCALSCALE:GREGORIAN\r\n"
+        for event in artifact['calendar']:
+            for session in event['sessions']:
+                start = self._parse_utc(session['start'])
+                end = start + self.SESSION_DURATIONS[session['session']]
+                yield (
+                    "BEGIN:VEVENT\r\n"
+                    f"UID:{artifact['year']}-{event['round']}-{session['session']}@f1-winners\r\n"
+                    f"DTSTAMP:{stamp}\r\n"
+                    f"DTSTART:{start.strftime('%Y%m%dT%H%M%SZ')}\r\n"
+                    f"DTEND:{end.strftime('%Y%m%dT%H%M%SZ')}\r\n"
+                    + self._ical_property('SUMMARY', f"{event['name']} - {session['name']}")
+                    + self._ical_property('LOCATION', event['location']) +
+                    "END:VEVENT\r\n"
+                )
+        yield "END:VCALENDAR\r\n"
 
     def get_race_calendar(self):
         """Fetch the current season's race calendar."""
         try:
-            schedule = fastf1.get_event_schedule(self.current_year)
-            race_calendar = []
-            for _, event in schedule.iterrows():
-                race_calendar.append({
-                    'name': event['EventName'],
-                    'date': event['EventDate'].strftime('%Y-%m-%d'),
-                    'time': event['Session5Date'].strftime('%H:%M') if pd.notna(event['Session5Date']) else 'TBD',
-                    'sprint': 'Sprint' in event['EventFormat']
-                })
-            return race_calendar
+            artifact = self.get_calendar_artifact()
+            return artifact['calendar'] if artifact else None
         except Exception as e:
             logging.error(f"Error fetching race calendar: {str(e)}")
-            return None
\ No newline at end of file
+            return None
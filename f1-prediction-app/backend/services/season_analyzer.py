@@ -0,0 +1,255 @@
+import fastf1
+import pandas as pd
+import numpy as np
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import SEASON_SUMMARY_DIR
+from .session_stats import SessionFieldStats
+from .race_calendar import RaceCalendarService
+from .ingestion_scheduler import IngestionScheduler
+
+
+def _to_float(value):
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def _degradation_by_compound(laps):
+    """Lap time slope against tyre age per driver and compound (s/lap)"""
+    laps = laps.dropna(subset=['Compound', 'TyreLife'])
+    x = laps['TyreLife'].astype(float)
+    y = laps['LapTimeSeconds']
+    keys = [laps['Driver'], laps['Compound']]
+
+    # slope = cov(x, y) / var(x), computed from grouped sums in one pass
+    frame = pd.DataFrame({'x': x, 'y': y, 'xy': x * y, 'xx': x * x})
+    sums = frame.groupby(keys).agg(['sum', 'count'])
+    n = sums[('x', 'count')]
+    cov = sums[('xy', 'sum')] - sums[('x', 'sum')] * sums[('y', 'sum')] / n
+    var = sums[('xx', 'sum')] - sums[('x', 'sum')] ** 2 / n
+    slope = (cov / var.where(var > 0)).where(n >= 3)
+    return slope.dropna()
+
+
+def summarize_race(year, race_round):
+    """Build the compact per-driver summary of one race.
+
+    Runs in a worker process, so it only takes and returns plain values.
+    """
+    session = fastf1.get_session(year, race_round, 'R')
+    session.load(telemetry=False, weather=False, messages=False)
+    if session.results is None or session.results['Position'].isna().all():
+        raise ValueError(f"No classified results yet for {year} round {race_round}")
+
+    stats = SessionFieldStats.from_session(session)
+
+    # Sector ranks from each driver's best sector times
+    sector_columns = ['Sector1Time', 'Sector2Time', 'Sector3Time']
+    best_sectors = session.laps.groupby('Driver')[sector_columns].min()
+    best_sectors = best_sectors.apply(lambda column: column.dt.total_seconds())
+    sector_ranks = best_sectors.rank(method='min')
+
+    degradation = _degradation_by_compound(stats.laps)
+
+    drivers = {}
+    for _, result in session.results.iterrows():
+        abbreviation = result['Abbreviation']
+        drivers[abbreviation] = {
+            'driver': f"{result['FirstName']} {result['LastName']}",
+            'last_name': result['LastName'],
+            'team': result['TeamName'],
+            'position': int(result['Position']) if pd.notna(result['Position']) else None,
+            'grid': int(result['GridPosition']) if pd.notna(result['GridPosition']) else None,
+            'points': _to_float(result['Points']) or 0.0,
+            'status': result['Status'],
+            'pace_delta': _to_float(stats.pace_delta(abbreviation, 'median')),
+            'clean_air_delta': _to_float(stats.clean_air_delta(abbreviation)),
+            'sector_ranks': {
+                f'sector_{sector}': (
+                    int(sector_ranks.at[abbreviation, f'Sector{sector}Time'])
+                    if abbreviation in sector_ranks.index
+                    and pd.notna(sector_ranks.at[abbreviation, f'Sector{sector}Time']) else None
+                ) for sector in [1, 2, 3]
+            },
+            'tyre_degradation': (
+                {compound: float(value) for compound, value in degradation.loc[abbreviation].items()}
+                if abbreviation in degradation.index.get_level_values(0) else {}
+            )
+        }
+
+    return {
+        'year': int(year),
+        'round': int(race_round),
+        'name': session.event['EventName'],
+        'date': session.event['EventDate'].strftime('%Y-%m-%d'),
+        'drivers': drivers
+    }
+
+
+class SeasonAnalyzer:
+    """
+    Season-long driver history built from persisted per-round summaries.
+
+    Missing rounds are summarized in a process pool that is started once and
+    reused, so a backfill runs from a background job rather than forking in a
+    request. The ingestion scheduler adds each new round as its results land.
+    """
+
+    def __init__(self, summary_dir=SEASON_SUMMARY_DIR, max_workers=None, calendar_service=None):
+        self.summary_dir = summary_dir
+        self.calendar_service = calendar_service or RaceCalendarService()
+        self.max_workers = max_workers
+        self.summaries = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def get_driver_season(self, driver_name, year=None):
+        """Get per-round results and pace figures for a driver across a season"""
+        if not year:
+            year = datetime.now().year
+
+        try:
+            summaries = self.get_season_summaries(year)
+            if not summaries:
+                return None
+
+            rounds = []
+            for summary in summaries:
+                entry = self._find_driver(summary['drivers'], driver_name)
+                if entry is None:
+                    continue
+                rounds.append({
+                    'round': summary['round'],
+                    'name': summary['name'],
+                    'date': summary['date'],
+                    **entry
+                })
+
+            if not rounds:
+                logging.error(f"No season data found for driver {driver_name} in {year}")
+                return None
+
+            positions = [r['position'] for r in rounds if r['position'] is not None]
+            pace_deltas = [r['pace_delta'] for r in rounds if r['pace_delta'] is not None]
+            return {
+                'driver': rounds[-1]['driver'],
+                'team': rounds[-1]['team'],
+                'year': year,
+                'rounds': rounds,
+                'season_summary': {
+                    'races': len(rounds),
+                    'points': sum(r['points'] for r in rounds),
+                    'average_finish': float(np.mean(positions)) if positions else None,
+                    'best_finish': min(positions) if positions else None,
+                    'average_pace_delta': float(np.mean(pace_deltas)) if pace_deltas else None
+                }
+            }
+
+        except Exception as e:
+            logging.error(f"Error analyzing season for {driver_name}: {str(e)}")
+            return None
+
+    def get_season_summaries(self, year):
+        """Load the summaries of every completed round, ingesting missing ones in parallel"""
+        rounds = self._completed_rounds(year)
+        summaries = {}
+        missing = []
+        for race_round in rounds:
+            summary = self._load_summary(year, race_round)
+            if summary is not None:
+                summaries[race_round] = summary
+            else:
+                missing.append(race_round)
+
+        if missing:
+            logging.info(f"Ingesting {len(missing)} rounds of the {year} season")
+            executor = self._get_executor()
+            futures = {
+                executor.submit(summarize_race, year, race_round): race_round
+                for race_round in missing
+            }
+            for future in as_completed(futures):
+                race_round = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    logging.error(f"Error summarizing {year} round {race_round}: {str(e)}")
+                    continue
+                self._save_summary(summary)
+                summaries[race_round] = summary
+
+        return [summaries[r] for r in sorted(summaries)]
+
+    def ingest_round(self, year, race_round):
+        """Summarize a round whose results just landed, replacing any earlier summary"""
+        try:
+            summary = summarize_race(year, race_round)
+        except Exception as e:
+            logging.error(f"Error summarizing {year} round {race_round}: {str(e)}")
+            return None
+        self._save_summary(summary)
+        return summary
+
+    def _completed_rounds(self, year):
+        """
+        Rounds whose race results should be published by now, judged as the
+        ingestion scheduler does from the race start, its length and the lag
+        """
+        now = datetime.now(timezone.utc)
+        results_lag = RaceCalendarService.SESSION_DURATIONS['R'] + IngestionScheduler.AVAILABILITY_LAG
+        return [
+            session['round'] for session in self.calendar_service.get_session_schedule(year)
+            if session['session'] == 'R' and session['start'] + results_lag <= now
+        ]
+
+    def _summary_path(self, year, race_round):
+        return os.path.join(self.summary_dir, str(year), f"round_{race_round:02d}.json")
+
+    def _load_summary(self, year, race_round):
+        key = (year, race_round)
+        if key in self.summaries:
+            return self.summaries[key]
+
+        path = self._summary_path(year, race_round)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reading season summary {path}: {str(e)}")
+            return None
+
+        self.summaries[key] = summary
+        return summary
+
+    def _save_summary(self, summary):
+        path = self._summary_path(summary['year'], summary['round'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the summary and swap it in, so a reader never sees a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(summary, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.summaries[(summary['year'], summary['round'])] = summary
+
+    def _find_driver(self, drivers, driver_name):
+        """Match a driver by abbreviation, full name or last name"""
+        if driver_name.upper() in drivers:
+            return drivers[driver_name.upper()]
+
+        name = driver_name.lower()
+        last_name = name.split()[-1]
+        for entry in drivers.values():
+            if entry['driver'].lower() == name or entry['last_name'].lower() == last_name:
+                return entry
+        return None
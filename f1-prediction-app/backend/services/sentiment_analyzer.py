@@ -4,15 +4,17 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List
 import logging
-from functools import lru_cache
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 class F1SentimentAnalyzer:
     # Class-level cache
     _articles_cache = {}
     _cache_timestamp = None
     _cache_duration = timedelta(minutes=60)  # Cache for 1 hour
+    _refresh_lock = threading.Lock()
 
     def __init__(self):
         # Extended list of reliable F1 RSS feeds
@@ -33,20 +35,26 @@ class F1SentimentAnalyzer:
             'NewsonF1': 'https://www.newsonf1.com/feed',
             'Grandprix.com': 'https://www.grandprix.com/rss.xml',
         }
-        
+        # Feeds are fetched on first use rather than here, so constructing the analyzer is free
+
+    def refresh(self):
+        """Fetch the feeds now if the cache is empty or expired, e.g. from a warm-up thread"""
         self._refresh_cache_if_needed()
+        return self
 
     def _refresh_cache_if_needed(self):
         """Check if cache needs refreshing and update if necessary"""
+        cls = type(self)
         current_time = datetime.now()
-        if (self._cache_timestamp is None or 
-            current_time - self._cache_timestamp > self._cache_duration):
-            self._articles_cache = {}
-            for source, feed_url in self.rss_feeds.items():
-                self._articles_cache[source] = self._fetch_feed(feed_url)
-            self._cache_timestamp = current_time
+        with cls._refresh_lock:
+            if (cls._cache_timestamp is None or
+                current_time - cls._cache_timestamp > cls._cache_duration):
+                # Fetch every feed at once; a refresh takes as long as the slowest feed
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    articles = dict(zip(self.rss_feeds, executor.map(self._fetch_feed, self.rss_feeds.values())))
+                cls._articles_cache = articles
+                cls._cache_timestamp = current_time
 
-    @lru_cache(maxsize=100)
     def _fetch_feed(self, feed_url: str) -> List[Dict]:
         """Fetch and parse RSS feed with caching"""
         try:
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class LazyService:
+    """
+    Stands in for a service until it is first used. Any attribute access
+    builds the service, dependencies first, so callers use the proxy exactly
+    like the instance itself.
+    """
+
+    def __init__(self, name, factory, requires=()):
+        self._name = name
+        self._factory = factory
+        self._requires = tuple(requires)
+        self._instance = None
+        self._lock = threading.Lock()
+        self._seconds = None
+        self._error = None
+
+    def get(self):
+        """The service instance, built on the first call"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        for dependency in self._requires:
+            dependency.get()
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                try:
+                    self._instance = self._factory()
+                except Exception as e:
+                    # Not cached, so the next use tries again
+                    self._error = str(e)
+                    logging.error(f"Error initializing {self._name}: {str(e)}")
+                    raise
+                self._seconds = time.perf_counter() - started
+                self._error = None
+                logging.info(f"Initialized {self._name} in {self._seconds:.2f}s")
+            return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    @property
+    def ready(self):
+        return self._instance is not None
+
+    def status(self):
+        return {
+            'ready': self.ready,
+            'seconds': None if self._seconds is None else round(self._seconds, 3),
+            'error': self._error
+        }
+
+
+class ServiceRegistry:
+    """Services of the API, built lazily on first use or ahead of time by a background warm-up"""
+
+    def __init__(self):
+        self.services = {}
+        self.created_at = datetime.now(timezone.utc)
+        self._warm_up_thread = None
+
+    def register(self, name, factory, requires=()):
+        """
+        Add a service without building it
+
+        Args:
+            name (str): Name reported by status()
+            factory (callable): Builds the service; import heavy modules inside it
+            requires (iterable): LazyServices to build first
+
+        Returns:
+            LazyService: Proxy to use in place of the instance
+        """
+        service = LazyService(name, factory, requires)
+        self.services[name] = service
+        return service
+
+    def warm_up(self, then=None):
+        """
+        Build every service in registration order on a background thread
+
+        Args:
+            then (callable): Called once every service has been attempted
+        """
+        if self._warm_up_thread is not None:
+            return
+
+        def run():
+            for service in self.services.values():
+                try:
+                    service.get()
+                except Exception:
+                    pass  # Logged by the service; it is retried on first use
+            if then is not None:
+                try:
+                    then()
+                except Exception as e:
+                    logging.error(f"Error after service warm-up: {str(e)}")
+
+        self._warm_up_thread = threading.Thread(target=run, name='service-warm-up', daemon=True)
+        self._warm_up_thread.start()
+
+    def status(self):
+        """Readiness of every service, for the readiness endpoint"""
+        services = {name: service.status() for name, service in self.services.items()}
+        return {
+            'ready': all(service['ready'] for service in services.values()),
+            'warming': self._warm_up_thread is not None and self._warm_up_thread.is_alive(),
+            'uptime': round((datetime.now(timezone.utc) - self.created_at).total_seconds(), 3),
+            'services': services
+        }
@@ -0,0 +1,167 @@
+import pandas as pd
+import numpy as np
+import logging
+
+
+class SessionFieldStats:
+    """Field pace statistics for a single race session, built once per session.
+
+    Only representative laps are used: pit in/out laps, the opening lap and any
+    lap run under anything other than green flag conditions are excluded.
+    Every per-driver and per-team figure is precomputed, so a pace delta is a
+    lookup followed by one subtraction.
+    """
+
+    CLEAN_AIR_GAP = 2.0  # Seconds to the car ahead for a lap to count as clean air
+    TRIM_PROPORTION = 0.1  # Fraction cut from each tail for trimmed means
+    PERCENTILES = (10, 25, 50, 75, 90)
+    METRICS = ('mean', 'median', 'trimmed_mean')
+
+    def __init__(self, laps):
+        self.laps = self._representative_laps(laps)
+        self.per_lap = self._per_lap_field_stats(self.laps)
+
+        lap_times = self.laps['LapTimeSeconds']
+        self.field_pace = {
+            'mean': self._nan_to_none(lap_times.mean()),
+            'median': self._nan_to_none(lap_times.median()),
+            'trimmed_mean': self._nan_to_none(self._trimmed_mean(lap_times.to_numpy()))
+        }
+        self.driver_pace = self._grouped_pace(self.laps, 'Driver')
+        self.team_pace = self._grouped_pace(self.laps, 'Team')
+
+        clean_air = self.laps[self.laps['CleanAir']]
+        self.driver_clean_air_pace = clean_air.groupby('Driver')['LapTimeSeconds'].median()
+        self.field_clean_air_pace = self._nan_to_none(clean_air['LapTimeSeconds'].median())
+
+        # Mean delta of each driver's laps to the field median of the same lap
+        lap_delta = self.laps['LapTimeSeconds'] - self.laps['LapNumber'].map(self.per_lap['p50'])
+        self.driver_lap_delta = lap_delta.groupby(self.laps['Driver']).mean()
+
+    @classmethod
+    def from_session(cls, session):
+        """Build statistics from a loaded fastf1 session"""
+        return cls(session.laps)
+
+    def _representative_laps(self, laps):
+        """Filter out pit, opening and non-green laps and annotate clean-air laps"""
+        laps = laps.copy()
+        laps['LapTimeSeconds'] = laps['LapTime'].dt.total_seconds()
+
+        green_flag = laps['TrackStatus'].astype(str).str.fullmatch(r'1+')
+        mask = (
+            laps['LapTimeSeconds'].notna() &
+            laps['PitInTime'].isna() &
+            laps['PitOutTime'].isna() &
+            (laps['LapNumber'] > 1) &
+            green_flag
+        )
+        laps = laps[mask]
+
+        # Gap to the car that crossed the line just before on the same lap
+        laps = laps.sort_values(['LapNumber', 'Time'])
+        gap_ahead = laps.groupby('LapNumber')['Time'].diff().dt.total_seconds()
+        laps['CleanAir'] = gap_ahead.isna() | (gap_ahead >= self.CLEAN_AIR_GAP)
+
+        return laps
+
+    def _per_lap_field_stats(self, laps):
+        """Field median and percentiles for every lap of the race"""
+        grouped = laps.groupby('LapNumber')['LapTimeSeconds']
+        per_lap = pd.DataFrame({
+            f'p{p}': grouped.quantile(p / 100) for p in self.PERCENTILES
+        })
+        per_lap['cars'] = grouped.size()
+        return per_lap
+
+    def _grouped_pace(self, laps, key):
+        """Mean, median and trimmed mean lap time per driver or team"""
+        grouped = laps.groupby(key)['LapTimeSeconds']
+
+        # Trimmed mean without a per-group Python call: drop laps whose rank
+        # within their group falls in either tail
+        rank = grouped.rank(method='first')
+        size = grouped.transform('size')
+        cut = np.floor(size * self.TRIM_PROPORTION)
+        trimmed = laps[(rank > cut) & (rank <= size - cut)]
+        trimmed_mean = trimmed.groupby(key)['LapTimeSeconds'].mean()
+
+        pace = pd.DataFrame({
+            'mean': grouped.mean(),
+            'median': grouped.median(),
+            'trimmed_mean': trimmed_mean
+        })
+        # Groups too small to trim fall back to their plain mean
+        pace['trimmed_mean'] = pace['trimmed_mean'].fillna(pace['mean'])
+        pace['laps'] = grouped.size()
+        return pace
+
+    def _trimmed_mean(self, values):
+        values = np.sort(values[~np.isnan(values)])
+        cut = int(len(values) * self.TRIM_PROPORTION)
+        if len(values) - 2 * cut <= 0:
+            return np.nan
+        return values[cut:len(values) - cut].mean()
+
+    def _nan_to_none(self, value):
+        return None if value is None or pd.isna(value) else float(value)
+
+    def driver_value(self, driver, metric='median'):
+        """Representative pace of a driver (by abbreviation)"""
+        if driver not in self.driver_pace.index:
+            return None
+        return self._nan_to_none(self.driver_pace.at[driver, metric])
+
+    def team_value(self, team, metric='median'):
+        if team not in self.team_pace.index:
+            return None
+        return self._nan_to_none(self.team_pace.at[team, metric])
+
+    def pace_delta(self, driver, metric='median'):
+        """Driver pace minus field pace for the chosen metric"""
+        driver_pace = self.driver_value(driver, metric)
+        if driver_pace is None or self.field_pace[metric] is None:
+            return None
+        return driver_pace - self.field_pace[metric]
+
+    def clean_air_delta(self, driver):
+        if driver not in self.driver_clean_air_pace.index or self.field_clean_air_pace is None:
+            return None
+        return self._nan_to_none(self.driver_clean_air_pace[driver] - self.field_clean_air_pace)
+
+    def driver_summary(self, driver, team=None):
+        """All pace figures for one driver, read from the precomputed tables"""
+        try:
+            summary = {
+                'driver_average': self.driver_value(driver, 'mean'),
+                'field_average': self.field_pace['mean'],
+                'pace_delta': self.pace_delta(driver, 'mean'),
+                'driver_median': self.driver_value(driver, 'median'),
+                'field_median': self.field_pace['median'],
+                'median_delta': self.pace_delta(driver, 'median'),
+                'trimmed_mean_delta': self.pace_delta(driver, 'trimmed_mean'),
+                'delta_to_lap_median': (
+                    self._nan_to_none(self.driver_lap_delta[driver])
+                    if driver in self.driver_lap_delta.index else None
+                ),
+                'clean_air_pace': (
+                    self._nan_to_none(self.driver_clean_air_pace[driver])
+                    if driver in self.driver_clean_air_pace.index else None
+                ),
+                'clean_air_delta': self.clean_air_delta(driver),
+                'representative_laps': (
+                    int(self.driver_pace.at[driver, 'laps'])
+                    if driver in self.driver_pace.index else 0
+                )
+            }
+            if team is not None:
+                team_pace = self.team_value(team, 'median')
+                summary['team_median'] = team_pace
+                summary['team_delta'] = (
+                    team_pace - self.field_pace['median']
+                    if team_pace is not None and self.field_pace['median'] is not None else None
+                )
+            return summary
+        except Exception as e:
+            logging.error(f"Error building pace summary for {driver}: {str(e)}")
+            return None
@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from config import DATA_DIR, SHARED_CACHE_PATH, SHARED_CACHE_URL
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single development server, which always leads
+    fcntl = None
+
+
+class SQLiteBackend:
+    """Shared cache in a local SQLite file, visible to every worker on the host"""
+
+    def __init__(self, path=SHARED_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS cache '
+                               '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)')
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            yield connection
+        finally:
+            connection.close()
+
+    def get(self, key):
+        with self._connect() as connection:
+            row = connection.execute('SELECT value FROM cache WHERE key = ? AND '
+                                     '(expires_at IS NULL OR expires_at > ?)', (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                               (key, value, expires_at))
+            if random.random() < 0.01:
+                connection.execute('DELETE FROM cache WHERE expires_at < ?', (time.time(),))
+
+    def add(self, key, value, ttl):
+        """Set ``key`` only if it is absent or expired; True if this call set it"""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute('DELETE FROM cache WHERE key = ? AND expires_at <= ?', (key, now))
+            added = connection.execute('INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                                       (key, value, now + ttl)).rowcount == 1
+            connection.execute('COMMIT')
+        return added
+
+    def delete(self, key):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def delete_if(self, key, value):
+        """Delete ``key`` only while it still holds ``value``"""
+        with self._connect() as connection:
+            connection.execute('DELETE FROM cache WHERE key = ? AND value = ?', (key, value))
+
+    def touch_if(self, key, value, ttl):
+        """Push back the expiry of ``key`` while it still holds ``value``; True if it did"""
+        with self._connect() as connection:
+            return connection.execute('UPDATE cache SET expires_at = ? WHERE key = ? AND value = ?',
+                                      (time.time() + ttl, key, value)).rowcount == 1
+
+    def incr(self, key):
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute("INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, '0', NULL)", (key,))
+            connection.execute('UPDATE cache SET value = CAST(value AS INTEGER) + 1 WHERE key = ?', (key,))
+            value = int(connection.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()[0])
+            connection.execute('COMMIT')
+        return value
+
+
+class RedisBackend:
+    """Shared cache in Redis, or any server speaking its protocol, for workers across hosts"""
+
+    # Compare-and-act scripts, atomic on the server
+    DELETE_IF = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+    TOUCH_IF = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('expire', KEYS[1], ARGV[2]) end return 0"
+
+    def __init__(self, url):
+        import redis  # Optional dependency, only needed when SHARED_CACHE_URL points at Redis
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.client.ping()
+        self._delete_if = self.client.register_script(self.DELETE_IF)
+        self._touch_if = self.client.register_script(self.TOUCH_IF)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, value, ex=int(ttl) if ttl else None)
+
+    def add(self, key, value, ttl):
+        return bool(self.client.set(key, value, ex=int(ttl), nx=True))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def delete_if(self, key, value):
+        self._delete_if(keys=[key], args=[value])
+
+    def touch_if(self, key, value, ttl):
+        return bool(self._touch_if(keys=[key], args=[value, int(ttl)]))
+
+    def incr(self, key):
+        return int(self.client.incr(key))
+
+
+class SharedCache:
+    """
+    Cross-process cache so that every worker reuses one computation.
+
+    Values are stored as JSON. Reads and writes are named so as not to clash
+    with LazyService.get when used through the service registry. get_or_compute takes a short lock per key,
+    so when several workers miss at once, one computes and the rest wait
+    for its result instead of repeating the fastf1 loads and feed fetches.
+    """
+
+    LOCK_TTL = 120        # Seconds a lock outlives its holder, e.g. a worker that died mid-compute
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, url=SHARED_CACHE_URL, path=SHARED_CACHE_PATH):
+        self.backend = None
+        if url:
+            try:
+                self.backend = RedisBackend(url)
+            except Exception as e:
+                logging.error(f"Error connecting to shared cache {url}, using SQLite instead: {str(e)}")
+        if self.backend is None:
+            self.backend = SQLiteBackend(path)
+
+    def read(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logging.error(f"Error reading shared cache key {key}: {str(e)}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def write(self, key, value, ttl=None):
+        try:
+            self.backend.set(key, json.dumps(value, default=str), ttl)
+        except Exception as e:
+            logging.error(f"Error writing shared cache key {key}: {str(e)}")
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """
+        The cached value of ``key``, computed by exactly one worker on a miss
+
+        The lock is owned by a token unique to this call and refreshed while
+        compute() runs, so however long it takes no other worker starts the
+        same computation, and only its owner can release it.
+
+        Args:
+            compute (callable): Builds the value; None results are not cached
+            ttl (float): Seconds to keep the value, forever if None
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.read(key)
+        if value is not None:
+            return value
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        while not self._try_lock(lock_key, token):
+            # Another worker is computing it; wait for its result rather than repeat the work.
+            # Its lock only lapses if that worker dies, and then this one takes over.
+            time.sleep(self.POLL_INTERVAL)
+            value = self.read(key)
+            if value is not None:
+                return value
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._hold, args=(lock_key, token, done),
+                                     name=f"lock-{key}", daemon=True)
+        heartbeat.start()
+        try:
+            value = self.read(key)  # Filled in while this worker waited for the lock
+            if value is None:
+                value = compute()
+                if value is not None:
+                    self.write(key, value, ttl)
+            return value
+        finally:
+            done.set()
+            self._release(lock_key, token)
+
+    def _try_lock(self, lock_key, token):
+        try:
+            return self.backend.add(lock_key, token, self.LOCK_TTL)
+        except Exception as e:
+            logging.error(f"Error taking shared cache lock {lock_key}: {str(e)}")
+            return True  # Compute locally rather than fail the request
+
+    def _hold(self, lock_key, token, done):
+        """Refresh a lock until ``done`` is set, so a long computation keeps it"""
+        while not done.wait(self.LOCK_TTL / 3):
+            try:
+                if not self.backend.touch_if(lock_key, token, self.LOCK_TTL):
+                    return
+            except Exception as e:
+                logging.error(f"Error refreshing shared cache lock {lock_key}: {str(e)}")
+
+    def _release(self, lock_key, token):
+        try:
+            self.backend.delete_if(lock_key, token)
+        except Exception as e:
+            logging.error(f"Error releasing shared cache lock {lock_key}: {str(e)}")
+
+    def generation(self, name):
+        """Current value of a counter that workers compare to spot new data"""
+        value = self.read(f"generation:{name}")
+        return int(value) if value is not None else 0
+
+    def bump(self, name):
+        """Advance a generation counter, so every worker drops what it derived from the old data"""
+        try:
+            return self.backend.incr(f"generation:{name}")
+        except Exception as e:
+            logging.error(f"Error bumping generation {name}: {str(e)}")
+            return None
+
+
+def lead(name, action, retry_interval=60, lock_dir=DATA_DIR):
+    """
+    Run ``action`` in exactly one process on this host, e.g. one gunicorn worker.
+
+    The process that takes the lock file runs ``action`` and holds the lock
+    until it exits. The others keep retrying in a background thread, so
+    another worker takes over if the leader dies.
+    """
+    if fcntl is None:
+        action()
+        return
+
+    os.makedirs(lock_dir, exist_ok=True)
+    path = os.path.join(lock_dir, f"{name}.lock")
+
+    def run():
+        handle = open(path, 'w')
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                time.sleep(retry_interval)
+                continue
+            handle.write(str(os.getpid()))
+            handle.flush()
+            logging.info(f"Process {os.getpid()} leads {name}")
+            action()
+            return  # The handle stays open, so this process keeps the lock
+
+    threading.Thread(target=run, name=f"lead-{name}", daemon=True).start()
@@ -0,0 +1,213 @@
+import numpy as np
+import logging
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from .championship_calculator import ChampionshipCalculator
+
+
+class StandingsHistory:
+    """
+    Cumulative championship standings after every round of a season.
+
+    Each season is held as (rounds x entries) arrays of cumulative points,
+    wins and positions for drivers and constructors. New rounds are appended
+    from that round's race and sprint results only, so charts are served from
+    memory and upstream is only asked for rounds that have not been seen yet.
+    """
+
+    KINDS = ('drivers', 'constructors')
+
+    def __init__(self, calculator=None, max_workers=4):
+        self.calculator = calculator or ChampionshipCalculator()
+        self.max_workers = max_workers
+        self.seasons = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _empty_table():
+        return {
+            'ids': [],
+            'names': [],
+            'teams': [],
+            'points': np.zeros((0, 0)),
+            'wins': np.zeros((0, 0)),
+            'positions': np.zeros((0, 0), dtype=np.int16)
+        }
+
+    def _empty_season(self, season):
+        return {
+            'season': int(season),
+            'rounds': [],
+            'race_names': [],
+            'complete': False,
+            'drivers': self._empty_table(),
+            'constructors': self._empty_table()
+        }
+
+    def update(self, season):
+        """
+        Append any completed rounds that are not stored yet
+
+        Args:
+            season (int): Season year
+
+        Returns:
+            dict: The season's history, or None if nothing could be loaded
+        """
+        with self._lock:
+            history = self.seasons.get(season) or self._empty_season(season)
+            if history['complete']:
+                return history
+
+            try:
+                completed = self.calculator.get_completed_round(season)
+                stored = history['rounds'][-1] if history['rounds'] else 0
+                if completed > stored:
+                    schedule = {int(race['round']): race for race in self.calculator.get_schedule(season)}
+                    new_rounds = [r for r in range(stored + 1, completed + 1) if r in schedule]
+
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                        results = executor.map(
+                            lambda r: self.calculator.get_round_results(season, r, 'Sprint' in schedule[r]),
+                            new_rounds
+                        )
+                        for race_round, (race_results, sprint_results) in zip(new_rounds, results):
+                            self._append_round(history, race_round, schedule[race_round]['raceName'],
+                                               race_results, sprint_results)
+
+                    history['complete'] = (
+                        int(season) < datetime.now(timezone.utc).year and completed == max(schedule)
+                    )
+            except Exception as e:
+                logging.error(f"Error updating standings history for {season}: {e}")
+
+            if not history['rounds']:
+                return None
+            self.seasons[season] = history
+            return history
+
+    def _append_round(self, history, race_round, race_name, race_results, sprint_results):
+        """Add one round's race and sprint points to the cumulative arrays"""
+        driver_gains, constructor_gains = {}, {}
+        driver_wins, constructor_wins = {}, {}
+        drivers, constructors = history['drivers'], history['constructors']
+
+        for n, result in enumerate(race_results + sprint_results):
+            driver_id = result['Driver']['driverId']
+            team_id = result['Constructor']['constructorId']
+            points = float(result.get('points', 0))
+            won = 1 if n < len(race_results) and result.get('position') == '1' else 0
+
+            self._register(drivers, driver_id,
+                           result['Driver']['givenName'] + ' ' + result['Driver']['familyName'],
+                           result['Constructor']['name'])
+            self._register(constructors, team_id, result['Constructor']['name'], result['Constructor']['name'])
+
+            driver_gains[driver_id] = driver_gains.get(driver_id, 0) + points
+            constructor_gains[team_id] = constructor_gains.get(team_id, 0) + points
+            driver_wins[driver_id] = driver_wins.get(driver_id, 0) + won
+            constructor_wins[team_id] = constructor_wins.get(team_id, 0) + won
+
+        for table, gains, wins in ((drivers, driver_gains, driver_wins),
+                                   (constructors, constructor_gains, constructor_wins)):
+            index = {entry_id: i for i, entry_id in enumerate(table['ids'])}
+            gain_row = np.zeros(len(table['ids']))
+            win_row = np.zeros(len(table['ids']))
+            for entry_id, points in gains.items():
+                gain_row[index[entry_id]] = points
+                win_row[index[entry_id]] = wins[entry_id]
+
+            previous_points = table['points'][-1] if len(table['points']) else np.zeros(len(table['ids']))
+            previous_wins = table['wins'][-1] if len(table['wins']) else np.zeros(len(table['ids']))
+            points_row = previous_points + gain_row
+            wins_row = previous_wins + win_row
+
+            # Rank on points, then wins as the first countback tie-breaker
+            order = np.lexsort((-wins_row, -points_row))
+            position_row = np.empty(len(order), dtype=np.int16)
+            position_row[order] = np.arange(1, len(order) + 1)
+
+            table['points'] = np.vstack([table['points'], points_row])
+            table['wins'] = np.vstack([table['wins'], wins_row])
+            table['positions'] = np.vstack([table['positions'], position_row])
+
+        history['rounds'].append(race_round)
+        history['race_names'].append(race_name)
+
+    def _register(self, table, entry_id, name, team):
+        """Add a column for an entry seen for the first time, zero for earlier rounds"""
+        if entry_id in table['ids']:
+            table['teams'][table['ids'].index(entry_id)] = team
+            return
+        table['ids'].append(entry_id)
+        table['names'].append(name)
+        table['teams'].append(team)
+        rounds = len(table['points'])
+        table['points'] = np.hstack([table['points'], np.zeros((rounds, 1))])
+        table['wins'] = np.hstack([table['wins'], np.zeros((rounds, 1))])
+        # Entries joining mid-season start at the back for the rounds they missed
+        table['positions'] = np.hstack([
+            table['positions'], np.full((rounds, 1), len(table['ids']), dtype=np.int16)
+        ])
+
+    def get_progression(self, season, kind='drivers'):
+        """
+        Cumulative points and championship position after every round
+
+        Args:
+            season (int): Season year
+            kind (str): 'drivers' or 'constructors'
+
+        Returns:
+            dict: Rounds and one series per entry, ordered by latest position
+        """
+        history = self.update(season)
+        if history is None or kind not in self.KINDS:
+            return None
+
+        table = history[kind]
+        order = np.argsort(table['positions'][-1])
+        return {
+            'season': history['season'],
+            'type': kind,
+            'rounds': self._round_labels(history),
+            'entries': [{
+                'id': table['ids'][i],
+                'name': table['names'][i],
+                'team': table['teams'][i],
+                'points': table['points'][:, i].tolist(),
+                'positions': table['positions'][:, i].tolist()
+            } for i in order]
+        }
+
+    def get_gap_to_leader(self, season, kind='drivers'):
+        """
+        Points gap to the championship leader after every round
+
+        Returns:
+            dict: Rounds, the leader after each round and one gap series per entry
+        """
+        history = self.update(season)
+        if history is None or kind not in self.KINDS:
+            return None
+
+        table = history[kind]
+        leaders = np.argmin(table['positions'], axis=1)
+        gaps = table['points'].max(axis=1, keepdims=True) - table['points']
+        order = np.argsort(table['positions'][-1])
+        return {
+            'season': history['season'],
+            'type': kind,
+            'rounds': self._round_labels(history),
+            'leaders': [table['names'][i] for i in leaders],
+            'entries': [{
+                'id': table['ids'][i],
+                'name': table['names'][i],
+                'team': table['teams'][i],
+                'gaps': gaps[:, i].tolist()
+            } for i in order]
+        }
+
+    def _round_labels(self, history):
+        return [{'round': r, 'name': name} for r, name in zip(history['rounds'], history['race_names'])]
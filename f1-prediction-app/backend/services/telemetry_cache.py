@@ -0,0 +1,161 @@
+import numpy as np
+import json
+import logging
+import os
+import re
+import threading
+from config import TELEMETRY_CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single development server, so the thread lock is enough
+    fcntl = None
+
+# Fixed on-disk layout of one lap of telemetry, one record per sample
+TELEMETRY_DTYPE = np.dtype([
+    ('Time', '<f4'),      # Seconds since the start of the lap
+    ('Distance', '<f4'),  # Metres since the start of the lap
+    ('Speed', '<f4'),     # km/h
+    ('Throttle', '<f4'),  # 0-100 %
+    ('Brake', 'u1'),      # 0/1
+    ('nGear', 'i1'),
+    ('RPM', '<f4')
+])
+
+
+class TelemetryCache:
+    """Local cache of per-lap telemetry stored as memory-mapped NumPy arrays.
+
+    Each (year, round, session, driver, lap) is one ``.npy`` file holding a
+    structured array of ``TELEMETRY_DTYPE``. Reads are memory-mapped, so
+    ``cache.get(...)['Speed']`` is a zero-copy view of the file. An index file
+    maps keys to files and records per-session driver metadata, so a cached
+    session can be analyzed without loading it through fastf1. A session's
+    laps are added to the index in one update, under a file lock shared by
+    every process using the cache.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir=TELEMETRY_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_mtime = None
+
+    def get(self, year, grand_prix, session_type, driver, lap_number):
+        """Memory-map one lap of telemetry, or None if it is not cached"""
+        key = self.lap_key(year, grand_prix, session_type, driver, lap_number)
+        entry = self._read_index()['laps'].get(key)
+        if entry is None:
+            return None
+        try:
+            return np.load(os.path.join(self.cache_dir, entry['file']), mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reading cached telemetry {key}: {str(e)}")
+            return None
+
+    def put(self, year, grand_prix, session_type, driver, lap_number, channels):
+        """Store one lap of telemetry given a dict of channel arrays"""
+        key, entry = self._write_lap(year, grand_prix, session_type, driver, lap_number, channels)
+        self._update_index(lambda index: index['laps'].__setitem__(key, entry))
+
+    def _write_lap(self, year, grand_prix, session_type, driver, lap_number, channels):
+        """Write one lap's file, returning its index key and entry"""
+        samples = len(channels['Time'])
+        records = np.empty(samples, dtype=TELEMETRY_DTYPE)
+        for name in TELEMETRY_DTYPE.names:
+            records[name] = channels[name]
+
+        key = self.lap_key(year, grand_prix, session_type, driver, lap_number)
+        file_name = re.sub(r'[^A-Za-z0-9_.-]', '_', key.replace('/', '_')) + '.npy'
+        path = os.path.join(self.cache_dir, file_name)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, records)
+        os.replace(tmp_path, path)
+        return key, {'file': file_name, 'samples': samples}
+
+    def get_session(self, year, grand_prix, session_type):
+        """Per-driver metadata recorded for a fully cached session"""
+        return self._read_index()['sessions'].get(self.session_key(year, grand_prix, session_type))
+
+    def put_session(self, year, grand_prix, session_type, drivers, telemetry=None):
+        """
+        Record a session as fully cached along with its per-driver metadata
+
+        Args:
+            drivers (dict): Metadata by driver, each with the 'lap_number' it describes
+            telemetry (dict): Channel arrays by driver, stored for those laps in
+                              the same index update
+        """
+        laps = dict(
+            self._write_lap(year, grand_prix, session_type, driver, drivers[driver]['lap_number'], channels)
+            for driver, channels in (telemetry or {}).items()
+        )
+        key = self.session_key(year, grand_prix, session_type)
+
+        def update(index):
+            index['laps'].update(laps)
+            index['sessions'][key] = {'drivers': drivers}
+        self._update_index(update)
+
+    def get_session_telemetry(self, year, grand_prix, session_type):
+        """Memory-map the fastest lap of every driver in a cached session"""
+        session = self.get_session(year, grand_prix, session_type)
+        if session is None:
+            return None
+
+        telemetry = {}
+        for driver, meta in session['drivers'].items():
+            records = self.get(year, grand_prix, session_type, driver, meta['lap_number'])
+            if records is None:
+                return None
+            telemetry[driver] = records
+        return telemetry
+
+    @staticmethod
+    def session_key(year, grand_prix, session_type):
+        return f"{year}/{grand_prix}/{session_type}"
+
+    @classmethod
+    def lap_key(cls, year, grand_prix, session_type, driver, lap_number):
+        return f"{cls.session_key(year, grand_prix, session_type)}/{driver}/{int(lap_number)}"
+
+    def _read_index(self):
+        """Load the index, re-reading it only when another writer changed it"""
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            mtime = None
+
+        if self._index is None or mtime != self._index_mtime:
+            index = {'laps': {}, 'sessions': {}}
+            if mtime is not None:
+                try:
+                    with open(self.index_path, 'r') as f:
+                        index = json.load(f)
+                except (OSError, ValueError) as e:
+                    logging.error(f"Error reading telemetry cache index: {str(e)}")
+            self._index = index
+            self._index_mtime = mtime
+        return self._index
+
+    def _update_index(self, update):
+        """Apply ``update`` to the index and replace the file, one writer at a time"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock, open(f"{self.index_path}.lock", 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._index = None
+            index = self._read_index()
+            update(index)
+
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+            self._index_mtime = os.path.getmtime(self.index_path)
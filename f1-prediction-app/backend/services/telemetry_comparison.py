@@ -0,0 +1,146 @@
+import numpy as np
+import logging
+from .car_performance_analyzer import CarPerformanceAnalyzer
+
+
+class TelemetryComparison:
+    """Distance-aligned fastest-lap comparisons built on cached telemetry"""
+
+    GRID_STEP = 5.0  # Metres between samples of the common distance grid
+    MINI_SECTORS = 25
+
+    def __init__(self, performance_analyzer=None):
+        self.performance_analyzer = performance_analyzer or CarPerformanceAnalyzer()
+        self.comparison_cache = {}
+        self.dominance_cache = {}
+
+    def invalidate(self):
+        """Drop built comparisons, so sessions whose data changed are compared afresh"""
+        self.comparison_cache = {}
+        self.dominance_cache = {}
+
+    def compare_drivers(self, year, grand_prix, session_type, driver_a, driver_b):
+        """
+        Overlay two drivers' fastest laps on a common distance grid
+
+        Args:
+            year (int): Season year
+            grand_prix (str/int): GP round number or name
+            session_type (str): Session identifier, e.g. 'Q' or 'R'
+            driver_a, driver_b (str): Abbreviation, number or last name
+
+        Returns:
+            dict: Speed, throttle and brake traces, running time delta and the
+                  field's mini-sector dominance map
+        """
+        cache_key = f"{year}_{grand_prix}_{session_type}_{driver_a.upper()}_{driver_b.upper()}"
+        if cache_key in self.comparison_cache:
+            return self.comparison_cache[cache_key]
+
+        try:
+            telemetry, drivers = self.performance_analyzer.get_fastest_lap_telemetry(
+                year, grand_prix, session_type
+            )
+            if telemetry is None:
+                return None
+
+            key_a = self._resolve_driver(drivers, driver_a)
+            key_b = self._resolve_driver(drivers, driver_b)
+            if key_a is None or key_b is None:
+                logging.error(f"Drivers {driver_a}/{driver_b} not found in {year} {grand_prix} {session_type}")
+                return None
+
+            lap_a, lap_b = telemetry[key_a], telemetry[key_b]
+            end = min(lap_a['Distance'][-1], lap_b['Distance'][-1])
+            grid = np.arange(0.0, float(end), self.GRID_STEP)
+
+            traces = {}
+            for key, lap in ((key_a, lap_a), (key_b, lap_b)):
+                traces[drivers[key]['abbreviation']] = {
+                    'driver': drivers[key]['full_name'],
+                    'team': drivers[key]['team'],
+                    'lap_number': drivers[key]['lap_number'],
+                    'speed': self._align(grid, lap, 'Speed').round(1).tolist(),
+                    'throttle': self._align(grid, lap, 'Throttle').round(1).tolist(),
+                    'brake': (self._align(grid, lap, 'Brake') >= 0.5).tolist()
+                }
+
+            # Positive delta: driver B is behind driver A at that distance
+            time_delta = self._align(grid, lap_b, 'Time') - self._align(grid, lap_a, 'Time')
+
+            comparison = {
+                'year': year,
+                'round': grand_prix,
+                'session': session_type,
+                'drivers': [drivers[key_a]['abbreviation'], drivers[key_b]['abbreviation']],
+                'distance': grid.round(1).tolist(),
+                'traces': traces,
+                'time_delta': time_delta.round(3).tolist(),
+                'mini_sectors': self.get_mini_sector_dominance(year, grand_prix, session_type)
+            }
+
+            self.comparison_cache[cache_key] = comparison
+            return comparison
+
+        except Exception as e:
+            logging.error(f"Error comparing telemetry for {driver_a} and {driver_b}: {str(e)}")
+            return None
+
+    def get_mini_sector_dominance(self, year, grand_prix, session_type):
+        """Fastest driver through each equal-length mini-sector of the lap"""
+        cache_key = f"{year}_{grand_prix}_{session_type}"
+        if cache_key in self.dominance_cache:
+            return self.dominance_cache[cache_key]
+
+        telemetry, drivers = self.performance_analyzer.get_fastest_lap_telemetry(
+            year, grand_prix, session_type
+        )
+        if not telemetry:
+            return None
+
+        keys = list(telemetry.keys())
+        end = min(float(telemetry[key]['Distance'][-1]) for key in keys)
+        boundaries = np.linspace(0.0, end, self.MINI_SECTORS + 1)
+
+        # drivers x boundaries matrix of elapsed time, then per-sector durations
+        elapsed = np.vstack([self._align(boundaries, telemetry[key], 'Time') for key in keys])
+        durations = np.diff(elapsed, axis=1)
+        fastest = np.argmin(durations, axis=0)
+        margin = np.sort(durations, axis=0)[1] - durations.min(axis=0) if len(keys) > 1 else np.zeros(self.MINI_SECTORS)
+
+        sectors = [{
+            'mini_sector': i + 1,
+            'start': round(float(boundaries[i]), 1),
+            'end': round(float(boundaries[i + 1]), 1),
+            'driver': drivers[keys[fastest[i]]]['abbreviation'],
+            'team': drivers[keys[fastest[i]]]['team'],
+            'time': round(float(durations[fastest[i], i]), 3),
+            'margin': round(float(margin[i]), 3)
+        } for i in range(self.MINI_SECTORS)]
+
+        team_counts = {}
+        for sector in sectors:
+            team_counts[sector['team']] = team_counts.get(sector['team'], 0) + 1
+
+        dominance = {
+            'sectors': sectors,
+            'team_counts': team_counts
+        }
+        self.dominance_cache[cache_key] = dominance
+        return dominance
+
+    def _align(self, grid, lap, channel):
+        """Linearly interpolate a channel onto the distance grid"""
+        return np.interp(grid, lap['Distance'], np.asarray(lap[channel], dtype=float))
+
+    def _resolve_driver(self, drivers, driver):
+        """Match a driver by number, abbreviation or last name"""
+        if driver in drivers:
+            return driver
+
+        driver = driver.lower()
+        for key, meta in drivers.items():
+            if (meta['abbreviation'].lower() == driver or
+                    meta['full_name'].lower().split()[-1] == driver.split()[-1]):
+                return key
+        return None
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.championship_calculator import ChampionshipCalculator
+
+
+def season_data(rounds, last_round):
+    now = datetime.now(timezone.utc)
+    races = [{
+        'round': str(race_round),
+        'date': (now - timedelta(days=7 * (rounds - race_round) + 1)).strftime('%Y-%m-%d'),
+        'time': '12:00:00Z'
+    } for race_round in range(1, rounds + 1)]
+    return {
+        'season': {'MRData': {'RaceTable': {'season': str(now.year), 'Races': races}}},
+        'last_race': {'MRData': {'RaceTable': {'round': str(last_round), 'Races': []}}}
+    }
+
+
+@pytest.fixture
+def calculator(monkeypatch):
+    monkeypatch.setattr(ChampionshipCalculator, '_cache', None)
+    monkeypatch.setattr(ChampionshipCalculator, '_fetching', False)
+    return ChampionshipCalculator()
+
+
+def behind_cache(fetched_ago):
+    # Three rounds are past their results lag, but only two are in the cache
+    return {
+        'data': season_data(3, 2),
+        'round': 2,
+        'sprints': 0,
+        'fetched_at': datetime.now(timezone.utc) - fetched_ago
+    }
+
+
+def failing_fetch(calls):
+    def fetch_all():
+        calls.append(datetime.now(timezone.utc))
+        raise TimeoutError('Ergast is down')
+    return fetch_all
+
+
+def test_failed_fetch_is_retried_on_the_interval_while_behind(calculator, monkeypatch):
+    cache = behind_cache(ChampionshipCalculator.RETRY_INTERVAL * 2)
+    monkeypatch.setattr(ChampionshipCalculator, '_cache', cache)
+    calls = []
+    monkeypatch.setattr(calculator, '_fetch_all', failing_fetch(calls))
+
+    for _ in range(5):
+        assert calculator.get_season_data() is cache['data']
+    assert len(calls) == 1
+    assert 'failed_at' in cache
+
+    # Once the interval has passed since the failure, the next read tries again
+    cache['failed_at'] -= ChampionshipCalculator.RETRY_INTERVAL
+    calculator.get_season_data()
+    assert len(calls) == 2
+
+
+def test_failed_fetch_after_invalidation_is_throttled(calculator, monkeypatch):
+    cache = behind_cache(timedelta(0))
+    monkeypatch.setattr(ChampionshipCalculator, '_cache', cache)
+    calls = []
+    monkeypatch.setattr(calculator, '_fetch_all', failing_fetch(calls))
+
+    ChampionshipCalculator.invalidate()
+    for _ in range(3):
+        assert calculator.get_season_data() is cache['data']
+    assert len(calls) == 1
+
+
+def test_successful_fetch_replaces_the_cache(calculator, monkeypatch):
+    monkeypatch.setattr(ChampionshipCalculator, '_cache', behind_cache(ChampionshipCalculator.RETRY_INTERVAL * 2))
+    fresh = season_data(3, 3)
+    monkeypatch.setattr(calculator, '_fetch_all', lambda: fresh)
+
+    assert calculator.get_season_data() is fresh
+    assert ChampionshipCalculator._cache['round'] == 3
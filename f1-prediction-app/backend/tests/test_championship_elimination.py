@@ -0,0 +1,115 @@
+from itertools import permutations, product
+
+import pytest
+
+from services.championship_elimination import EliminationSolver
+from services.points_system import RACE_POINTS
+
+
+def brute_force_can_win(points, index, rounds, active=None):
+    """Try every finishing order of the active drivers in every remaining race"""
+    active = list(range(len(points))) if active is None else sorted(active)
+    orders = list(permutations(active))
+    for weekend in product(orders, repeat=rounds):
+        totals = list(points)
+        for order in weekend:
+            for position, driver in enumerate(order[:len(RACE_POINTS)]):
+                totals[driver] += RACE_POINTS[position]
+        if totals[index] >= max(totals):
+            return True
+    return False
+
+
+def races(count, first_round=20):
+    return [{'round': first_round + i, 'sprint': False} for i in range(count)]
+
+
+def test_leader_out_of_reach_is_sole_contender():
+    solver = EliminationSolver(2025, races(1))
+    assert solver.contenders([100, 70, 60]) == [0]
+
+
+def test_rival_within_one_race_win_can_still_win():
+    # In a field of three the leader scores at least 15 for P3
+    solver = EliminationSolver(2025, races(1))
+    assert solver.contenders([100, 90, 40]) == [0, 1]
+    assert solver.contenders([100, 89, 40]) == [0]
+
+
+def test_tie_on_points_counts_as_possible():
+    solver = EliminationSolver(2025, races(1))
+    assert solver.can_win([100, 93], 1)
+    assert not solver.can_win([100, 92], 1)
+
+
+def test_rivals_taking_points_off_each_other():
+    # The third driver can only win if both leaders score almost nothing in
+    # the same race, but one of them must take P2 behind them
+    solver = EliminationSolver(2025, races(1))
+    assert not solver.can_win([100, 100, 80], 2)
+
+
+@pytest.mark.parametrize('points', [
+    [60, 50, 45, 30],
+    [80, 62, 61, 40],
+    [50, 49, 20, 18],
+    [100, 90, 85, 60],
+])
+@pytest.mark.parametrize('rounds', [1, 2])
+def test_matches_brute_force(points, rounds):
+    solver = EliminationSolver(2025, races(rounds))
+    expected = [i for i in range(len(points)) if brute_force_can_win(points, i, rounds)]
+    assert solver.contenders(points) == expected
+
+
+@pytest.mark.parametrize('points', [
+    [60, 50, 45, 30],
+    [80, 62, 61, 40],
+    [50, 49, 20, 18],
+])
+def test_inactive_entries_take_no_places(points):
+    solver = EliminationSolver(2025, races(2))
+    active = {0, 1, 2}
+    expected = [i for i in range(len(points)) if brute_force_can_win(points, i, 2, active)]
+    assert solver.contenders(points, active=active) == expected
+
+
+def test_inactive_driver_cannot_catch_up():
+    solver = EliminationSolver(2025, races(1))
+    assert solver.contenders([100, 90, 20], active={0, 2}) == [0]
+
+
+def test_constructors_take_two_places_per_session():
+    solver = EliminationSolver(2025, races(1))
+    # A one-two for the second team against P5 and P6 for the leader: 43 against 18
+    assert solver.contenders([200, 175, 100], cars=2) == [0, 1]
+    assert solver.contenders([200, 174, 100], cars=2) == [0]
+
+
+FIELD = list('ABCDEFGHIJKL')
+
+
+def test_clinched_title_has_no_conditions():
+    solver = EliminationSolver(2025, races(2))
+    scenario = solver.clinch_scenarios(FIELD, [200, 100, 90] + [0] * 9)
+    assert scenario['clinched']
+    assert scenario['round'] == 20
+    assert scenario['conditions'] == []
+
+
+def test_clinch_conditions_name_the_threatening_rival():
+    solver = EliminationSolver(2025, races(2))
+    scenario = solver.clinch_scenarios(FIELD, [100, 80, 20] + [0] * 9)
+    assert not scenario['clinched']
+    assert scenario['leader'] == 'A'
+    # B trails by 20 with 25 available after the next round, so A must outscore B by 6
+    assert scenario['must_outscore'] == [{'rival': 'B', 'points': 6}]
+    assert scenario['conditions'][0] == {'leader_finish': 'P1 or better', 'requires': []}
+    assert scenario['conditions'][1] == {'leader_finish': 'P2 or better', 'requires': ['B finishes P4 or lower']}
+
+
+def test_clinch_scenarios_ignore_rivals_without_a_seat():
+    solver = EliminationSolver(2025, races(2))
+    active = set(range(12)) - {1}
+    scenario = solver.clinch_scenarios(FIELD, [100, 80, 20] + [0] * 9, active=active)
+    assert scenario['clinched']
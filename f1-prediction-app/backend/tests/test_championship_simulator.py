@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from services.championship_simulator import simulate_seasons
+from services.points_system import RACE_POINTS, points_table
+
+
+def run(race_cdf, base_points, n_races=1, field=None, n_seasons=20000, driver_teams=None):
+    n_drivers = len(base_points)
+    n_field = len(race_cdf)
+    driver_teams = np.zeros(n_drivers, dtype=int) if driver_teams is None else np.asarray(driver_teams)
+    return simulate_seasons(
+        np.random.SeedSequence(7), n_seasons, np.asarray(race_cdf, dtype=float), np.zeros(n_races, dtype=bool),
+        np.asarray(base_points, dtype=float), driver_teams, np.zeros(driver_teams.max() + 1),
+        points_table(RACE_POINTS, n_field), points_table((), n_field), 0, field
+    )
+
+
+def test_drivers_outside_the_field_keep_their_points_and_take_no_places():
+    # Bins are P1, P2 and not classified; the second driver has no seat
+    cdf = [[1.0, 1.0, 1.0], [0.0, 1.0, 1.0]]
+    titles, _, points, _ = run(cdf, [100, 110, 80], field=[0, 2], n_seasons=1000)
+    assert points.tolist() == [125 * 1000, 110 * 1000, 98 * 1000]
+    assert titles.tolist() == [1000, 0, 0]
+
+
+def test_finishing_bins_follow_each_drivers_distribution():
+    # The first driver wins 30% of races and retires 20% of the time
+    cdf = [[0.3, 0.8, 1.0], [0.5, 1.0, 1.0]]
+    n_seasons = 200000
+    _, _, points, _ = run(cdf, [0, 0], n_seasons=n_seasons)
+    first = points[0] / n_seasons
+    # P1 always when ahead on bins; level on P1 or P2 half the time
+    p_first_ahead = 0.3 * 0.5 + 0.3 * 0.5 * 0.5 + 0.5 * 0.5 * 0.5
+    expected = 25 * p_first_ahead + 18 * (0.8 - p_first_ahead)
+    assert first == pytest.approx(expected, abs=0.1)
+
+
+def test_team_totals_only_count_field_drivers():
+    cdf = [[1.0, 1.0, 1.0], [0.0, 1.0, 1.0]]
+    _, team_titles, _, team_points = run(cdf, [0, 0, 0], field=[0, 1], n_seasons=100, driver_teams=[0, 1, 1])
+    assert team_points.tolist() == [2500, 1800]
+    assert team_titles.tolist() == [100, 0]
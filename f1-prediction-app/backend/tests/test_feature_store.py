@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from ml.feature_store import FeatureStore, FORM_FEATURES
+
+DRIVERS = {'AAA': 'Alpha', 'BBB': 'Alpha', 'CCC': 'Beta', 'DDD': 'Beta', 'EEE': 'Gamma'}
+TRACKS = ['Bahrain', 'Jeddah', 'Melbourne']
+POINTS = [25, 18, 15, 12, 10]
+
+
+def season_results(seed=0, seasons=(2023, 2024), rounds=6):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for year in seasons:
+        for race_round in range(1, rounds + 1):
+            order = rng.permutation(list(DRIVERS))
+            for position, driver in enumerate(order, start=1):
+                retired = rng.random() < 0.15
+                rows.append({
+                    'Year': year,
+                    'RoundNumber': race_round,
+                    'Abbreviation': driver,
+                    'TeamName': DRIVERS[driver],
+                    'Track': TRACKS[race_round % len(TRACKS)],
+                    'Position': position,
+                    'Points': POINTS[position - 1],
+                    'Status': 'Accident' if retired else ('Finished' if position < 4 else '+1 Lap')
+                })
+    return pd.DataFrame(rows)
+
+
+def states(store):
+    return (store.states.sort_values(['Seq', 'Abbreviation'])
+            .reset_index(drop=True).astype({'Seq': int, 'Year': int, 'RoundNumber': int}))
+
+
+def test_incremental_build_matches_full_build(tmp_path):
+    results = season_results()
+    full = FeatureStore(path=str(tmp_path / 'full.parquet'))
+    full.append(results)
+
+    incremental = FeatureStore(path=str(tmp_path / 'incremental.parquet'))
+    for _, race in results.groupby(['Year', 'RoundNumber']):
+        incremental.append(race)
+
+    pd.testing.assert_frame_equal(states(incremental), states(full), check_dtype=False)
+
+
+def test_late_round_rebuilds_later_states(tmp_path):
+    results = season_results(seed=1)
+    full = FeatureStore(path=str(tmp_path / 'full.parquet'))
+    full.append(results)
+
+    late = (results['Year'] == 2024) & (results['RoundNumber'] == 2)
+    store = FeatureStore(path=str(tmp_path / 'late.parquet'))
+    store.append(results[~late])
+    assert store.append(results[late]) == 1
+
+    pd.testing.assert_frame_equal(states(store), states(full), check_dtype=False)
+
+
+def test_append_is_idempotent_and_persisted(tmp_path):
+    path = str(tmp_path / 'store.parquet')
+    results = season_results(seed=2)
+    store = FeatureStore(path=path)
+    assert store.append(results) == 12
+    assert store.append(results) == 0
+
+    reloaded = FeatureStore(path=path)
+    pd.testing.assert_frame_equal(states(reloaded), states(store), check_dtype=False)
+
+
+def test_attach_reads_only_earlier_rounds(tmp_path):
+    results = season_results(seed=3, seasons=(2024,), rounds=3)
+    store = FeatureStore(path=str(tmp_path / 'store.parquet'))
+    store.append(results)
+
+    rows = results[['Year', 'RoundNumber', 'Abbreviation', 'TeamName', 'Track']]
+    attached = store.attach(rows)
+    assert list(attached.columns) == list(rows.columns) + FORM_FEATURES
+
+    first = attached[attached['RoundNumber'] == 1]
+    assert first[FORM_FEATURES].isna().all().all()
+
+    # Round 3 sees the mean finish of rounds 1 and 2, never its own result
+    driver = 'AAA'
+    earlier = results[(results['Abbreviation'] == driver) & (results['RoundNumber'] < 3)]
+    third = attached[(attached['Abbreviation'] == driver) & (attached['RoundNumber'] == 3)]
+    assert third['FormFinish'].iloc[0] == pytest.approx(earlier['Position'].mean())
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from services.ingestion_scheduler import IngestionScheduler
+
+NOW = datetime(2025, 6, 2, 12, tzinfo=timezone.utc)
+
+
+class FakeCalendar:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def get_session_schedule(self, year=None):
+        return self.sessions
+
+    def invalidate(self):
+        pass
+
+
+def session(name, start, race_round=9):
+    return {'year': 2025, 'round': race_round, 'event': 'Test Grand Prix', 'session': name, 'start': start}
+
+
+def test_restart_replans_sessions_still_waiting_for_data():
+    sessions = [
+        session('FP1', NOW - timedelta(days=4)),
+        session('Q', NOW - timedelta(days=1)),
+        session('R', NOW - timedelta(hours=5)),
+        session('FP1', NOW + timedelta(days=5), race_round=10),
+    ]
+    scheduler = IngestionScheduler(FakeCalendar(sessions), probe=lambda *args: True)
+    scheduler.plan(now=NOW)
+
+    assert set(scheduler.jobs) == {'2025_9_Q', '2025_9_R', '2025_10_FP1'}
+    # Sessions whose data should already be out are checked straight away
+    assert scheduler.jobs['2025_9_Q']['due'] == NOW
+    assert scheduler.jobs['2025_9_R']['due'] == NOW
+    upcoming = scheduler.jobs['2025_10_FP1']
+    assert upcoming['due'] == upcoming['available_at'] > NOW
+
+
+def test_replanned_session_notifies_subscribers_once_probed():
+    landed = []
+    scheduler = IngestionScheduler(FakeCalendar([session('R', NOW - timedelta(hours=5))]),
+                                   probe=lambda *args: True)
+    scheduler.subscribe(landed.append, session_types=['R'])
+    scheduler.plan(now=NOW)
+
+    scheduler._run_job(scheduler.jobs['2025_9_R'])
+    assert [job['session'] for job in landed] == ['R']
+    assert scheduler.jobs['2025_9_R']['state'] == 'landed'
+
+
+def test_session_is_settled_once_the_scheduler_stops_probing_for_it():
+    scheduler = IngestionScheduler(FakeCalendar([session('Q', NOW - timedelta(days=1)),
+                                                 session('R', NOW - timedelta(days=3), race_round=8)]))
+    assert not scheduler.is_settled(2025, 9, 'Q', now=NOW)
+    assert scheduler.is_settled(2025, 8, 'R', now=NOW)
+    assert not scheduler.is_settled(2025, 9, 'FP1', now=NOW)
@@ -0,0 +1,99 @@
+import pytest
+
+from services.prediction_history import PredictionHistory
+
+RESULTS = [
+    {'driver': 'Max Verstappen', 'abbreviation': 'VER', 'position': 1},
+    {'driver': 'Lando Norris', 'abbreviation': 'NOR', 'position': 2},
+    {'driver': 'Charles Leclerc', 'abbreviation': 'LEC', 'position': 3},
+    {'driver': 'Oscar Piastri', 'abbreviation': 'PIA', 'position': 4},
+    {'driver': 'Lewis Hamilton', 'abbreviation': 'HAM', 'position': None},
+]
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PredictionHistory(db_path=str(tmp_path / 'history.db'))
+
+
+def ml_prediction(order, probabilities, race_round=5):
+    return {
+        'year': 2024,
+        'round': race_round,
+        'race_name': 'Test Grand Prix',
+        'model': {'version': 'v1'},
+        'predictions': [{
+            'name': name,
+            'abbreviation': abbreviation,
+            'team': 'Team',
+            'win_probability': probability
+        } for (name, abbreviation), probability in zip(order, probabilities)]
+    }
+
+
+ML_ORDER = [('Lando Norris', 'NOR'), ('Max Verstappen', 'VER'), ('Lewis Hamilton', 'HAM'), ('Oscar Piastri', 'PIA')]
+
+
+def test_scores_ml_prediction_against_results(history):
+    assert history.record_ml(ml_prediction(ML_ORDER, [0.5, 0.3, 0.15, 0.05]))
+    assert history.record_results(2024, 5, RESULTS) == 1
+
+    [stored] = history.get_history(season=2024, source='ml')
+    assert stored['scored']
+    assert stored['winner_correct'] is False
+    # NOR and VER finished in the top three, HAM did not finish
+    assert stored['top3_hits'] == 2
+    expected_brier = (0.5 ** 2 + 0.7 ** 2 + 0.15 ** 2 + 0.05 ** 2) / 4
+    assert stored['brier'] == pytest.approx(expected_brier)
+    assert [entry['driver'] for entry in stored['top_3']] == ['Lando Norris', 'Max Verstappen', 'Lewis Hamilton']
+
+
+def test_matches_entries_by_name_without_abbreviation(history):
+    event = {'year': 2024, 'round': 5, 'name': 'Test Grand Prix'}
+    prediction = {
+        'driver': 'Max Verstappen', 'team': 'Red Bull', 'confidence': 80,
+        'other_predictions': [
+            {'driver': 'Charles Leclerc', 'team': 'Ferrari', 'confidence': 60},
+            {'driver': 'Oscar Piastri', 'team': 'McLaren', 'confidence': 40}
+        ]
+    }
+    assert history.record_heuristic(event, prediction, 'h1')
+    history.record_results(2024, 5, RESULTS)
+
+    [stored] = history.get_history(source='heuristic')
+    assert stored['winner_correct'] is True
+    assert stored['top3_hits'] == 2
+    # A relative score over three picks is not a win probability
+    assert all(entry['confidence'] is None for entry in stored['top_3'])
+    assert stored['brier'] is None
+
+
+def test_leaderboard_and_calibration(history):
+    history.record_ml(ml_prediction(ML_ORDER, [0.5, 0.3, 0.15, 0.05], race_round=5))
+    history.record_ml(ml_prediction(list(reversed(ML_ORDER)), [0.4, 0.3, 0.2, 0.1], race_round=6))
+    history.record_results(2024, 5, RESULTS)
+    history.record_results(2024, 6, [dict(r, position=p) for r, p in zip(RESULTS, [2, 1, 3, 5, 4])])
+
+    [row] = history.get_leaderboard()
+    assert (row['source'], row['model_version'], row['races']) == ('ml', 'v1', 2)
+    # Round 6's pick PIA finished fifth; round 5's pick NOR finished second
+    assert row['winner_hit_rate'] == 0
+    assert row['top3_overlap'] == pytest.approx((2 + 1) / 6)
+
+    calibration = history.get_calibration(bins=2)
+    assert sum(b['entries'] for b in calibration) == 8
+    assert [b['range'] for b in calibration] == [[0.0, 0.5], [0.5, 1.0]]
+    assert calibration[1]['observed'] == 0
+
+
+def test_prediction_after_results_is_not_stored(history):
+    history.record_results(2024, 5, RESULTS)
+    assert not history.record_ml(ml_prediction(ML_ORDER, [0.5, 0.3, 0.15, 0.05]))
+    assert history.get_history() == []
+
+
+def test_repeated_prediction_is_written_once(history):
+    prediction = ml_prediction(ML_ORDER, [0.5, 0.3, 0.15, 0.05])
+    assert history.record_ml(prediction)
+    assert not history.record_ml(prediction)
+    assert len(history.get_history()) == 1
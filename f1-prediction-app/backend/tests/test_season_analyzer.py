@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+from services.season_analyzer import SeasonAnalyzer
+
+
+class FakeCalendar:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def get_session_schedule(self, year=None):
+        return self.sessions
+
+
+def test_round_counts_as_completed_only_once_race_results_are_due(tmp_path):
+    now = datetime.now(timezone.utc)
+    sessions = [
+        {'year': now.year, 'round': 1, 'session': 'R', 'start': now - timedelta(days=7)},
+        {'year': now.year, 'round': 2, 'session': 'Q', 'start': now - timedelta(days=1)},
+        # Lights out an hour ago: race day, but the race is still running
+        {'year': now.year, 'round': 2, 'session': 'R', 'start': now - timedelta(hours=1)},
+        {'year': now.year, 'round': 3, 'session': 'R', 'start': now + timedelta(days=7)},
+    ]
+    analyzer = SeasonAnalyzer(summary_dir=str(tmp_path), calendar_service=FakeCalendar(sessions))
+    assert analyzer._completed_rounds(now.year) == [1]
+
+    sessions[2]['start'] = now - timedelta(hours=3)
+    assert analyzer._completed_rounds(now.year) == [1, 2]
@@ -0,0 +1,39 @@
+import argparse
+import logging
+from datetime import datetime
+from config import FASTF1_CACHE_DIR
+from services.fastf1_cache import CacheWarmer
+
+SESSION_TYPES = ('FP1', 'FP2', 'FP3', 'SQ', 'S', 'Q', 'R')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prefetch fastf1 sessions into the cache shared by the API and the ML pipeline"
+    )
+    parser.add_argument('--years', type=int, nargs='+', default=[datetime.now().year])
+    parser.add_argument('--rounds', type=int, nargs='+', help="Default: every finished round")
+    parser.add_argument('--sessions', nargs='+', default=['Q', 'R'], choices=SESSION_TYPES)
+    parser.add_argument('--workers', type=int, default=4, help="Sessions loaded at the same time")
+    parser.add_argument('--no-telemetry', action='store_true', help="Skip car telemetry, the bulk of the download")
+    parser.add_argument('--force', action='store_true', help="Reload sessions that are already cached")
+    parser.add_argument('--cache-dir', default=FASTF1_CACHE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    warmer = CacheWarmer(cache_dir=args.cache_dir, max_workers=args.workers)
+    summary = warmer.warm(
+        args.years,
+        rounds=args.rounds,
+        session_types=tuple(args.sessions),
+        telemetry=not args.no_telemetry,
+        force=args.force
+    )
+    print(f"\nWarmed {summary['warmed']} sessions ({summary['bytes'] / 1e6:.1f} MB) in {summary['seconds']:.1f}s, "
+          f"{summary['skipped']} already cached, {summary['failed']} failed")
+    print(f"Cache: {args.cache_dir}")
+
+
+# Run from the backend directory: python warm_cache.py --years 2024 --sessions Q R
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""WSGI entry point for production servers, e.g. gunicorn -c gunicorn.conf.py wsgi:app"""
+from app import app
+
+if __name__ == '__main__':
+    app.run()
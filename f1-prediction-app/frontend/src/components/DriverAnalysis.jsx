@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { ArrowLeft } from 'lucide-react';
+import { fetchWhenReady } from '../utils/apiJobs';
 import { Line } from 'react-chartjs-2';
 import {
   Chart as ChartJS,
@@ -33,7 +34,7 @@ const DriverAnalysis = () => {
   useEffect(() => {
     const fetchAnalysis = async () => {
       try {
-        const response = await fetch(`/api/race-analysis/${encodeURIComponent(driver)}`);
+        const response = await fetchWhenReady(`/api/race-analysis/${encodeURIComponent(driver)}`);
         const data = await response.json();
         setAnalysis(data);
       } catch (error) {
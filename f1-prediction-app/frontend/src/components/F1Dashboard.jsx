@@ -28,6 +28,9 @@ const DashboardHeader = ({ nextRace }) => (
   </div>
 );
 
+const DASHBOARD_RETRIES = 60;  // Cold sections are computed by background jobs; poll for up to two minutes
+const DASHBOARD_RETRY_DELAY = 2000;
+
 const F1Dashboard = () => {
   const [prediction, setPrediction] = useState(null);
   const [lastRaceResults, setLastRaceResults] = useState(null);
@@ -54,49 +57,71 @@ const F1Dashboard = () => {
   }, []);
 
   useEffect(() => {
-    const fetchData = async () => {
+    let cancelled = false;
+    let retryTimer = null;
+
+    // One request for every section; sections the server is still computing
+    // come back as pending, so ask again shortly for those
+    const fetchData = async (attempt = 0) => {
+      let retrying = false;
       try {
-        setLoading(true);
-        setError(null);
-        
-        // Fetch data from both endpoints concurrently
-        const [predictionRes, lastRaceRes, championshipRes] = await Promise.all([
-          axios.get('http://127.0.0.1:5000/api/prediction'),
-          axios.get('http://127.0.0.1:5000/api/last-race'),
-          axios.get('http://127.0.0.1:5000/api/championship')
-        ]);
+        if (attempt === 0) {
+          setLoading(true);
+          setError(null);
+        }
 
-        console.log('Prediction Response:', predictionRes.data);
-        console.log('Last Race Response:', lastRaceRes.data);
+        const response = await axios.get('http://127.0.0.1:5000/api/dashboard');
+        if (cancelled) {
+          return;
+        }
+        const { prediction: predictionSection, last_race: lastRaceSection, championship } = response.data.sections;
+        console.log('Dashboard Response:', response.data);
 
-        if (predictionRes.data.warning) {
-          setError(predictionRes.data.warning);
-          setPrediction(null);
-        } else if (predictionRes.data.message) {
-          setError(predictionRes.data.message);
+        if (predictionSection.status === 'ok') {
+          const predictionData = predictionSection.data;
+          if (predictionData.warning) {
+            setError(predictionData.warning);
+            setPrediction(null);
+          } else if (predictionData.message) {
+            setError(predictionData.message);
+            setPrediction(null);
+          } else if (predictionData.prediction) {
+            setPrediction(predictionData.prediction);
+          } else {
+            setError('Invalid prediction data format');
+          }
+        } else if (predictionSection.status === 'error') {
+          setError(predictionSection.error);
           setPrediction(null);
-        } else if (predictionRes.data.prediction) {
-          setPrediction(predictionRes.data.prediction);
-        } else {
-          setError('Invalid prediction data format');
         }
 
         // Only set lastRaceResults if we have both the results and lastRace
-        if (lastRaceRes.data && lastRace) {
+        if (lastRaceSection.status === 'ok' && lastRace) {
           setLastRaceResults({
-            ...lastRaceRes.data,
+            ...lastRaceSection.data,
             name: lastRace.name
           });
         }
 
-        if (championshipRes.data) {
-          setChampionshipData(championshipRes.data);
+        if (championship.status === 'ok') {
+          setChampionshipData(championship.data);
+        }
+
+        const pending = Object.values(response.data.sections).some(section => section.status === 'pending');
+        if (pending && attempt < DASHBOARD_RETRIES) {
+          retrying = predictionSection.status === 'pending';
+          retryTimer = setTimeout(() => fetchData(attempt + 1), DASHBOARD_RETRY_DELAY);
+        } else if (predictionSection.status === 'pending') {
+          setError('The prediction is taking longer than expected. Please try again later.');
         }
       } catch (err) {
         console.error('Error fetching data:', err);
         setError('Failed to fetch F1 data. Please try again later.');
       } finally {
-        setLoading(false);
+        // Keep the loading bar up while the prediction is still being computed
+        if (!cancelled && !retrying) {
+          setLoading(false);
+        }
       }
     };
 
@@ -104,6 +129,11 @@ const F1Dashboard = () => {
     if (lastRace) {
       fetchData();
     }
+
+    return () => {
+      cancelled = true;
+      clearTimeout(retryTimer);
+    };
   }, [lastRace]); // Add lastRace as a dependency
 
   useEffect(() => {
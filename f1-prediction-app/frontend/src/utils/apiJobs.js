@@ -0,0 +1,38 @@
+// Slow endpoints answer a cold request with 202 and a background job; wait on
+// the job, then fetch the result again, which the server now answers directly
+const JOB_WAIT_SECONDS = 2;
+const DEFAULT_TIMEOUT = 120000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export const fetchWhenReady = async (url, { timeout = DEFAULT_TIMEOUT } = {}) => {
+  const deadline = Date.now() + timeout;
+  let response = await fetch(url);
+
+  while (response.status === 202) {
+    let job = await response.json();
+    const jobUrl = new URL(`/api/jobs/${job.id}?wait=${JOB_WAIT_SECONDS}`, new URL(url, window.location.href));
+
+    while (job.state === 'queued' || job.state === 'running') {
+      if (Date.now() > deadline) {
+        throw new Error(`Timed out waiting for ${url}`);
+      }
+      const jobResponse = await fetch(jobUrl);
+      if (!jobResponse.ok) {
+        throw new Error(`Lost track of job ${job.id}`);
+      }
+      job = await jobResponse.json();
+      const retryAfter = Number(jobResponse.headers.get('Retry-After'));
+      if ((job.state === 'queued' || job.state === 'running') && retryAfter > 0) {
+        await sleep(retryAfter * 1000);
+      }
+    }
+
+    if (job.state === 'failed') {
+      throw new Error(job.error || `Job ${job.id} failed`);
+    }
+    response = await fetch(url);
+  }
+
+  return response;
+};
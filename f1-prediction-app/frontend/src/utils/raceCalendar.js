@@ -29,4 +29,32 @@ export const getLastRace = async () => {
   return [...raceCalendar]
     .reverse()
     .find(race => new Date(race.date) < now) || raceCalendar[raceCalendar.length - 1];
-};
\ No newline at end of file
+};
+
+export const getNextSession = async () => {
+  const raceCalendar = await getRaceCalendar();
+  if (!raceCalendar || raceCalendar.length === 0) {
+    return null;
+  }
+  const now = new Date();
+  for (const race of raceCalendar) {
+    const session = (race.sessions || []).find(s => new Date(s.start) > now);
+    if (session) {
+      return { ...session, event: race.name, round: race.round };
+    }
+  }
+  return null;
+};
+
+// Time left until a UTC session start, computed on the client so the
+// calendar response itself never changes between polls
+export const getCountdown = (start, now = new Date()) => {
+  const total = Math.max(0, new Date(start) - now);
+  return {
+    total,
+    days: Math.floor(total / 86400000),
+    hours: Math.floor((total / 3600000) % 24),
+    minutes: Math.floor((total / 60000) % 60),
+    seconds: Math.floor((total / 1000) % 60)
+  };
+};